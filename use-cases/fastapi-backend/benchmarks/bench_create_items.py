@@ -0,0 +1,126 @@
+"""
+Benchmark: item creation throughput, direct vs group-commit writes.
+
+Two measurements:
+
+- storage: inserts issued straight at the database layer, one session +
+  commit per item vs ``GroupCommitWriter.create`` from concurrent tasks.
+- http: concurrent ``POST /items/`` in-process (ASGI transport) with
+  ``item_write_mode`` set to ``direct`` and then ``batched``. In-process
+  request handling is CPU-bound, so this understates the storage-level gain.
+
+Direct mode holds a pooled connection per in-flight request, so keep
+``--http-concurrency`` below the pool size (15 by default) for it.
+
+Usage (from use-cases/fastapi-backend):
+    python -m benchmarks.bench_create_items --requests 2000
+"""
+
+import argparse
+import asyncio
+import os
+import tempfile
+import time
+
+# Point the examples at a throwaway database (and lift rate limits) before
+# they are imported
+_tmpdir = tempfile.mkdtemp(prefix="bench-create-")
+os.environ.setdefault("DATABASE_URL", f"sqlite:///{_tmpdir}/bench.db")
+os.environ.setdefault("RATE_LIMIT_ENABLED", "false")
+
+import httpx  # noqa: E402
+
+from examples.basic_crud.batching import GroupCommitWriter  # noqa: E402
+from examples.basic_crud.main import create_app  # noqa: E402
+from examples.basic_crud.models import Item  # noqa: E402
+from examples.shared.database import Base, get_engine, get_sessionmaker  # noqa: E402
+from examples.shared.settings import settings  # noqa: E402
+
+
+def reset_schema() -> None:
+    Base.metadata.drop_all(get_engine())
+    Base.metadata.create_all(get_engine())
+
+
+def storage_direct(requests: int) -> float:
+    """One session and commit per item, like direct-mode create_item."""
+    reset_schema()
+    start = time.perf_counter()
+    for i in range(requests):
+        with get_sessionmaker()() as db:
+            item = Item(name=f"item-{i}")
+            db.add(item)
+            db.commit()
+            db.refresh(item)
+    return requests / (time.perf_counter() - start)
+
+
+async def storage_batched(requests: int) -> float:
+    """All items submitted concurrently through the group-commit writer."""
+    reset_schema()
+    writer = GroupCommitWriter(get_sessionmaker())
+    await writer.start()
+    start = time.perf_counter()
+    await asyncio.gather(
+        *(writer.create({"name": f"item-{i}"}) for i in range(requests))
+    )
+    elapsed = time.perf_counter() - start
+    await writer.stop()
+    return requests / elapsed
+
+
+async def http(mode: str, requests: int, concurrency: int) -> float:
+    """Create items over the ASGI app with ``concurrency`` requests in flight."""
+    reset_schema()
+    settings.item_write_mode = mode
+    app = create_app()
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async with app.router.lifespan_context(app):
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(
+            transport=transport, base_url="http://bench"
+        ) as client:
+
+            async def create(i: int) -> None:
+                async with semaphore:
+                    response = await client.post("/items/", json={"name": f"item-{i}"})
+                    response.raise_for_status()
+
+            start = time.perf_counter()
+            await asyncio.gather(*(create(i) for i in range(requests)))
+            elapsed = time.perf_counter() - start
+    return requests / elapsed
+
+
+def report(label: str, rates: dict[str, float]) -> None:
+    baseline = rates["direct"]
+    for mode, rate in rates.items():
+        print(f"  {label:<8} {mode:<8} {rate:10.0f} items/s  x{rate / baseline:6.1f}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--http-concurrency", type=int, default=10)
+    args = parser.parse_args()
+
+    print(f"item creation, {args.requests} items")
+    report(
+        "storage",
+        {
+            "direct": storage_direct(args.requests),
+            "batched": asyncio.run(storage_batched(args.requests)),
+        },
+    )
+    report(
+        "http",
+        {
+            mode: asyncio.run(http(mode, args.requests, args.http_concurrency))
+            for mode in ("direct", "batched")
+        },
+    )
+
+
+if __name__ == "__main__":
+    main()
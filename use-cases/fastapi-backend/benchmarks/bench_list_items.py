@@ -0,0 +1,102 @@
+"""
+Benchmark: list_items serialization paths.
+
+Compares the original ORM + ItemResponse path against the row-select +
+orjson path used by ``list_items`` for a single page of items.
+
+Usage (from use-cases/fastapi-backend):
+    python -m benchmarks.bench_list_items --rows 1000 --repeat 50
+"""
+
+import argparse
+import os
+import statistics
+import tempfile
+import time
+
+# Point the examples at a throwaway database (and lift rate limits) before
+# they are imported
+_tmpdir = tempfile.mkdtemp(prefix="bench-items-")
+os.environ.setdefault("DATABASE_URL", f"sqlite:///{_tmpdir}/bench.db")
+os.environ.setdefault("RATE_LIMIT_ENABLED", "false")
+
+from fastapi import Depends, FastAPI  # noqa: E402
+from fastapi.testclient import TestClient  # noqa: E402
+from sqlalchemy.orm import Session  # noqa: E402
+
+from examples.basic_crud.main import create_app  # noqa: E402
+from examples.basic_crud.models import Item  # noqa: E402
+from examples.basic_crud.schemas import ItemResponse  # noqa: E402
+from examples.shared.database import (  # noqa: E402
+    Base,
+    get_db,
+    get_engine,
+    get_sessionmaker,
+)
+
+
+def seed(rows: int) -> None:
+    """Create the schema and insert ``rows`` items with full-length fields."""
+    Base.metadata.drop_all(get_engine())
+    Base.metadata.create_all(get_engine())
+    with get_sessionmaker()() as db:
+        db.add_all(Item(name=f"item-{i}", description="x" * 500) for i in range(rows))
+        db.commit()
+
+
+def build_app() -> FastAPI:
+    """The real app plus a ``/legacy`` route using the original ORM path."""
+    app = create_app()
+
+    @app.get("/legacy/items/", response_model=list[ItemResponse])
+    async def legacy_list_items(
+        skip: int = 0, limit: int = 100, db: Session = Depends(get_db)
+    ):
+        return db.query(Item).offset(skip).limit(limit).all()
+
+    return app
+
+
+def time_route(client: TestClient, url: str, repeat: int) -> list[float]:
+    """Return per-request wall times (seconds) for ``repeat`` GETs of ``url``."""
+    client.get(url)  # warm up
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        response = client.get(url)
+        timings.append(time.perf_counter() - start)
+        response.raise_for_status()
+    return timings
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=int, default=1000, help="page size")
+    parser.add_argument("--repeat", type=int, default=50, help="requests per path")
+    args = parser.parse_args()
+
+    seed(args.rows)
+    client = TestClient(build_app())
+    query = f"?limit={args.rows}"
+
+    legacy_body = client.get(f"/legacy/items/{query}").json()
+    fast_body = client.get(f"/items/{query}").json()
+    assert legacy_body == fast_body, "wire format mismatch"
+
+    results = {
+        "orm + ItemResponse": time_route(client, f"/legacy/items/{query}", args.repeat),
+        "rows + orjson": time_route(client, f"/items/{query}", args.repeat),
+    }
+
+    baseline = statistics.median(results["orm + ItemResponse"])
+    print(f"list_items, {args.rows} rows/page, {args.repeat} requests per path")
+    for name, timings in results.items():
+        median = statistics.median(timings)
+        print(
+            f"  {name:<20} median {median * 1000:8.2f} ms"
+            f"  speedup x{baseline / median:5.2f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,284 @@
+"""
+Benchmark suite: every basic_crud route at several table sizes.
+
+For each seed size the ``items`` table is rebuilt, then each route is driven
+with ``--concurrency`` requests in flight, in-process (ASGI transport) and/or
+over HTTP against a uvicorn subprocess. Reports throughput and p50/p99
+latency per route and writes them, with the git commit, to
+``benchmarks/results/``; ``--compare`` prints the change against an earlier
+result file.
+
+Usage (from use-cases/fastapi-backend):
+    python -m benchmarks.bench_routes --sizes 10000,1000000 --concurrency 10
+    python -m benchmarks.bench_routes --compare benchmarks/results/<file>.json
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import platform
+import random
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+
+# Point the examples at a throwaway database (and lift rate limits) before
+# they are imported
+_tmpdir = tempfile.mkdtemp(prefix="bench-routes-")
+os.environ.setdefault("DATABASE_URL", f"sqlite:///{_tmpdir}/bench.db")
+os.environ.setdefault("RATE_LIMIT_ENABLED", "false")
+
+import httpx  # noqa: E402
+from sqlalchemy import insert  # noqa: E402
+
+from examples.basic_crud.main import create_app  # noqa: E402
+from examples.basic_crud.models import Item, allocate_change_seq  # noqa: E402
+from examples.shared.database import Base, get_engine  # noqa: E402
+from examples.shared.settings import settings  # noqa: E402
+
+SEED_BATCH = 50_000
+WORDS = ["red", "green", "blue", "large", "small", "steel", "wooden", "glass"]
+
+
+def seed(size: int) -> None:
+    """Rebuild the schema and insert ``size`` items in large batches."""
+    Base.metadata.drop_all(get_engine())
+    Base.metadata.create_all(get_engine())
+    rng = random.Random(size)
+    with get_engine().begin() as conn:
+        for start in range(0, size, SEED_BATCH):
+            stop = min(start + SEED_BATCH, size)
+            first_seq = allocate_change_seq(conn, stop - start)
+            conn.execute(
+                insert(Item),
+                [
+                    {
+                        "name": f"item-{i:07d}",
+                        "description": " ".join(rng.choices(WORDS, k=12)),
+                        "change_seq": first_seq + i - start,
+                    }
+                    for i in range(start, stop)
+                ],
+            )
+
+
+def routes(size: int, etag: str) -> list[tuple[str, str, callable]]:
+    """
+    ``(name, method, request factory)`` for every route, reads before writes.
+
+    Each factory maps a request index to ``(url, json body, headers)``.
+    """
+    rng = random.Random(0)
+
+    def any_id(_: int) -> int:
+        return rng.randint(1, size)
+
+    return [
+        ("list", "GET", lambda i: ("/items/?limit=100", None, None)),
+        ("list_deep", "GET", lambda i: (f"/items/?skip={size // 2}", None, None)),
+        (
+            "list_filtered",
+            "GET",
+            lambda i: ("/items/?name_prefix=item-00&sort=-name", None, None),
+        ),
+        ("list_total", "GET", lambda i: ("/items/?with_total=true", None, None)),
+        ("list_fields", "GET", lambda i: ("/items/?fields=id,name", None, None)),
+        ("get", "GET", lambda i: (f"/items/{any_id(i)}", None, None)),
+        ("get_304", "GET", lambda i: ("/items/1", None, {"If-None-Match": etag})),
+        (
+            "batch",
+            "GET",
+            lambda i: (
+                "/items/batch?ids=" + ",".join(str(any_id(i)) for _ in range(50)),
+                None,
+                None,
+            ),
+        ),
+        ("search", "GET", lambda i: ("/items/search?q=steel+glass", None, None)),
+        ("changes", "GET", lambda i: ("/items/changes?limit=100", None, None)),
+        ("create", "POST", lambda i: ("/items/", {"name": f"new-{i}"}, None)),
+        ("update", "PUT", lambda i: (f"/items/{any_id(i)}", {"name": "upd"}, None)),
+        # Distinct ids from the top of the range, so every delete hits
+        ("delete", "DELETE", lambda i: (f"/items/{size - i}", None, None)),
+    ]
+
+
+async def drive(
+    client: httpx.AsyncClient,
+    method: str,
+    factory,
+    requests: int,
+    concurrency: int,
+    first: int = 0,
+) -> dict:
+    """Issue requests ``first..first+requests``, ``concurrency`` at a time."""
+    latencies: list[float] = []
+    errors = 0
+    counter = iter(range(first, first + requests))
+
+    async def worker() -> None:
+        nonlocal errors
+        for i in counter:
+            url, body, headers = factory(i)
+            start = time.perf_counter()
+            response = await client.request(method, url, json=body, headers=headers)
+            latencies.append(time.perf_counter() - start)
+            if response.status_code >= 400:
+                errors += 1
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - started
+    latencies.sort()
+    return {
+        "requests": requests,
+        "errors": errors,
+        "rps": requests / elapsed,
+        "p50_ms": statistics.median(latencies) * 1000,
+        "p99_ms": latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))] * 1000,
+    }
+
+
+async def run_routes(
+    client: httpx.AsyncClient, size: int, requests: int, concurrency: int
+) -> dict[str, dict]:
+    etag = (await client.get("/items/1")).headers["etag"]
+    results = {}
+    for name, method, factory in routes(size, etag):
+        count = min(requests, size // 2) if name == "delete" else requests
+        # Warm up on request indices past the measured ones (fresh delete ids)
+        await drive(client, method, factory, min(count, 10), 1, first=count)
+        results[name] = await drive(client, method, factory, count, concurrency)
+    return results
+
+
+async def bench_asgi(size: int, requests: int, concurrency: int) -> dict[str, dict]:
+    app = create_app()
+    async with app.router.lifespan_context(app):
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://b") as c:
+            return await run_routes(c, size, requests, concurrency)
+
+
+def free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+async def bench_http(size: int, requests: int, concurrency: int) -> dict[str, dict]:
+    port = free_port()
+    server = subprocess.Popen(
+        [
+            sys.executable,
+            *("-m", "uvicorn", "examples.basic_crud.main:create_app", "--factory"),
+            *("--port", str(port), "--log-level", "warning", "--no-access-log"),
+        ],
+        env={**os.environ, "DATABASE_URL": settings.database_url},
+    )
+    base_url = f"http://127.0.0.1:{port}"
+    try:
+        limits = httpx.Limits(max_connections=concurrency)
+        async with httpx.AsyncClient(base_url=base_url, limits=limits) as c:
+            for _ in range(100):
+                try:
+                    await c.get("/health")
+                    break
+                except httpx.TransportError:
+                    await asyncio.sleep(0.1)
+            return await run_routes(c, size, requests, concurrency)
+    finally:
+        server.terminate()
+        server.wait()
+
+
+def git_commit() -> str:
+    try:
+        return subprocess.check_output(
+            ["git", "rev-parse", "--short", "HEAD"],
+            text=True,
+            stderr=subprocess.DEVNULL,
+        ).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def compare(results: list[dict], baseline_path: str) -> None:
+    """Print throughput and p99 change per route against a baseline file."""
+    with open(baseline_path) as f:
+        baseline = json.load(f)
+    previous = {(r["size"], r["transport"], r["route"]): r for r in baseline["results"]}
+    print(f"\nvs {baseline_path} ({baseline['meta']['commit']})")
+    for r in results:
+        old = previous.get((r["size"], r["transport"], r["route"]))
+        if old is None:
+            continue
+        rps = (r["rps"] / old["rps"] - 1) * 100
+        p99 = (r["p99_ms"] / old["p99_ms"] - 1) * 100
+        print(
+            f"  {r['size']:>8} {r['transport']:<5} {r['route']:<14}"
+            f" rps {rps:+6.1f}%  p99 {p99:+6.1f}%"
+        )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--sizes", default="10000,1000000", help="seed row counts")
+    parser.add_argument("--requests", type=int, default=500, help="per route")
+    parser.add_argument("--concurrency", type=int, default=10)
+    parser.add_argument("--transports", default="asgi,http")
+    parser.add_argument(
+        "--output", help="JSON path (default results/bench-routes-<commit>.json)"
+    )
+    parser.add_argument("--compare", help="earlier JSON result to diff against")
+    args = parser.parse_args()
+
+    commit = git_commit()
+    runners = {"asgi": bench_asgi, "http": bench_http}
+    results = []
+    for size in (int(s) for s in args.sizes.split(",")):
+        for transport in args.transports.split(","):
+            # Reseed per run so writes from the previous run don't skew it
+            seed(size)
+            print(f"{size} rows, {transport}, concurrency {args.concurrency}")
+            by_route = asyncio.run(
+                runners[transport](size, args.requests, args.concurrency)
+            )
+            for route, stats in by_route.items():
+                print(
+                    f"  {route:<14} {stats['rps']:9.0f} req/s"
+                    f"  p50 {stats['p50_ms']:8.2f} ms  p99 {stats['p99_ms']:8.2f} ms"
+                    + (f"  errors {stats['errors']}" if stats["errors"] else "")
+                )
+                results.append(
+                    {"size": size, "transport": transport, "route": route, **stats}
+                )
+
+    output = args.output or os.path.join(
+        os.path.dirname(__file__), "results", f"bench-routes-{commit}.json"
+    )
+    os.makedirs(os.path.dirname(output) or ".", exist_ok=True)
+    meta = {
+        "commit": commit,
+        "timestamp": datetime.now(timezone.utc).isoformat(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpus": os.cpu_count(),
+        "database": get_engine().dialect.name,
+        "requests": args.requests,
+        "concurrency": args.concurrency,
+    }
+    with open(output, "w") as f:
+        json.dump({"meta": meta, "results": results}, f, indent=2)
+    print(f"\nwrote {output}")
+    if args.compare:
+        compare(results, args.compare)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,204 @@
+"""
+Benchmark: cold start of the basic CRUD API.
+
+Two measurements, each in fresh interpreters:
+
+- import profile: ``python -X importtime`` for importing the app module and
+  for building the app, reported as the slowest packages and modules.
+- time to first request: spawn uvicorn (``create_app`` factory), then time
+  until ``/health`` first answers and the latency of the first and second
+  ``GET /items/`` (the gap is work left for the first request).
+
+Results are written, with the git commit, to ``benchmarks/results/`` so
+start-up regressions show up across commits.
+
+Usage (from use-cases/fastapi-backend):
+    python -m benchmarks.bench_startup --runs 5
+"""
+
+import argparse
+import http.client
+import json
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from collections import defaultdict
+from datetime import datetime, timezone
+
+STAGES = {
+    "import": "import examples.basic_crud.main",
+    "create_app": "from examples.basic_crud.main import create_app; create_app()",
+}
+
+
+def import_profile(code: str) -> tuple[float, dict[str, float], dict[str, float]]:
+    """
+    Run ``code`` under ``-X importtime``.
+
+    Returns:
+        tuple: Total import ms, self ms summed per top-level package, and
+        self ms per module.
+    """
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    packages: dict[str, float] = defaultdict(float)
+    modules: dict[str, float] = {}
+    total = 0.0
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        self_us, cumulative_us, name = line.removeprefix("import time:").split("|")
+        self_ms = int(self_us) / 1000
+        module = name.strip()
+        modules[module] = self_ms
+        packages[module.split(".")[0]] += self_ms
+        if not name.startswith("    "):  # top level of the import tree
+            total += int(cumulative_us) / 1000
+    return total, dict(packages), modules
+
+
+def free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def get(port: int, path: str) -> int:
+    conn = http.client.HTTPConnection("127.0.0.1", port, timeout=10)
+    try:
+        conn.request("GET", path)
+        response = conn.getresponse()
+        response.read()
+        return response.status
+    finally:
+        conn.close()
+
+
+def time_to_first_request(env: dict[str, str]) -> dict[str, float]:
+    """Spawn a server and time readiness plus the first two item listings."""
+    port = free_port()
+    started = time.perf_counter()
+    server = subprocess.Popen(
+        [
+            sys.executable,
+            *("-m", "uvicorn", "examples.basic_crud.main:create_app", "--factory"),
+            *("--port", str(port), "--log-level", "warning"),
+        ],
+        env=env,
+    )
+    try:
+        while True:
+            try:
+                get(port, "/health")
+                break
+            except OSError:
+                if server.poll() is not None:
+                    raise RuntimeError("server exited during startup")
+                time.sleep(0.005)
+        ready = time.perf_counter() - started
+        timings = {"ready_ms": ready * 1000}
+        for key in ("first_items_ms", "second_items_ms"):
+            start = time.perf_counter()
+            get(port, "/items/")
+            timings[key] = (time.perf_counter() - start) * 1000
+        return timings
+    finally:
+        server.terminate()
+        server.wait()
+
+
+def git_commit() -> str:
+    try:
+        return subprocess.check_output(
+            ["git", "rev-parse", "--short", "HEAD"],
+            text=True,
+            stderr=subprocess.DEVNULL,
+        ).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--runs", type=int, default=5, help="fresh processes each")
+    parser.add_argument("--top", type=int, default=10, help="rows in the profile")
+    parser.add_argument(
+        "--output", help="JSON path (default results/bench-startup-<commit>.json)"
+    )
+    args = parser.parse_args()
+
+    tmpdir = tempfile.mkdtemp(prefix="bench-startup-")
+    env = {
+        **os.environ,
+        "DATABASE_URL": f"sqlite:///{tmpdir}/bench.db",
+        "RATE_LIMIT_ENABLED": "false",
+    }
+    os.environ.update(env)
+    # Create the schema in a separate interpreter so this one stays cold
+    subprocess.run(
+        [
+            sys.executable,
+            "-c",
+            "from examples.basic_crud.main import create_app; create_app()\n"
+            "from examples.shared.database import Base, get_engine\n"
+            "Base.metadata.create_all(get_engine())",
+        ],
+        check=True,
+    )
+
+    report: dict = {}
+    for stage, code in STAGES.items():
+        runs = [import_profile(code) for _ in range(args.runs)]
+        totals = [total for total, _, _ in runs]
+        _, packages, modules = runs[len(runs) // 2]
+        print(f"{stage}: median {statistics.median(totals):.0f} ms")
+        print("  slowest packages (self time):")
+        for name, ms in sorted(packages.items(), key=lambda kv: -kv[1])[: args.top]:
+            print(f"    {name:<32} {ms:8.1f} ms")
+        print("  slowest modules (self time):")
+        for name, ms in sorted(modules.items(), key=lambda kv: -kv[1])[: args.top]:
+            print(f"    {name:<48} {ms:8.1f} ms")
+        report[stage] = {
+            "median_ms": statistics.median(totals),
+            "packages_ms": dict(
+                sorted(packages.items(), key=lambda kv: -kv[1])[: args.top]
+            ),
+        }
+
+    samples = [time_to_first_request(env) for _ in range(args.runs)]
+    report["first_request"] = {
+        key: statistics.median(sample[key] for sample in samples) for key in samples[0]
+    }
+    first = report["first_request"]
+    print(
+        f"time to first request: ready {first['ready_ms']:.0f} ms, "
+        f"first /items/ {first['first_items_ms']:.1f} ms, "
+        f"second {first['second_items_ms']:.1f} ms"
+    )
+
+    commit = git_commit()
+    output = args.output or os.path.join(
+        os.path.dirname(__file__), "results", f"bench-startup-{commit}.json"
+    )
+    os.makedirs(os.path.dirname(output) or ".", exist_ok=True)
+    meta = {
+        "commit": commit,
+        "timestamp": datetime.now(timezone.utc).isoformat(),
+        "python": sys.version.split()[0],
+        "runs": args.runs,
+    }
+    with open(output, "w") as f:
+        json.dump({"meta": meta, **report}, f, indent=2)
+    print(f"\nwrote {output}")
+
+
+if __name__ == "__main__":
+    main()
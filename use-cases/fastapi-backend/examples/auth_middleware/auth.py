@@ -1,16 +1,144 @@
 """
 JWT authentication utilities.
 
-Handles token creation, validation, and password hashing.
+Handles token creation and validation (password hashing is in ``passwords.py``).
+
+Key material is parsed once into ``jose`` key objects (``get_key_set``), and
+successfully verified tokens are cached until their ``exp``, so a bearer
+token seen again costs a hash and a dict lookup instead of a signature check.
 """
 
+import hashlib
+import json
+import time
+import uuid
+from collections import OrderedDict
 from datetime import datetime, timedelta, timezone
+from functools import lru_cache
 
-from jose import JWTError, jwt
+from jose import JWTError, jwk, jwt
+from jose.backends.base import Key
 
 from ..shared.settings import settings
 
 
+class KeySet:
+    """
+    Signing and verification keys for one JWT algorithm, parsed once.
+
+    HMAC algorithms (HS*) sign and verify with the shared secret. RSA / EC
+    algorithms (RS*, ES*) sign with a PEM private key and verify against a
+    JWK set, selected by the token's ``kid`` header; without a JWK set, the
+    private key's public half is used.
+
+    Args:
+        algorithm: JWT ``alg``; the only algorithm accepted when verifying.
+        secret_key: Shared secret for HMAC algorithms.
+        private_key: PEM private key for asymmetric signing.
+        public_keys: JWK set (JSON) of verification keys.
+        key_id: ``kid`` written to issued tokens.
+    """
+
+    def __init__(
+        self,
+        algorithm: str,
+        secret_key: str = "",
+        private_key: str = "",
+        public_keys: str = "",
+        key_id: str = "",
+    ) -> None:
+        self.algorithm = algorithm
+        self.key_id = key_id or None
+        self.signing_key: Key | None = None
+        self.verification_keys: dict[str | None, Key] = {}
+
+        if algorithm.startswith("HS"):
+            self.signing_key = jwk.construct(secret_key, algorithm)
+            self.verification_keys[self.key_id] = self.signing_key
+            return
+
+        if private_key:
+            self.signing_key = jwk.construct(private_key, algorithm)
+        if public_keys:
+            for entry in json.loads(public_keys)["keys"]:
+                self.verification_keys[entry.get("kid")] = jwk.construct(
+                    entry, algorithm
+                )
+        elif self.signing_key is not None:
+            self.verification_keys[self.key_id] = self.signing_key.public_key()
+
+    def keys_for(self, kid: str | None) -> list[Key]:
+        """
+        Return the keys that may have signed a token with this ``kid``.
+
+        Args:
+            kid: The token's ``kid`` header, if any.
+
+        Returns:
+            list[Key]: The matching key, or every key when ``kid`` is absent.
+        """
+        if kid is None:
+            return list(self.verification_keys.values())
+        key = self.verification_keys.get(kid)
+        return [key] if key is not None else []
+
+
+@lru_cache
+def get_key_set() -> KeySet:
+    """Build the application's key set from settings (once per process)."""
+    return KeySet(
+        algorithm=settings.jwt_algorithm,
+        secret_key=settings.secret_key,
+        private_key=settings.jwt_private_key,
+        public_keys=settings.jwt_public_keys,
+        key_id=settings.jwt_key_id,
+    )
+
+
+class VerifiedTokenCache:
+    """
+    Bounded LRU of verified token payloads, each valid until its ``exp``.
+
+    Tokens are keyed by a hash, so the cache never holds raw bearer tokens.
+
+    Args:
+        max_entries: Maximum number of cached tokens.
+    """
+
+    def __init__(self, max_entries: int = 10_000) -> None:
+        self.max_entries = max_entries
+        self._entries: OrderedDict[bytes, tuple[float, dict]] = OrderedDict()
+
+    @staticmethod
+    def key(token: str) -> bytes:
+        return hashlib.blake2b(token.encode(), digest_size=16).digest()
+
+    def get(self, key: bytes) -> dict | None:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        if entry[0] <= time.time():
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return entry[1]
+
+    def put(self, key: bytes, payload: dict) -> None:
+        exp = payload.get("exp")
+        if not isinstance(exp, int | float):
+            return  # never cache tokens that don't expire
+        self._entries[key] = (exp, payload)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+
+token_cache = VerifiedTokenCache(max_entries=settings.token_cache_size)
+
+
 def create_access_token(data: dict, expires_delta: timedelta | None = None) -> str:
     """
     Create a JWT access token.
@@ -21,29 +149,69 @@ def create_access_token(data: dict, expires_delta: timedelta | None = None) -> s
 
     Returns:
         str: Encoded JWT token.
+
+    Raises:
+        RuntimeError: If no signing key is configured for the algorithm.
     """
+    keys = get_key_set()
+    if keys.signing_key is None:
+        raise RuntimeError(f"No signing key configured for {keys.algorithm}")
     to_encode = data.copy()
     expire = datetime.now(timezone.utc) + (
         expires_delta or timedelta(minutes=settings.access_token_expire_minutes)
     )
     to_encode.update({"exp": expire})
-    return jwt.encode(to_encode, settings.secret_key, algorithm=settings.jwt_algorithm)
+    to_encode.setdefault("jti", uuid.uuid4().hex)  # lets the token be revoked
+    headers = {"kid": keys.key_id} if keys.key_id else None
+    return jwt.encode(
+        to_encode, keys.signing_key, algorithm=keys.algorithm, headers=headers
+    )
+
+
+def create_refresh_token(subject: str) -> str:
+    """
+    Create a long-lived refresh token for exchanging at ``/auth/refresh``.
+
+    Refresh tokens carry ``"type": "refresh"`` and are rejected by
+    ``get_current_user``.
+
+    Args:
+        subject: The user the token is issued to (``sub``).
+
+    Returns:
+        str: Encoded JWT token.
+    """
+    return create_access_token(
+        {"sub": subject, "type": "refresh"},
+        timedelta(days=settings.refresh_token_expire_days),
+    )
 
 
 def verify_token(token: str) -> dict | None:
     """
     Verify and decode a JWT token.
 
+    Tokens verified before are served from ``token_cache`` until they
+    expire; everything else gets a full signature and claims check.
+
     Args:
         token: The JWT token string.
 
     Returns:
         dict | None: Decoded payload if valid, None if invalid.
     """
+    cache_key = token_cache.key(token)
+    payload = token_cache.get(cache_key)
+    if payload is not None:
+        return dict(payload)
+
+    keys = get_key_set()
     try:
-        payload = jwt.decode(
-            token, settings.secret_key, algorithms=[settings.jwt_algorithm]
-        )
-        return payload
+        candidates = keys.keys_for(jwt.get_unverified_header(token).get("kid"))
+        if not candidates:
+            return None
+        payload = jwt.decode(token, candidates, algorithms=[keys.algorithm])
     except JWTError:
         return None
+    token_cache.put(cache_key, payload)
+    return dict(payload)
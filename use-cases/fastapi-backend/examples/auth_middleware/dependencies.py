@@ -6,8 +6,11 @@ Use these with Depends() to protect routes.
 
 from fastapi import Depends, HTTPException, status
 from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
+from starlette.types import Scope
 
+from ..shared.ratelimit import client_ip
 from .auth import verify_token
+from .revocation import revocation_list
 
 security = HTTPBearer()
 
@@ -30,13 +33,43 @@ async def get_current_user(
         dict: Decoded token payload (contains 'sub', 'exp', etc.).
 
     Raises:
-        HTTPException: 401 if token is missing, invalid, or expired.
+        HTTPException: 401 if token is missing, invalid, expired, or revoked.
     """
     payload = verify_token(credentials.credentials)
-    if payload is None:
+    if payload is None or payload.get("type") == "refresh":
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Invalid or expired token",
             headers={"WWW-Authenticate": "Bearer"},
         )
+    jti = payload.get("jti")
+    if jti is not None and await revocation_list.is_revoked(jti):
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Token has been revoked",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
     return payload
+
+
+def rate_limit_key(scope: Scope) -> str:
+    """
+    Rate-limit key for ``RateLimitMiddleware``: the JWT ``sub``, else the IP.
+
+    Uses the verified-token cache, so repeat tokens cost a dict lookup.
+
+    Args:
+        scope: ASGI connection scope.
+
+    Returns:
+        str: ``sub:<subject>`` for a valid bearer token, otherwise ``ip:<addr>``.
+    """
+    for name, value in scope["headers"]:
+        if name == b"authorization":
+            scheme, _, token = value.decode("latin-1").partition(" ")
+            if scheme.lower() == "bearer":
+                payload = verify_token(token)
+                if payload is not None and "sub" in payload:
+                    return f"sub:{payload['sub']}"
+            break
+    return client_ip(scope)
@@ -0,0 +1,73 @@
+"""
+Authentication API — App factory.
+
+Demonstrates login, token refresh and a protected route.
+"""
+
+import asyncio
+from contextlib import asynccontextmanager
+
+from fastapi import FastAPI
+
+from ..shared.database import Base, get_engine
+from ..shared.ratelimit import RateLimitMiddleware
+from ..shared.settings import settings
+from .dependencies import rate_limit_key
+from .models import RevokedToken, User
+from .passwords import password_hasher
+from .revocation import revocation_list
+from .router import router as auth_router
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """
+    Create the auth tables if missing, keep the revocation list refreshed
+    and stop the hashing pool on exit.
+    """
+    await asyncio.to_thread(
+        Base.metadata.create_all,
+        get_engine(),
+        tables=[User.__table__, RevokedToken.__table__],
+    )
+    await revocation_list.start()
+    try:
+        yield
+    finally:
+        await revocation_list.stop()
+        password_hasher.shutdown()
+
+
+def create_app() -> FastAPI:
+    """
+    Create and configure the FastAPI application.
+
+    Returns:
+        FastAPI: Configured application instance.
+    """
+    app = FastAPI(
+        title="Authentication API",
+        description="JWT login and protected routes using FastAPI",
+        version="0.1.0",
+        lifespan=lifespan,
+    )
+
+    if settings.rate_limit_enabled:
+        app.add_middleware(
+            RateLimitMiddleware,
+            rules=settings.rate_limits,
+            default=settings.rate_limit_default,
+            key_func=rate_limit_key,
+        )
+
+    app.include_router(auth_router)
+
+    @app.get("/health")
+    async def health_check():
+        """Health check endpoint."""
+        return {"status": "ok"}
+
+    return app
+
+
+app = create_app()
@@ -0,0 +1,130 @@
+"""
+Password hashing off the event loop.
+
+Hashes use scrypt from the standard library, stored as
+``scrypt$<n>$<r>$<p>$<salt>$<hash>`` so the cost can be raised later
+without invalidating existing hashes (``needs_rehash`` reports old ones).
+
+A single hash deliberately takes tens of milliseconds of CPU. Running it in
+an async handler would stall every other request on the worker, so all
+hashing goes through a small dedicated thread pool; scrypt releases the GIL
+while it runs, so the event loop keeps serving other routes during a login
+burst, and the pool size caps how many CPUs logins can take.
+"""
+
+import asyncio
+import base64
+import hashlib
+import hmac
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+from ..shared.settings import settings
+
+SALT_BYTES = 16
+HASH_BYTES = 32
+
+
+class PasswordHasher:
+    """
+    scrypt hasher with a bounded worker pool.
+
+    Args:
+        n: CPU/memory cost (power of two); memory use is ``128 * n * r`` bytes.
+        r: Block size.
+        p: Parallelization factor.
+        workers: Maximum concurrent hashes.
+    """
+
+    def __init__(self, n: int = 2**14, r: int = 8, p: int = 1, workers: int = 2):
+        self.n = n
+        self.r = r
+        self.p = p
+        self.workers = workers
+        self._executor: ThreadPoolExecutor | None = None
+
+    async def hash(self, password: str) -> str:
+        """
+        Hash a password with a fresh salt.
+
+        Args:
+            password: Plain-text password.
+
+        Returns:
+            str: Encoded hash including its parameters and salt.
+        """
+        salt = os.urandom(SALT_BYTES)
+        digest = await self._run(password, salt, self.n, self.r, self.p)
+        return "$".join(
+            [
+                "scrypt",
+                str(self.n),
+                str(self.r),
+                str(self.p),
+                base64.b64encode(salt).decode(),
+                base64.b64encode(digest).decode(),
+            ]
+        )
+
+    async def verify(self, password: str, encoded: str) -> bool:
+        """
+        Check a password against a stored hash in constant time.
+
+        Args:
+            password: Plain-text password.
+            encoded: Hash produced by ``hash``.
+
+        Returns:
+            bool: True if the password matches.
+        """
+        try:
+            scheme, n, r, p, salt, expected = encoded.split("$")
+            if scheme != "scrypt":
+                return False
+            salt_bytes = base64.b64decode(salt)
+            expected_bytes = base64.b64decode(expected)
+            n, r, p = int(n), int(r), int(p)
+        except ValueError:
+            return False
+        digest = await self._run(password, salt_bytes, n, r, p)
+        return hmac.compare_digest(digest, expected_bytes)
+
+    def needs_rehash(self, encoded: str) -> bool:
+        """Whether a stored hash uses different cost parameters."""
+        return not encoded.startswith(f"scrypt${self.n}${self.r}${self.p}$")
+
+    def shutdown(self) -> None:
+        """Stop the worker pool, waiting for running hashes."""
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+
+    async def _run(self, password: str, salt: bytes, n: int, r: int, p: int) -> bytes:
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(
+                max_workers=self.workers, thread_name_prefix="password-hash"
+            )
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            self._executor, _scrypt, password.encode(), salt, n, r, p
+        )
+
+
+def _scrypt(password: bytes, salt: bytes, n: int, r: int, p: int) -> bytes:
+    return hashlib.scrypt(
+        password,
+        salt=salt,
+        n=n,
+        r=r,
+        p=p,
+        maxmem=256 * n * r,  # 2x the working set; OpenSSL's default is 32 MB
+        dklen=HASH_BYTES,
+    )
+
+
+password_hasher = PasswordHasher(
+    n=settings.password_hash_n,
+    r=settings.password_hash_r,
+    p=settings.password_hash_p,
+    workers=settings.password_hash_workers,
+)
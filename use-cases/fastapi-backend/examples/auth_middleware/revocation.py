@@ -0,0 +1,281 @@
+"""
+Token revocation by ``jti``.
+
+The ``revoked_tokens`` table is the authoritative list. Each process keeps a
+Bloom filter of the revoked ``jti`` values, so the check on every request is a
+few hash probes in memory. Only a filter hit (a real revocation or a rare
+false positive) is confirmed against the database.
+
+Revocations made in this process are added to the filter immediately. Those
+made elsewhere arrive with the periodic refresh. Neither ids nor timestamps
+are assigned in commit order (a row with a smaller id or earlier
+``revoked_at`` can commit after a larger one has been read), so each refresh
+re-reads every row from ``lookback`` seconds before the newest
+``revoked_at`` it has seen; a revocation is only missed if its transaction
+took longer than that to commit, until the next rebuild. The filter is
+rebuilt from scratch every ``rebuild_every`` refreshes to drop expired
+entries, since Bloom filters can't delete.
+Revocations made in this process while a rebuild runs are carried over into
+the new filter before it replaces the old one.
+"""
+
+import asyncio
+import hashlib
+import logging
+import math
+import threading
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import delete, exists, select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import sessionmaker
+
+from ..shared.database import get_sessionmaker
+from ..shared.settings import settings
+from .models import RevokedToken
+
+logger = logging.getLogger(__name__)
+
+
+class BloomFilter:
+    """
+    Fixed-size Bloom filter over strings.
+
+    Args:
+        capacity: Expected number of members.
+        error_rate: Target false-positive rate at ``capacity`` members.
+    """
+
+    def __init__(self, capacity: int, error_rate: float) -> None:
+        self.size = max(
+            8, math.ceil(-capacity * math.log(error_rate) / math.log(2) ** 2)
+        )
+        self.hash_count = max(1, round(self.size / capacity * math.log(2)))
+        self.count = 0
+        self._bits = bytearray((self.size + 7) // 8)
+
+    def _positions(self, value: str):
+        digest = hashlib.blake2b(value.encode(), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], "little")
+        h2 = int.from_bytes(digest[8:], "little") | 1
+        for i in range(self.hash_count):
+            yield (h1 + i * h2) % self.size
+
+    def add(self, value: str) -> None:
+        for position in self._positions(value):
+            self._bits[position >> 3] |= 1 << (position & 7)
+        self.count += 1
+
+    def __contains__(self, value: str) -> bool:
+        bits = self._bits
+        return all(
+            bits[position >> 3] & (1 << (position & 7))
+            for position in self._positions(value)
+        )
+
+
+def _utcnow() -> datetime:
+    return datetime.now(timezone.utc).replace(tzinfo=None)
+
+
+def _latest(since: datetime | None, revoked_at: datetime) -> datetime:
+    return revoked_at if since is None else max(since, revoked_at)
+
+
+class RevocationList:
+    """
+    Revoked token ids: a local Bloom filter in front of the database table.
+
+    Args:
+        session_factory: Creates database sessions. Defaults to the app's.
+        capacity: Expected number of unexpired revocations.
+        error_rate: Bloom filter false-positive rate at ``capacity``.
+        refresh_interval: Seconds between refreshes from the database.
+        rebuild_every: Refreshes between full rebuilds (which prune expired).
+        lookback: Seconds behind the newest seen revocation that each
+            refresh re-reads, covering transactions that commit late.
+    """
+
+    def __init__(
+        self,
+        session_factory: sessionmaker | None = None,
+        capacity: int = 100_000,
+        error_rate: float = 0.001,
+        refresh_interval: float = 30.0,
+        rebuild_every: int = 20,
+        lookback: float = 60.0,
+    ) -> None:
+        self._session_factory = session_factory
+        self.capacity = capacity
+        self.error_rate = error_rate
+        self.refresh_interval = refresh_interval
+        self.rebuild_every = rebuild_every
+        self.lookback = timedelta(seconds=lookback)
+        self._filter = BloomFilter(capacity, error_rate)
+        # Newest revoked_at seen; None reads every unexpired row
+        self._since: datetime | None = None
+        # Guards filter updates; revocations made during a rebuild are
+        # collected in _pending and merged into the new filter
+        self._lock = threading.Lock()
+        self._pending: set[str] | None = None
+        self._refreshes = 0
+        self._task: asyncio.Task | None = None
+
+    @property
+    def session_factory(self) -> sessionmaker:
+        return self._session_factory or get_sessionmaker()
+
+    async def is_revoked(self, jti: str) -> bool:
+        """
+        Check whether a token id has been revoked.
+
+        Args:
+            jti: The token's ``jti`` claim.
+
+        Returns:
+            bool: True if the token is revoked.
+        """
+        if jti not in self._filter:
+            return False
+        return await asyncio.to_thread(self._confirm, jti)
+
+    def revoke(self, jti: str, expires_at: datetime) -> bool:
+        """
+        Revoke a token until it expires.
+
+        The insert is atomic on the unique ``jti``, so of several concurrent
+        calls for the same token exactly one returns True; single-use tokens
+        (refresh rotation) rely on this.
+
+        Args:
+            jti: The token's ``jti`` claim.
+            expires_at: The token's expiry; the entry is pruned after it.
+
+        Returns:
+            bool: True if this call revoked it, False if it already was.
+        """
+        if expires_at.tzinfo is not None:
+            expires_at = expires_at.astimezone(timezone.utc).replace(tzinfo=None)
+        with self.session_factory() as db:
+            db.add(RevokedToken(jti=jti, expires_at=expires_at))
+            try:
+                db.commit()
+                revoked = True
+            except IntegrityError:
+                db.rollback()  # already revoked
+                revoked = False
+        self._add(jti)
+        return revoked
+
+    def _add(self, jti: str) -> None:
+        with self._lock:
+            self._filter.add(jti)
+            if self._pending is not None:
+                self._pending.add(jti)
+
+    def refresh(self) -> None:
+        """Pull new revocations; periodically rebuild to drop expired ones."""
+        self._refreshes += 1
+        rebuild = (
+            self._refreshes % self.rebuild_every == 0
+            or self._filter.count > self.capacity
+        )
+        if not rebuild:
+            stmt = select(RevokedToken.revoked_at, RevokedToken.jti).where(
+                RevokedToken.expires_at > _utcnow()
+            )
+            if self._since is not None:
+                stmt = stmt.where(
+                    RevokedToken.revoked_at >= self._since - self.lookback
+                )
+            with self.session_factory() as db:
+                rows = db.execute(stmt).all()
+            with self._lock:
+                for revoked_at, jti in rows:
+                    # The window overlaps earlier refreshes; don't recount
+                    if jti not in self._filter:
+                        self._filter.add(jti)
+                    self._since = _latest(self._since, revoked_at)
+            return
+
+        with self._lock:
+            self._pending = set()
+        try:
+            bloom = BloomFilter(self.capacity, self.error_rate)
+            since = None
+            with self.session_factory() as db:
+                now = _utcnow()
+                db.execute(delete(RevokedToken).where(RevokedToken.expires_at <= now))
+                db.commit()
+                for revoked_at, jti in db.execute(
+                    select(RevokedToken.revoked_at, RevokedToken.jti).where(
+                        RevokedToken.expires_at > now
+                    )
+                ):
+                    bloom.add(jti)
+                    since = _latest(since, revoked_at)
+            with self._lock:
+                # Local revocations the rebuild's query may have missed
+                for jti in self._pending:
+                    bloom.add(jti)
+                # Swap in one step so readers never see a half-built filter
+                self._filter, self._since = bloom, since
+        finally:
+            with self._lock:
+                self._pending = None
+
+    async def start(self) -> None:
+        """Load the current revocations, then refresh in the background."""
+        await asyncio.to_thread(self.refresh)
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """Stop background refreshes."""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(self.refresh_interval)
+            try:
+                await asyncio.to_thread(self.refresh)
+            except Exception:
+                logger.exception("Refreshing the token revocation list failed")
+
+    def _confirm(self, jti: str) -> bool:
+        with self.session_factory() as db:
+            stmt = select(
+                exists().where(
+                    RevokedToken.jti == jti, RevokedToken.expires_at > _utcnow()
+                )
+            )
+            return db.execute(stmt).scalar_one()
+
+
+def revoke_token(payload: dict) -> bool:
+    """
+    Revoke a decoded token (e.g. on logout or refresh rotation).
+
+    Args:
+        payload: Token payload from ``verify_token``; must carry ``jti``
+            and ``exp``.
+
+    Returns:
+        bool: True if this call revoked it, False if it already was.
+    """
+    expires_at = datetime.fromtimestamp(payload["exp"], tz=timezone.utc)
+    return revocation_list.revoke(payload["jti"], expires_at)
+
+
+revocation_list = RevocationList(
+    capacity=settings.revocation_capacity,
+    error_rate=settings.revocation_error_rate,
+    refresh_interval=settings.revocation_refresh_seconds,
+    lookback=settings.revocation_lookback_seconds,
+)
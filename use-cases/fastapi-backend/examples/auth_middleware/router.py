@@ -0,0 +1,163 @@
+"""
+Login router: user registration, token issue and refresh.
+
+Password hashing and verification are awaited on ``password_hasher``'s
+worker pool, so the event loop keeps serving other routes while a login
+burst is being hashed.
+"""
+
+from fastapi import APIRouter, Depends, HTTPException, status
+from sqlalchemy import select, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from ..shared.database import get_db
+from .auth import create_access_token, create_refresh_token, verify_token
+from .dependencies import get_current_user
+from .models import User
+from .passwords import password_hasher
+from .revocation import revocation_list, revoke_token
+from .schemas import (
+    LoginRequest,
+    RefreshRequest,
+    TokenResponse,
+    UserCreate,
+    UserResponse,
+)
+
+router = APIRouter(prefix="/auth", tags=["auth"])
+
+INVALID_CREDENTIALS = HTTPException(
+    status_code=status.HTTP_401_UNAUTHORIZED,
+    detail="Incorrect username or password",
+    headers={"WWW-Authenticate": "Bearer"},
+)
+
+INVALID_REFRESH_TOKEN = HTTPException(
+    status_code=status.HTTP_401_UNAUTHORIZED,
+    detail="Invalid or expired refresh token",
+    headers={"WWW-Authenticate": "Bearer"},
+)
+
+
+def issue_tokens(username: str) -> TokenResponse:
+    """Create a fresh access/refresh token pair for a user."""
+    return TokenResponse(
+        access_token=create_access_token({"sub": username}),
+        refresh_token=create_refresh_token(username),
+    )
+
+
+@router.post("/users", response_model=UserResponse, status_code=201)
+async def register(user: UserCreate, db: Session = Depends(get_db)):
+    """
+    Register a new user.
+
+    Args:
+        user: Username and password.
+        db: Database session.
+
+    Returns:
+        UserResponse: The created user.
+
+    Raises:
+        HTTPException: 409 if the username is taken.
+    """
+    password_hash = await password_hasher.hash(user.password)
+    db_user = User(username=user.username, password_hash=password_hash)
+    db.add(db_user)
+    try:
+        db.commit()
+    except IntegrityError:
+        db.rollback()
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT, detail="Username already exists"
+        )
+    db.refresh(db_user)
+    return db_user
+
+
+@router.post("/token", response_model=TokenResponse)
+async def login(credentials: LoginRequest, db: Session = Depends(get_db)):
+    """
+    Exchange a username and password for access and refresh tokens.
+
+    Args:
+        credentials: Username and password.
+        db: Database session.
+
+    Returns:
+        TokenResponse: New token pair.
+
+    Raises:
+        HTTPException: 401 if the credentials are wrong or the user is inactive.
+    """
+    user = db.execute(
+        select(User.id, User.username, User.password_hash, User.is_active).where(
+            User.username == credentials.username
+        )
+    ).one_or_none()
+    # Return the connection to the pool before the slow hash; otherwise a
+    # login burst would hold every pooled connection while it waits.
+    db.close()
+    if user is None:
+        # Spend the same time as a real check so usernames can't be probed
+        await password_hasher.hash(credentials.password)
+        raise INVALID_CREDENTIALS
+    if not await password_hasher.verify(credentials.password, user.password_hash):
+        raise INVALID_CREDENTIALS
+    if not user.is_active:
+        raise INVALID_CREDENTIALS
+
+    if password_hasher.needs_rehash(user.password_hash):
+        password_hash = await password_hasher.hash(credentials.password)
+        db.execute(
+            update(User).where(User.id == user.id).values(password_hash=password_hash)
+        )
+        db.commit()
+    return issue_tokens(user.username)
+
+
+@router.post("/refresh", response_model=TokenResponse)
+async def refresh(body: RefreshRequest, db: Session = Depends(get_db)):
+    """
+    Exchange a refresh token for a new token pair.
+
+    The presented refresh token is revoked (rotation), so each one can be
+    used once. Revoking it is the atomic step: of several concurrent
+    refreshes with the same token, only the one whose revocation insert
+    succeeds gets new tokens.
+
+    Args:
+        body: The refresh token.
+        db: Database session.
+
+    Returns:
+        TokenResponse: New token pair.
+
+    Raises:
+        HTTPException: 401 if the token is invalid, revoked, or not a refresh
+            token, or its user is no longer active.
+    """
+    payload = verify_token(body.refresh_token)
+    if (
+        payload is None
+        or payload.get("type") != "refresh"
+        or await revocation_list.is_revoked(payload["jti"])
+    ):
+        raise INVALID_REFRESH_TOKEN
+    user = db.execute(
+        select(User).where(User.username == payload["sub"])
+    ).scalar_one_or_none()
+    if user is None or not user.is_active:
+        raise INVALID_CREDENTIALS
+    if not revoke_token(payload):
+        # A concurrent refresh already used this token
+        raise INVALID_REFRESH_TOKEN
+    return issue_tokens(user.username)
+
+
+@router.get("/me")
+async def read_current_user(user: dict = Depends(get_current_user)):
+    """Return the authenticated user's name (a protected route)."""
+    return {"username": user["sub"]}
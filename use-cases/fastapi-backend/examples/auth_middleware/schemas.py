@@ -0,0 +1,45 @@
+"""
+Pydantic schemas for users and token exchange.
+"""
+
+from datetime import datetime
+
+from pydantic import BaseModel, ConfigDict, Field
+
+
+class UserCreate(BaseModel):
+    """Schema for registering a user."""
+
+    username: str = Field(min_length=1, max_length=150)
+    password: str = Field(min_length=8, max_length=1024)
+
+
+class UserResponse(BaseModel):
+    """Schema for user responses (never includes the password hash)."""
+
+    model_config = ConfigDict(from_attributes=True)
+
+    id: int
+    username: str
+    created_at: datetime
+
+
+class LoginRequest(BaseModel):
+    """Schema for exchanging credentials for tokens."""
+
+    username: str
+    password: str = Field(max_length=1024)
+
+
+class RefreshRequest(BaseModel):
+    """Schema for exchanging a refresh token for a new token pair."""
+
+    refresh_token: str
+
+
+class TokenResponse(BaseModel):
+    """Access and refresh tokens issued on login or refresh."""
+
+    access_token: str
+    refresh_token: str
+    token_type: str = "bearer"
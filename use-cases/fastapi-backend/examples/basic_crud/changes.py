@@ -0,0 +1,239 @@
+"""
+Incremental change feed for items.
+
+Every item insert, update and delete takes the next number from a
+commit-ordered change sequence (see ``models.ChangeSequence``), stored on
+the item (its latest write) or on its tombstone. The feed is a keyset scan
+over ``change_seq`` on both tables, merged into one ordered stream. Each
+event carries an opaque cursor; passing the last cursor back as ``?since=``
+returns every change committed after it, including updates made in the
+same second or by concurrent transactions.
+
+Live subscribers receive the same events over Server-Sent Events as the
+writes commit. The broadcaster is in-process, so with several workers each
+stream only sees its own worker's writes; the feed endpoint is the source of
+truth for catching up.
+"""
+
+import asyncio
+import base64
+import heapq
+from collections.abc import AsyncIterator, Iterator
+from contextlib import contextmanager
+from typing import Any, NamedTuple
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from .models import ChangeSequence, Item, ItemTombstone
+from .schemas import ItemResponse
+from .serialization import dumps
+
+ITEM_FIELDS = tuple(ItemResponse.model_fields)
+
+
+class Cursor(NamedTuple):
+    """Position in the change stream: the last change sequence number seen."""
+
+    seq: int
+
+    def encode(self) -> str:
+        """Encode as an opaque, URL-safe token."""
+        raw = f"seq|{self.seq}".encode()
+        return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+    @classmethod
+    def decode(cls, token: str) -> "Cursor":
+        """
+        Decode a token produced by ``encode``.
+
+        Raises:
+            ValueError: If the token is malformed.
+        """
+        try:
+            raw = base64.urlsafe_b64decode(token + "=" * (-len(token) % 4))
+            kind, seq = raw.decode().split("|")
+            cursor = cls(int(seq))
+        except (ValueError, UnicodeDecodeError) as e:
+            raise ValueError(f"Invalid change cursor: {token!r}") from e
+        if kind != "seq" or cursor.seq < 0:
+            raise ValueError(f"Invalid change cursor: {token!r}")
+        return cursor
+
+
+def upsert_event(item: Any) -> tuple[Cursor, dict]:
+    """
+    Build a create/update event from an Item row or ORM object.
+
+    Args:
+        item: Object exposing ``change_seq`` and the ItemResponse fields.
+
+    Returns:
+        tuple: ``(cursor, event)``.
+    """
+    cursor = Cursor(item.change_seq)
+    data = {field: getattr(item, field) for field in ITEM_FIELDS}
+    event = {"op": "upsert", "id": item.id, "at": item.updated_at, "item": data}
+    return cursor, event | {"cursor": cursor.encode()}
+
+
+def delete_event(tombstone: Any) -> tuple[Cursor, dict]:
+    """
+    Build a delete event from an ItemTombstone row or ORM object.
+
+    Args:
+        tombstone: Object with ``item_id``, ``deleted_at`` and ``change_seq``.
+
+    Returns:
+        tuple: ``(cursor, event)``.
+    """
+    cursor = Cursor(tombstone.change_seq)
+    event = {
+        "op": "delete",
+        "id": tombstone.item_id,
+        "at": tombstone.deleted_at,
+        "item": None,
+    }
+    return cursor, event | {"cursor": cursor.encode()}
+
+
+def fetch_changes(
+    db: Session, since: Cursor | None, limit: int
+) -> tuple[list[dict], Cursor | None, bool]:
+    """
+    Read up to ``limit`` changes after ``since``, oldest first.
+
+    Both scans are capped at the sequence's committed value, read first:
+    every change up to it has committed, so a later page can't turn up a
+    change numbered below this page's cursor. An item changed again since
+    then is reported once, at its latest write.
+
+    Args:
+        db: Database session.
+        since: Cursor of the last change already seen (None = from start).
+        limit: Maximum number of changes to return.
+
+    Returns:
+        tuple: ``(events, next_cursor, has_more)``; next_cursor is ``since``
+        when there are no new changes.
+    """
+    after = since.seq if since is not None else 0
+    committed = db.execute(
+        select(ChangeSequence.value).where(ChangeSequence.id == 1)
+    ).scalar_one()
+
+    upserts = db.execute(
+        select(Item.change_seq, *(getattr(Item, field) for field in ITEM_FIELDS))
+        .where(Item.change_seq > after, Item.change_seq <= committed)
+        .order_by(Item.change_seq)
+        .limit(limit + 1)
+    )
+    deletes = db.execute(
+        select(
+            ItemTombstone.change_seq, ItemTombstone.item_id, ItemTombstone.deleted_at
+        )
+        .where(ItemTombstone.change_seq > after, ItemTombstone.change_seq <= committed)
+        .order_by(ItemTombstone.change_seq)
+        .limit(limit + 1)
+    )
+    merged = list(
+        heapq.merge(
+            (upsert_event(row) for row in upserts),
+            (delete_event(row) for row in deletes),
+            key=lambda pair: pair[0],
+        )
+    )
+    page = merged[:limit]
+    next_cursor = page[-1][0] if page else since
+    return [event for _, event in page], next_cursor, len(merged) > limit
+
+
+class ChangeBroadcaster:
+    """
+    In-process fan-out of committed item changes to live subscribers.
+
+    Each subscriber gets a bounded queue. A subscriber that falls more than
+    ``max_queue`` events behind is disconnected instead of stalling writers;
+    it can resume from its last cursor through the change feed.
+    """
+
+    def __init__(self, max_queue: int = 1000) -> None:
+        self.max_queue = max_queue
+        self._queues: set[asyncio.Queue] = set()
+
+    @property
+    def subscriber_count(self) -> int:
+        """Number of currently connected subscribers."""
+        return len(self._queues)
+
+    def publish(self, event: dict) -> None:
+        """
+        Deliver an event to every subscriber. Must run on the event loop.
+
+        Args:
+            event: Change event (see ``upsert_event`` / ``delete_event``).
+        """
+        for queue in list(self._queues):
+            try:
+                queue.put_nowait(event)
+            except asyncio.QueueFull:
+                self._queues.discard(queue)
+                while not queue.empty():
+                    queue.get_nowait()
+                queue.put_nowait(None)  # end-of-stream marker
+
+    @contextmanager
+    def subscribe(self) -> Iterator[asyncio.Queue]:
+        """
+        Register a subscriber queue for the duration of the ``with`` block.
+
+        Yields:
+            asyncio.Queue: Receives events, then ``None`` if disconnected.
+        """
+        queue: asyncio.Queue = asyncio.Queue(self.max_queue)
+        self._queues.add(queue)
+        try:
+            yield queue
+        finally:
+            self._queues.discard(queue)
+
+
+broadcaster = ChangeBroadcaster()
+
+
+def format_sse(event: dict) -> str:
+    """Format a change event as a Server-Sent Events message."""
+    return (
+        f"id: {event['cursor']}\n"
+        f"event: {event['op']}\n"
+        f"data: {dumps(event).decode()}\n\n"
+    )
+
+
+async def sse_stream(
+    source: ChangeBroadcaster, keepalive_seconds: float = 15.0
+) -> AsyncIterator[str]:
+    """
+    Stream live change events as SSE messages.
+
+    Sends a comment line every ``keepalive_seconds`` of inactivity so
+    proxies keep the connection open.
+
+    Args:
+        source: Broadcaster to subscribe to.
+        keepalive_seconds: Idle interval between keep-alive comments.
+
+    Yields:
+        str: SSE-formatted messages.
+    """
+    with source.subscribe() as queue:
+        yield ": connected\n\n"
+        while True:
+            try:
+                event = await asyncio.wait_for(queue.get(), keepalive_seconds)
+            except asyncio.TimeoutError:
+                yield ": keep-alive\n\n"
+                continue
+            if event is None:
+                return
+            yield format_sse(event)
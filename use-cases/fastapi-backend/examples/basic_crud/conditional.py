@@ -0,0 +1,110 @@
+"""
+Conditional GET helpers: ETag / Last-Modified validators and 304 handling.
+
+ETags are derived from ``Item.version``, which every update increments,
+plus whatever else determines the representation (such as the sparse
+fieldset), so an unchanged item or page always yields the same strong ETag
+and any write yields a new one.
+
+Last-Modified comes from ``updated_at`` and has one-second resolution, like
+every HTTP-date; clients that send If-None-Match never depend on it.
+"""
+
+import hashlib
+from datetime import datetime, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+
+from fastapi import Request, Response, status
+
+
+def make_etag(*parts: object) -> str:
+    """
+    Build a strong ETag from the values that determine a representation.
+
+    Args:
+        *parts: Values identifying the representation (IDs, versions,
+            selected fields, query parameters).
+
+    Returns:
+        str: Quoted ETag, e.g. ``"3f2a..."``.
+    """
+    digest = hashlib.blake2b(repr(parts).encode(), digest_size=16).hexdigest()
+    return f'"{digest}"'
+
+
+def http_date(value: datetime) -> str:
+    """
+    Format a timestamp as an HTTP-date (naive values are treated as UTC).
+
+    Args:
+        value: Timestamp to format.
+
+    Returns:
+        str: e.g. ``Sat, 18 Oct 2026 10:00:00 GMT``.
+    """
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return format_datetime(value.astimezone(timezone.utc), usegmt=True)
+
+
+def has_preconditions(request: Request) -> bool:
+    """Whether the request carries If-None-Match or If-Modified-Since."""
+    headers = request.headers
+    return "if-none-match" in headers or "if-modified-since" in headers
+
+
+def is_not_modified(
+    request: Request, etag: str, last_modified: datetime | None
+) -> bool:
+    """
+    Evaluate If-None-Match / If-Modified-Since against current validators.
+
+    If-None-Match takes precedence when present (RFC 9110, section 13.2.2)
+    and uses weak comparison, so ``W/"..."`` matches too.
+
+    Args:
+        request: Incoming request.
+        etag: Current ETag of the representation.
+        last_modified: Current modification time, if known.
+
+    Returns:
+        bool: True if the client's cached copy is still current.
+    """
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        tags = {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+        return "*" in tags or etag in tags
+
+    if_modified_since = request.headers.get("if-modified-since")
+    if if_modified_since is None or last_modified is None:
+        return False
+    try:
+        since = parsedate_to_datetime(if_modified_since)
+    except (TypeError, ValueError):
+        return False
+    if last_modified.tzinfo is None:
+        last_modified = last_modified.replace(tzinfo=timezone.utc)
+    # HTTP-dates have one-second resolution
+    return last_modified.replace(microsecond=0) <= since
+
+
+def validator_headers(etag: str, last_modified: datetime | None) -> dict[str, str]:
+    """
+    Build the ETag / Last-Modified response headers.
+
+    Args:
+        etag: Current ETag.
+        last_modified: Current modification time, if known.
+
+    Returns:
+        dict[str, str]: Headers to attach to 200 and 304 responses.
+    """
+    headers = {"ETag": etag}
+    if last_modified is not None:
+        headers["Last-Modified"] = http_date(last_modified)
+    return headers
+
+
+def not_modified(headers: dict[str, str]) -> Response:
+    """Empty 304 response carrying the current validators."""
+    return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
@@ -0,0 +1,92 @@
+"""
+Cheap total counts for paginated item listings.
+
+Counting every row of a large table on each list call would double the
+database load of a paginated UI. Instead:
+
+1. Count at most ``exact_threshold + 1`` matching rows. Small results are
+   returned as ``exact``.
+2. Above the threshold, an unfiltered count on PostgreSQL uses the
+   planner's row estimate (``pg_class.reltuples``): ``estimate``.
+3. Otherwise a full count runs once per filter set and is reused for
+   ``cache_ttl`` seconds: ``exact`` when computed, ``cached`` afterwards.
+"""
+
+import dataclasses
+import time
+from collections import OrderedDict
+
+from sqlalchemy import func, select, text
+from sqlalchemy.orm import Session
+
+from ..shared.settings import settings
+from .filters import ItemFilters
+from .models import Item
+
+POSTGRES_ESTIMATE = text(
+    "SELECT reltuples::bigint FROM pg_class WHERE oid = 'items'::regclass"
+)
+
+
+class ItemCounter:
+    """
+    Counts items matching list filters, bounding the cost of large counts.
+
+    Args:
+        exact_threshold: Largest count that is always computed exactly.
+        cache_ttl: Seconds a large count is reused.
+        max_entries: Maximum number of cached filter sets.
+    """
+
+    def __init__(
+        self, exact_threshold: int, cache_ttl: float, max_entries: int = 1024
+    ) -> None:
+        self.exact_threshold = exact_threshold
+        self.cache_ttl = cache_ttl
+        self.max_entries = max_entries
+        self._cache: OrderedDict[ItemFilters, tuple[float, int]] = OrderedDict()
+
+    def count(self, db: Session, filters: ItemFilters) -> tuple[int, str]:
+        """
+        Count items matching ``filters``.
+
+        Args:
+            db: Database session.
+            filters: List filters (sort order is ignored).
+
+        Returns:
+            tuple: ``(count, accuracy)`` where accuracy is ``exact``,
+            ``cached`` or ``estimate``.
+        """
+        key = dataclasses.replace(filters, sort="id")
+        cached = self._cache.get(key)
+        if cached is not None and cached[0] > time.monotonic():
+            return cached[1], "cached"
+
+        matching = filters.apply(select(Item.id)).order_by(None)
+        bounded = select(func.count()).select_from(
+            matching.limit(self.exact_threshold + 1).subquery()
+        )
+        count = db.execute(bounded).scalar_one()
+        if count <= self.exact_threshold:
+            return count, "exact"
+
+        if key == ItemFilters() and db.get_bind().dialect.name == "postgresql":
+            estimate = db.execute(POSTGRES_ESTIMATE).scalar_one()
+            if estimate >= 0:  # -1 until the table has been analyzed
+                return max(estimate, count), "estimate"
+
+        total = db.execute(
+            select(func.count()).select_from(matching.subquery())
+        ).scalar_one()
+        self._cache[key] = (time.monotonic() + self.cache_ttl, total)
+        self._cache.move_to_end(key)
+        while len(self._cache) > self.max_entries:
+            self._cache.popitem(last=False)
+        return total, "exact"
+
+
+item_counter = ItemCounter(
+    exact_threshold=settings.count_exact_threshold,
+    cache_ttl=settings.count_cache_ttl_seconds,
+)
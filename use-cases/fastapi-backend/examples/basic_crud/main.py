@@ -2,11 +2,63 @@
 Basic CRUD API — App factory.
 
 Demonstrates minimal FastAPI setup with a single router.
+
+Importing this module is cheap: the router (and with it SQLAlchemy, the
+models and the DB driver) is imported when ``create_app()`` runs, the engine
+is created at startup, and the module-level ``app`` is only built when
+something asks for it (``uvicorn examples.basic_crud.main:app``). Servers
+should prefer ``create_app`` with ``--factory``, which builds it once.
 """
 
+from contextlib import asynccontextmanager
+
+import anyio
 from fastapi import FastAPI
 
-from .router import router as items_router
+from ..shared.compression import CompressionMiddleware
+from ..shared.idempotency import IdempotencyMiddleware, MemoryIdempotencyStore
+from ..shared.ratelimit import RateLimitMiddleware
+from ..shared.settings import settings
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """
+    Start and stop background services for the app's lifetime.
+
+    Startup pays one-time costs before the first request instead of during
+    it: the worker-thread backend used for sync dependencies (imported on
+    first use), ORM mapper configuration, and the connection pool
+    (``DB_POOL_WARMUP``). In ``batched`` write mode this also runs the
+    group-commit writer used by ``create_item``.
+
+    Shutdown runs after the server has drained in-flight requests: pending
+    creates are flushed, then the engine's connections are closed.
+    """
+    from sqlalchemy.orm import configure_mappers
+
+    from ..shared.database import dispose_engine, get_sessionmaker, warm_pool
+
+    await anyio.to_thread.run_sync(configure_mappers)
+    if settings.db_pool_warmup:
+        await anyio.to_thread.run_sync(warm_pool)
+    writer = None
+    if settings.item_write_mode == "batched":
+        from .batching import GroupCommitWriter
+
+        writer = GroupCommitWriter(
+            get_sessionmaker(),
+            max_batch_size=settings.write_batch_max_size,
+            max_delay=settings.write_batch_max_delay_ms / 1000,
+        )
+        await writer.start()
+    app.state.item_writer = writer
+    try:
+        yield
+    finally:
+        if writer is not None:
+            await writer.stop()
+        dispose_engine()
 
 
 def create_app() -> FastAPI:
@@ -16,12 +68,41 @@ def create_app() -> FastAPI:
     Returns:
         FastAPI: Configured application instance.
     """
+    from .router import router as items_router
+
     app = FastAPI(
         title="Basic CRUD API",
         description="A minimal CRUD example using FastAPI",
         version="0.1.0",
+        lifespan=lifespan,
+    )
+
+    # Retried POST/PUT with the same Idempotency-Key replay the first response
+    app.add_middleware(
+        IdempotencyMiddleware,
+        store=MemoryIdempotencyStore(
+            ttl=settings.idempotency_ttl_seconds,
+            max_entries=settings.idempotency_max_entries,
+        ),
+    )
+
+    # Outside the idempotency store, so replays are encoded per client
+    app.add_middleware(
+        CompressionMiddleware,
+        minimum_size=settings.compression_minimum_size,
+        gzip_level=settings.compression_gzip_level,
+        brotli_quality=settings.compression_brotli_quality,
+        zstd_level=settings.compression_zstd_level,
     )
 
+    # Outermost, so rejected requests cost as little as possible
+    if settings.rate_limit_enabled:
+        app.add_middleware(
+            RateLimitMiddleware,
+            rules=settings.rate_limits,
+            default=settings.rate_limit_default,
+        )
+
     app.include_router(items_router)
 
     @app.get("/health")
@@ -32,4 +113,10 @@ def create_app() -> FastAPI:
     return app
 
 
-app = create_app()
+def __getattr__(name: str):
+    # Build the module-level ``app`` on first access (PEP 562)
+    if name == "app":
+        global app
+        app = create_app()
+        return app
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -4,23 +4,158 @@ SQLAlchemy ORM models for the basic CRUD example.
 
 from datetime import datetime
 
-from sqlalchemy import DateTime, Integer, String, func
-from sqlalchemy.orm import Mapped, mapped_column
+from sqlalchemy import (
+    DDL,
+    Connection,
+    DateTime,
+    Index,
+    Integer,
+    String,
+    event,
+    func,
+    text,
+    update,
+)
+from sqlalchemy.dialects import sqlite
+from sqlalchemy.orm import Mapped, mapped_column, object_session
 
 from ..shared.database import Base
+from .search import POSTGRES_DDL, SQLITE_DDL
+
+# SQLite's CURRENT_TIMESTAMP has no fractional seconds; bind datetimes in the
+# same text format so range and equality comparisons on timestamps match.
+Timestamp = DateTime().with_variant(
+    sqlite.DATETIME(
+        storage_format="%(year)04d-%(month)02d-%(day)02d "
+        "%(hour)02d:%(minute)02d:%(second)02d"
+    ),
+    "sqlite",
+)
 
 
 class Item(Base):
     """An item in the database."""
 
     __tablename__ = "items"
+    __table_args__ = (
+        # Back the list filters/sorts and the change feed's keyset scans;
+        # the trailing id gives a stable tie-break without a sort step.
+        Index("ix_items_name_id", "name", "id"),
+        Index("ix_items_created_at_id", "created_at", "id"),
+        Index("ix_items_updated_at_id", "updated_at", "id"),
+        Index("ix_items_change_seq", "change_seq", unique=True),
+    )
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True, index=True)
     name: Mapped[str] = mapped_column(String(255), nullable=False)
     description: Mapped[str | None] = mapped_column(String(1000), nullable=True)
     created_at: Mapped[datetime] = mapped_column(
-        DateTime, server_default=func.now(), nullable=False
+        Timestamp, server_default=func.now(), nullable=False
     )
     updated_at: Mapped[datetime] = mapped_column(
-        DateTime, server_default=func.now(), onupdate=func.now(), nullable=False
+        Timestamp, server_default=func.now(), onupdate=func.now(), nullable=False
+    )
+    # Incremented by every UPDATE; unlike updated_at (whole seconds on
+    # SQLite) it changes on each write, so it backs the ETags
+    version: Mapped[int] = mapped_column(
+        Integer,
+        default=1,
+        server_default="1",
+        onupdate=text("version + 1"),
+        nullable=False,
+    )
+    # Position of the item's latest write in the change feed (see below)
+    change_seq: Mapped[int] = mapped_column(Integer, nullable=False)
+
+
+# Full-text search index (see search.py), created along with the table
+for _statement in SQLITE_DDL:
+    event.listen(
+        Item.__table__, "after_create", DDL(_statement).execute_if(dialect="sqlite")
     )
+for _statement in POSTGRES_DDL:
+    event.listen(
+        Item.__table__,
+        "after_create",
+        DDL(_statement).execute_if(dialect="postgresql"),
+    )
+
+
+class ItemTombstone(Base):
+    """Record of a deleted item, so the change feed can report deletes."""
+
+    __tablename__ = "item_tombstones"
+    __table_args__ = (
+        Index("ix_item_tombstones_change_seq", "change_seq", unique=True),
+    )
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    item_id: Mapped[int] = mapped_column(Integer, nullable=False)
+    deleted_at: Mapped[datetime] = mapped_column(
+        Timestamp, server_default=func.now(), nullable=False
+    )
+    change_seq: Mapped[int] = mapped_column(Integer, nullable=False)
+
+
+class ChangeSequence(Base):
+    """
+    Single-row counter numbering item writes for the change feed.
+
+    Timestamps can't order the feed: ``updated_at`` has whole seconds on
+    SQLite, and on PostgreSQL ``now()`` is the transaction start, so writes
+    can commit out of timestamp order. Instead every item insert, update
+    and delete takes the next number from this counter. Taking it locks
+    the row until the transaction ends, so numbers are handed out in
+    commit order and a reader never sees a lower number commit after a
+    higher one. The cost is that item writes are serialized on the counter
+    (SQLite serializes writers anyway).
+    """
+
+    __tablename__ = "change_sequence"
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    value: Mapped[int] = mapped_column(Integer, nullable=False)
+
+
+event.listen(
+    ChangeSequence.__table__,
+    "after_create",
+    DDL("INSERT INTO change_sequence (id, value) VALUES (1, 0)"),
+)
+
+
+def allocate_change_seq(connection: Connection, count: int = 1) -> int:
+    """
+    Reserve ``count`` consecutive change sequence numbers.
+
+    Must run inside the transaction that writes the changes; the counter
+    stays locked until it commits or rolls back.
+
+    Args:
+        connection: Connection of the writing transaction.
+        count: How many numbers to reserve.
+
+    Returns:
+        int: The first reserved number.
+    """
+    last = connection.execute(
+        update(ChangeSequence)
+        .where(ChangeSequence.id == 1)
+        .values(value=ChangeSequence.value + count)
+        .returning(ChangeSequence.value)
+    ).scalar_one()
+    return last - count + 1
+
+
+@event.listens_for(Item, "before_insert")
+@event.listens_for(ItemTombstone, "before_insert")
+def _number_insert(mapper, connection: Connection, target) -> None:
+    target.change_seq = allocate_change_seq(connection)
+
+
+@event.listens_for(Item, "before_update")
+def _number_update(mapper, connection: Connection, target) -> None:
+    # Flushes of unchanged objects still call this; they aren't writes
+    session = object_session(target)
+    if session is not None and session.is_modified(target):
+        target.change_seq = allocate_change_seq(connection)
@@ -4,76 +4,450 @@ CRUD router for items.
 Demonstrates standard REST endpoint patterns with FastAPI.
 """
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, status
+from fastapi.responses import StreamingResponse
+from sqlalchemy import select
 from sqlalchemy.orm import Session
 
 from ..shared.database import get_db
-from .models import Item
-from .schemas import ItemCreate, ItemResponse, ItemUpdate
+from .batching import GroupCommitWriter
+from .changes import (
+    Cursor,
+    broadcaster,
+    delete_event,
+    fetch_changes,
+    sse_stream,
+    upsert_event,
+)
+from .conditional import (
+    has_preconditions,
+    is_not_modified,
+    make_etag,
+    not_modified,
+    validator_headers,
+)
+from .counting import item_counter
+from .filters import ItemFilters, get_item_filters
+from .models import Item, ItemTombstone
+from .schemas import (
+    MAX_BATCH_IDS,
+    MAX_CHANGES_LIMIT,
+    MAX_ITEM_ID,
+    MIN_ITEM_ID,
+    ItemBatchRequest,
+    ItemBatchResponse,
+    ItemChangesResponse,
+    ItemCreate,
+    ItemResponse,
+    ItemSearchResult,
+    ItemUpdate,
+)
+from .search import SearchNotSupportedError, search_items
+from .serialization import FastJSONResponse
 
 router = APIRouter(prefix="/items", tags=["items"])
 
+# Columns selected for item responses, in ItemResponse field order
+ITEM_COLUMNS = tuple(getattr(Item, name) for name in ItemResponse.model_fields)
+
+
+def get_item_columns(fields: str | None = None) -> tuple:
+    """
+    Resolve the ``?fields=`` sparse fieldset into the columns to select.
+
+    Args:
+        fields: Comma-separated ItemResponse field names (e.g. ``name``).
+            Omitted means all fields.
+
+    Returns:
+        tuple: Item columns to select, in the requested order. ``id`` is
+        always included (first, unless requested elsewhere) so clients can
+        tell the returned items apart.
+
+    Raises:
+        HTTPException: 400 if the fieldset is empty or names unknown fields.
+    """
+    if fields is None:
+        return ITEM_COLUMNS
+    names = list(dict.fromkeys(f.strip() for f in fields.split(",") if f.strip()))
+    unknown = [name for name in names if name not in ItemResponse.model_fields]
+    if not names or unknown:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Invalid fields {unknown or fields!r}; "
+            f"allowed: {', '.join(ItemResponse.model_fields)}",
+        )
+    if "id" not in names:
+        names.insert(0, "id")
+    return tuple(getattr(Item, name) for name in names)
+
+
+def with_columns(columns: tuple, *required) -> tuple:
+    """Append any ``required`` columns not already in ``columns``."""
+    keys = {column.key for column in columns}
+    return columns + tuple(column for column in required if column.key not in keys)
+
+
+def page_etag(rows, *params) -> str:
+    """
+    Compute the ETag for a page of items.
+
+    Pages get no Last-Modified: a delete shifts an older row onto the page
+    without raising its newest ``updated_at``, so a time validator would
+    answer 304 for a page that changed. The ETag covers the page's ids.
+
+    Args:
+        rows: Rows with ``id`` and ``version`` attributes, in page order.
+        *params: Request parameters that shape the page (fields, paging).
+
+    Returns:
+        str: The page's ETag.
+    """
+    return make_etag(*params, [(row.id, row.version) for row in rows])
+
 
 @router.get("/", response_model=list[ItemResponse])
 async def list_items(
+    request: Request,
     skip: int = 0,
     limit: int = 100,
+    with_total: bool = False,
+    filters: ItemFilters = Depends(get_item_filters),
+    columns: tuple = Depends(get_item_columns),
     db: Session = Depends(get_db),
 ):
     """
-    List all items with pagination.
+    List items with filtering, sorting and pagination.
+
+    Filters (name prefix, created/updated ranges) and sort keys are all
+    backed by ``(<column>, id)`` indexes; see ``filters.py``.
+
+    Selects plain rows and serializes them directly to JSON, skipping
+    per-row ORM loading and ItemResponse validation. The wire format is
+    identical to ``list[ItemResponse]``; ``?fields=`` narrows both the
+    SELECT list and each returned object.
+
+    The page carries an ETag derived from its items' ``(id, version)``
+    (no Last-Modified; see ``page_etag``). If-None-Match is checked with a
+    query for just those columns and answered with 304 when unchanged.
+
+    With ``?with_total=true`` the response adds ``X-Total-Count`` and
+    ``X-Total-Count-Accuracy`` (``exact``, ``cached`` or ``estimate``);
+    large totals are estimated or cached instead of recounted per page.
 
     Args:
+        request: Incoming request (for conditional headers).
         skip: Number of items to skip (offset).
         limit: Maximum number of items to return.
+        with_total: Whether to report the total number of matching items.
+        filters: Filters and sort order from query parameters (injected).
+        columns: Columns to return, from ``?fields=`` (injected).
         db: Database session (injected).
 
     Returns:
         list[ItemResponse]: List of items.
     """
-    return db.query(Item).offset(skip).limit(limit).all()
+    keys = [column.key for column in columns]
+    stmt = (
+        filters.apply(select(*with_columns(columns, Item.id, Item.version)))
+        .offset(skip)
+        .limit(limit)
+    )
+
+    if "if-none-match" in request.headers:
+        versions = db.execute(stmt.with_only_columns(Item.id, Item.version))
+        etag = page_etag(versions, keys, skip, limit, filters)
+        if is_not_modified(request, etag, None):
+            return not_modified(validator_headers(etag, None))
+
+    rows = db.execute(stmt).all()
+    etag = page_etag(rows, keys, skip, limit, filters)
+    headers = validator_headers(etag, None)
+    if with_total:
+        total, accuracy = item_counter.count(db, filters)
+        headers["X-Total-Count"] = str(total)
+        headers["X-Total-Count-Accuracy"] = accuracy
+    return FastJSONResponse(
+        [{key: getattr(row, key) for key in keys} for row in rows],
+        headers=headers,
+    )
+
+
+def fetch_items_by_id(db: Session, ids: list[int], columns: tuple) -> dict:
+    """
+    Resolve many item IDs with a single ``IN`` query.
+
+    Args:
+        db: Database session.
+        ids: Requested IDs; duplicates are collapsed, order is kept.
+        columns: Columns to return for each item.
+
+    Returns:
+        dict: ``{"items": [...], "missing": [...]}`` in request order.
+    """
+    ids = list(dict.fromkeys(ids))
+    keys = [column.key for column in columns]
+    # Always select the id so rows can be matched back to the request
+    stmt = select(*with_columns(columns, Item.id)).where(Item.id.in_(ids))
+    rows = db.execute(stmt)
+    found = {row.id: {key: getattr(row, key) for key in keys} for row in rows}
+    return {
+        "items": [found[item_id] for item_id in ids if item_id in found],
+        "missing": [item_id for item_id in ids if item_id not in found],
+    }
+
+
+@router.get("/batch", response_model=ItemBatchResponse)
+async def get_items_batch(
+    ids: str,
+    columns: tuple = Depends(get_item_columns),
+    db: Session = Depends(get_db),
+):
+    """
+    Get many items by ID in one round trip (``?ids=1,2,3``).
+
+    Args:
+        ids: Comma-separated item IDs.
+        columns: Columns to return, from ``?fields=`` (injected).
+        db: Database session (injected).
+
+    Returns:
+        ItemBatchResponse: Found items in request order, plus missing IDs.
+
+    Raises:
+        HTTPException: 400 if ids is malformed, out of range, empty, or
+            too long.
+    """
+    try:
+        id_list = [int(part) for part in ids.split(",") if part.strip()]
+        if not all(MIN_ITEM_ID <= item_id <= MAX_ITEM_ID for item_id in id_list):
+            raise ValueError("id out of range")
+    except ValueError:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="ids must be a comma-separated list of integers",
+        ) from None
+    if not 0 < len(id_list) <= MAX_BATCH_IDS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"ids must contain between 1 and {MAX_BATCH_IDS} IDs",
+        )
+    return FastJSONResponse(fetch_items_by_id(db, id_list, columns))
+
+
+@router.post("/batch", response_model=ItemBatchResponse)
+async def post_items_batch(
+    request: ItemBatchRequest,
+    columns: tuple = Depends(get_item_columns),
+    db: Session = Depends(get_db),
+):
+    """
+    Get many items by ID, with the IDs in the request body.
+
+    Use this instead of ``GET /items/batch`` when the ID list is too long
+    for a URL.
+
+    Args:
+        request: IDs to fetch.
+        columns: Columns to return, from ``?fields=`` (injected).
+        db: Database session (injected).
+
+    Returns:
+        ItemBatchResponse: Found items in request order, plus missing IDs.
+    """
+    return FastJSONResponse(fetch_items_by_id(db, request.ids, columns))
+
+
+@router.get("/search", response_model=list[ItemSearchResult])
+async def search(
+    q: str,
+    skip: int = 0,
+    limit: int = 20,
+    db: Session = Depends(get_db),
+):
+    """
+    Full-text search over item names and descriptions.
+
+    Backed by an FTS5 table on SQLite and a GIN tsvector index on
+    PostgreSQL (see ``search.py``); no ``LIKE '%x%'`` scans.
+
+    Args:
+        q: Search terms; every term must match.
+        skip: Number of results to skip (offset).
+        limit: Maximum number of results to return.
+        db: Database session (injected).
+
+    Returns:
+        list[ItemSearchResult]: Hits ranked best first, with snippets.
+
+    Raises:
+        HTTPException: 400 if q is blank, 501 if the database has no
+            full-text support.
+    """
+    if not q.strip():
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Search query must not be empty",
+        )
+    try:
+        results = search_items(db, q, skip, limit)
+    except SearchNotSupportedError as e:
+        raise HTTPException(
+            status_code=status.HTTP_501_NOT_IMPLEMENTED, detail=str(e)
+        ) from None
+    return FastJSONResponse(results)
+
+
+@router.get("/changes", response_model=ItemChangesResponse)
+async def list_changes(
+    since: str | None = None,
+    limit: int = Query(100, ge=1, le=MAX_CHANGES_LIMIT),
+    db: Session = Depends(get_db),
+):
+    """
+    List item changes (creates, updates, deletes) after a cursor.
+
+    Sync clients pass the returned ``cursor`` back as ``?since=`` to fetch
+    only what changed since their last call, instead of re-listing items.
+
+    Args:
+        since: Cursor from a previous response or event (omit to start over).
+        limit: Maximum number of changes to return (1 to MAX_CHANGES_LIMIT).
+        db: Database session (injected).
+
+    Returns:
+        ItemChangesResponse: Changes oldest-first, next cursor, has_more.
+
+    Raises:
+        HTTPException: 400 if the cursor is invalid.
+    """
+    try:
+        cursor = Cursor.decode(since) if since else None
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST, detail=str(e)
+        ) from None
+    changes, next_cursor, has_more = fetch_changes(db, cursor, limit)
+    return FastJSONResponse(
+        {
+            "changes": changes,
+            "cursor": next_cursor.encode() if next_cursor else None,
+            "has_more": has_more,
+        }
+    )
+
+
+@router.get("/changes/stream")
+async def stream_changes():
+    """
+    Push item changes as Server-Sent Events as they commit.
+
+    Each event's ``id`` is a feed cursor; after a disconnect, catch up with
+    ``GET /items/changes?since=<last id>`` before resubscribing.
+
+    Returns:
+        StreamingResponse: ``text/event-stream`` of upsert/delete events.
+    """
+    return StreamingResponse(
+        sse_stream(broadcaster),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
 
 
 @router.get("/{item_id}", response_model=ItemResponse)
-async def get_item(item_id: int, db: Session = Depends(get_db)):
+async def get_item(
+    item_id: int,
+    request: Request,
+    columns: tuple = Depends(get_item_columns),
+    db: Session = Depends(get_db),
+):
     """
     Get a single item by ID.
 
+    Responses carry a strong ETag derived from the item's ``version`` and
+    a Last-Modified from ``updated_at``. Conditional requests
+    (If-None-Match / If-Modified-Since) are checked with a query for just
+    those two columns and answered with 304, so unchanged polls never load
+    the full row.
+
     Args:
         item_id: The item's database ID.
+        request: Incoming request (for conditional headers).
+        columns: Columns to return, from ``?fields=`` (injected).
         db: Database session (injected).
 
     Returns:
-        ItemResponse: The requested item.
+        ItemResponse: The requested item (only the requested fields).
 
     Raises:
         HTTPException: 404 if item not found.
     """
-    item = db.query(Item).filter(Item.id == item_id).first()
-    if not item:
+    keys = [column.key for column in columns]
+    stmt = select(*with_columns(columns, Item.version, Item.updated_at)).where(
+        Item.id == item_id
+    )
+
+    if has_preconditions(request):
+        current = db.execute(
+            stmt.with_only_columns(Item.version, Item.updated_at)
+        ).first()
+        if current is not None:
+            etag = make_etag(item_id, current.version, keys)
+            if is_not_modified(request, etag, current.updated_at):
+                return not_modified(validator_headers(etag, current.updated_at))
+
+    row = db.execute(stmt).first()
+    if row is None:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail=f"Item {item_id} not found",
         )
-    return item
+    etag = make_etag(item_id, row.version, keys)
+    return FastJSONResponse(
+        {key: getattr(row, key) for key in keys},
+        headers=validator_headers(etag, row.updated_at),
+    )
+
+
+def get_item_writer(request: Request) -> GroupCommitWriter | None:
+    """The app's group-commit writer, or None in direct write mode."""
+    return getattr(request.app.state, "item_writer", None)
 
 
 @router.post("/", response_model=ItemResponse, status_code=status.HTTP_201_CREATED)
-async def create_item(item: ItemCreate, db: Session = Depends(get_db)):
+async def create_item(
+    item: ItemCreate,
+    writer: GroupCommitWriter | None = Depends(get_item_writer),
+    db: Session = Depends(get_db),
+):
     """
     Create a new item.
 
+    In ``batched`` write mode the insert is queued on the group-commit
+    writer and the response is sent once its batch has committed.
+
     Args:
         item: Item data from request body.
+        writer: Group-commit writer, if enabled (injected).
         db: Database session (injected).
 
     Returns:
         ItemResponse: The created item with generated ID and timestamps.
     """
+    if writer is not None:
+        row = await writer.create(item.model_dump())
+        broadcaster.publish(upsert_event(row)[1])
+        return FastJSONResponse(
+            {key: getattr(row, key) for key in ItemResponse.model_fields},
+            status_code=status.HTTP_201_CREATED,
+        )
+
     db_item = Item(**item.model_dump())
     db.add(db_item)
     db.commit()
     db.refresh(db_item)
+    broadcaster.publish(upsert_event(db_item)[1])
     return db_item
 
 
@@ -103,6 +477,7 @@ async def update_item(item_id: int, item: ItemUpdate, db: Session = Depends(get_
         setattr(db_item, field, value)
     db.commit()
     db.refresh(db_item)
+    broadcaster.publish(upsert_event(db_item)[1])
     return db_item
 
 
@@ -124,5 +499,10 @@ async def delete_item(item_id: int, db: Session = Depends(get_db)):
             status_code=status.HTTP_404_NOT_FOUND,
             detail=f"Item {item_id} not found",
         )
+    # The tombstone lets the change feed report the delete
+    tombstone = ItemTombstone(item_id=item_id)
+    db.add(tombstone)
     db.delete(db_item)
     db.commit()
+    db.refresh(tombstone)
+    broadcaster.publish(delete_event(tombstone)[1])
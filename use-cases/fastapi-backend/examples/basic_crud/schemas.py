@@ -3,8 +3,20 @@ Pydantic schemas for request validation and response serialization.
 """
 
 from datetime import datetime
+from typing import Annotated, Literal
 
-from pydantic import BaseModel, ConfigDict
+from pydantic import BaseModel, ConfigDict, Field
+
+# Upper bound on IDs per multi-get request (keeps the IN list bounded)
+MAX_BATCH_IDS = 1000
+
+# IDs outside the int64 range can't be bound as query parameters
+MIN_ITEM_ID = -(2**63)
+MAX_ITEM_ID = 2**63 - 1
+ItemId = Annotated[int, Field(ge=MIN_ITEM_ID, le=MAX_ITEM_ID)]
+
+# Upper bound on changes per change-feed page
+MAX_CHANGES_LIMIT = 1000
 
 
 class ItemCreate(BaseModel):
@@ -31,3 +43,49 @@ class ItemResponse(BaseModel):
     description: str | None
     created_at: datetime
     updated_at: datetime
+
+
+class ItemBatchRequest(BaseModel):
+    """Schema for fetching many items by ID in one request."""
+
+    ids: list[ItemId] = Field(min_length=1, max_length=MAX_BATCH_IDS)
+
+
+class ItemBatchResponse(BaseModel):
+    """Schema for multi-get responses: found items in request order."""
+
+    items: list[ItemResponse]
+    missing: list[int]
+
+
+class ItemChange(BaseModel):
+    """A single create/update ("upsert") or delete in the change feed."""
+
+    op: Literal["upsert", "delete"]
+    id: int
+    at: datetime
+    item: ItemResponse | None
+    cursor: str
+
+
+class ItemChangesResponse(BaseModel):
+    """Schema for a page of the change feed."""
+
+    changes: list[ItemChange]
+    cursor: str | None
+    has_more: bool
+
+
+class ItemSearchResult(BaseModel):
+    """
+    Schema for a ranked full-text search hit.
+
+    ``name`` is plain text and must be escaped by clients that render HTML.
+    ``snippet`` is already-escaped HTML whose only markup is ``<b>`` around
+    matched terms, so it can be inserted as HTML directly.
+    """
+
+    id: int
+    name: str
+    rank: float
+    snippet: str
@@ -0,0 +1,189 @@
+"""
+Full-text search over item names and descriptions.
+
+- SQLite: an external-content FTS5 table (``items_fts``) kept in sync with
+  ``items`` by triggers, ranked with BM25.
+- PostgreSQL: a GIN index on a weighted ``tsvector`` expression, ranked with
+  ``ts_rank_cd``.
+
+``models.py`` attaches the index DDL to the ``items`` table's
+``after_create`` event, so ``Base.metadata.create_all()`` sets it up
+whatever else has been imported. For databases created before the index
+existed, call ``install_search_index(engine)`` once.
+
+Other dialects raise ``SearchNotSupportedError``, which the search endpoint
+reports as 501.
+
+Snippets are HTML: the database marks matches with private-use sentinel
+characters, the text is escaped, and only then are the sentinels turned
+into ``<b>``/``</b>``, so stored markup can never reach a client unescaped.
+"""
+
+import html
+
+from sqlalchemy import Engine, text
+from sqlalchemy.orm import Session
+
+# Name matches outrank description matches
+NAME_WEIGHT = 10.0
+DESCRIPTION_WEIGHT = 1.0
+
+# Match markers used inside the database, replaced after escaping
+MATCH_START = "\ue000"
+MATCH_STOP = "\ue001"
+
+SQLITE_DDL = [
+    "CREATE VIRTUAL TABLE IF NOT EXISTS items_fts USING fts5("
+    "name, description, content='items', content_rowid='id')",
+    "CREATE TRIGGER IF NOT EXISTS items_fts_ai AFTER INSERT ON items BEGIN "
+    "INSERT INTO items_fts(rowid, name, description) "
+    "VALUES (new.id, new.name, new.description); END",
+    "CREATE TRIGGER IF NOT EXISTS items_fts_ad AFTER DELETE ON items BEGIN "
+    "INSERT INTO items_fts(items_fts, rowid, name, description) "
+    "VALUES ('delete', old.id, old.name, old.description); END",
+    "CREATE TRIGGER IF NOT EXISTS items_fts_au "
+    "AFTER UPDATE OF name, description ON items BEGIN "
+    "INSERT INTO items_fts(items_fts, rowid, name, description) "
+    "VALUES ('delete', old.id, old.name, old.description); "
+    "INSERT INTO items_fts(rowid, name, description) "
+    "VALUES (new.id, new.name, new.description); END",
+]
+
+# The query must repeat this expression exactly for the index to be used
+POSTGRES_DOCUMENT = (
+    "setweight(to_tsvector('english', coalesce(name, '')), 'A') || "
+    "setweight(to_tsvector('english', coalesce(description, '')), 'B')"
+)
+POSTGRES_DDL = [
+    f"CREATE INDEX IF NOT EXISTS ix_items_search ON items "
+    f"USING GIN (({POSTGRES_DOCUMENT}))",
+]
+
+
+class SearchNotSupportedError(Exception):
+    """The database has no full-text search support this module can use."""
+
+    def __init__(self, dialect: str) -> None:
+        super().__init__(f"Full-text search not supported on {dialect}")
+        self.dialect = dialect
+
+
+def install_search_index(engine: Engine) -> None:
+    """
+    Create the search index on an existing database and (re)build it.
+
+    Safe to run repeatedly.
+
+    Args:
+        engine: Engine for a database that already has the items table.
+
+    Raises:
+        SearchNotSupportedError: For dialects other than SQLite and PostgreSQL.
+    """
+    dialect = engine.dialect.name
+    with engine.begin() as conn:
+        if dialect == "sqlite":
+            for statement in SQLITE_DDL:
+                conn.execute(text(statement))
+            conn.execute(text("INSERT INTO items_fts(items_fts) VALUES ('rebuild')"))
+        elif dialect == "postgresql":
+            for statement in POSTGRES_DDL:
+                conn.execute(text(statement))
+        else:
+            raise SearchNotSupportedError(dialect)
+
+
+def to_fts5_query(query: str) -> str:
+    """
+    Turn free text into a safe FTS5 query: every term must match.
+
+    Each whitespace-separated term is quoted, so FTS5 operators and
+    punctuation in user input cannot cause syntax errors.
+
+    Args:
+        query: Raw user query.
+
+    Returns:
+        str: FTS5 MATCH expression.
+    """
+    terms = query.split()
+    return " ".join('"' + term.replace('"', '""') + '"' for term in terms)
+
+
+SQLITE_SEARCH = text(
+    f"""
+    SELECT items.id, items.name,
+           -bm25(items_fts, {NAME_WEIGHT}, {DESCRIPTION_WEIGHT}) AS rank,
+           snippet(items_fts, -1, :start, :stop, '…', 12) AS snippet
+    FROM items_fts JOIN items ON items.id = items_fts.rowid
+    WHERE items_fts MATCH :query
+    ORDER BY rank DESC, items.id
+    LIMIT :limit OFFSET :skip
+    """
+)
+
+POSTGRES_SEARCH = text(
+    f"""
+    SELECT id, name,
+           ts_rank_cd({POSTGRES_DOCUMENT}, q) AS rank,
+           ts_headline('english', coalesce(description, name), q,
+                       'StartSel=' || :start || ', StopSel=' || :stop
+                       || ', MaxWords=24, MinWords=8')
+               AS snippet
+    FROM items, websearch_to_tsquery('english', :query) AS q
+    WHERE ({POSTGRES_DOCUMENT}) @@ q
+    ORDER BY rank DESC, id
+    LIMIT :limit OFFSET :skip
+    """
+)
+
+
+def render_snippet(snippet: str) -> str:
+    """
+    HTML-escape a snippet and mark its matches with ``<b>`` tags.
+
+    Args:
+        snippet: Snippet text with matches between sentinel characters.
+
+    Returns:
+        str: Safe HTML.
+    """
+    return html.escape(snippet).replace(MATCH_START, "<b>").replace(MATCH_STOP, "</b>")
+
+
+def search_items(db: Session, query: str, skip: int, limit: int) -> list[dict]:
+    """
+    Run a ranked full-text search over item names and descriptions.
+
+    Args:
+        db: Database session.
+        query: Free-text query; all terms must match.
+        skip: Number of results to skip (offset).
+        limit: Maximum number of results to return.
+
+    Returns:
+        list[dict]: ``id``, ``name``, ``rank`` (higher is better) and a
+        ``snippet`` (escaped HTML with matches wrapped in ``<b>`` tags),
+        best first.
+
+    Raises:
+        SearchNotSupportedError: For dialects other than SQLite and PostgreSQL.
+    """
+    dialect = db.get_bind().dialect.name
+    if dialect == "sqlite":
+        stmt, query = SQLITE_SEARCH, to_fts5_query(query)
+    elif dialect == "postgresql":
+        stmt = POSTGRES_SEARCH
+    else:
+        raise SearchNotSupportedError(dialect)
+    params = {
+        "query": query,
+        "skip": skip,
+        "limit": limit,
+        "start": MATCH_START,
+        "stop": MATCH_STOP,
+    }
+    results = [row._asdict() for row in db.execute(stmt, params)]
+    for result in results:
+        result["snippet"] = render_snippet(result["snippet"] or "")
+    return results
@@ -0,0 +1,40 @@
+"""
+Fast JSON serialization for item responses.
+
+Serializes plain SQL rows straight to JSON bytes with orjson, skipping
+per-row Pydantic validation while producing the same wire format as
+``ItemResponse``.
+"""
+
+from typing import Any
+
+import orjson
+from fastapi import Response
+
+
+def dumps(content: Any) -> bytes:
+    """
+    Serialize content to JSON bytes in the ItemResponse wire format.
+
+    Args:
+        content: JSON-compatible data (dicts, lists, datetimes, ...).
+
+    Returns:
+        bytes: UTF-8 encoded JSON.
+    """
+    return orjson.dumps(content, option=orjson.OPT_UTC_Z)
+
+
+class FastJSONResponse(Response):
+    """
+    JSON response rendered with orjson.
+
+    Datetimes are written as ISO 8601 with a ``Z`` suffix for UTC, matching
+    Pydantic's serialization, so clients see the same payload as a
+    ``response_model`` route.
+    """
+
+    media_type = "application/json"
+
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
@@ -0,0 +1,57 @@
+"""
+Production server entry point for the basic CRUD API.
+
+Usage (from use-cases/fastapi-backend):
+    python -m examples.basic_crud.server
+
+Runs uvicorn with worker count, keep-alive, listen backlog and connection
+limits from ``Settings``. Each worker builds its own app via the factory,
+warms its connection pool before accepting traffic, and on SIGTERM stops
+accepting, drains in-flight requests (up to
+``SERVER_GRACEFUL_TIMEOUT_SECONDS``) and disposes its engine.
+"""
+
+import os
+
+import uvicorn
+
+from ..shared.settings import settings
+
+
+def available_cpus() -> int:
+    """CPUs this process may run on (respects affinity / cpusets)."""
+    if hasattr(os, "sched_getaffinity"):
+        return len(os.sched_getaffinity(0))
+    return os.cpu_count() or 1
+
+
+def worker_count() -> int:
+    """
+    Number of worker processes to run.
+
+    Returns:
+        int: ``SERVER_WORKERS`` if set, otherwise one per available CPU; each
+        worker is a single-threaded event loop, so more would only contend.
+    """
+    return settings.server_workers or available_cpus()
+
+
+def main() -> None:
+    """Run the API under uvicorn with production settings."""
+    uvicorn.run(
+        "examples.basic_crud.main:create_app",
+        factory=True,
+        host=settings.server_host,
+        port=settings.server_port,
+        workers=worker_count(),
+        backlog=settings.server_backlog,
+        timeout_keep_alive=settings.server_keepalive_seconds,
+        limit_concurrency=settings.server_limit_concurrency,
+        timeout_graceful_shutdown=settings.server_graceful_timeout_seconds,
+        proxy_headers=True,
+        access_log=settings.debug,
+    )
+
+
+if __name__ == "__main__":
+    main()
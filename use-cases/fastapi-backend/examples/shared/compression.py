@@ -0,0 +1,225 @@
+"""
+Negotiated response compression (zstd, brotli, gzip).
+
+The encoding is picked from the request's ``Accept-Encoding`` in server
+preference order (zstd, then br, then gzip), skipping any whose optional
+library isn't installed (``brotli``, ``zstandard``; gzip is always there).
+
+- Complete responses below ``minimum_size`` bytes are sent as-is; the
+  framing overhead and CPU aren't worth it.
+- Streaming responses (``more_body``) are compressed chunk by chunk, each
+  chunk flushed so clients receive data as it is produced.
+- Already-encoded responses, 204s, and excluded media types (by default
+  ``text/event-stream``, whose events must not be held in a compressor)
+  pass through untouched.
+
+Every other response, compressed or not and including 304s, gets
+``Vary: Accept-Encoding`` and has a strong ETag weakened (``W/"..."``): the
+bytes depend on the negotiated coding, and a 304 must carry the same
+validator as the 200 it revalidates. Conditional GETs still match because
+If-None-Match uses weak comparison.
+"""
+
+import zlib
+from functools import lru_cache
+
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+try:
+    import brotli
+except ImportError:  # optional
+    brotli = None
+
+try:
+    import zstandard
+except ImportError:  # optional
+    zstandard = None
+
+AVAILABLE = tuple(
+    name
+    for name, module in (("zstd", zstandard), ("br", brotli), ("gzip", zlib))
+    if module is not None
+)
+
+
+@lru_cache(maxsize=256)
+def negotiate(accept_encoding: str, available: tuple[str, ...] = AVAILABLE) -> str:
+    """
+    Choose a content coding for an ``Accept-Encoding`` header.
+
+    Args:
+        accept_encoding: Raw header value.
+        available: Supported codings in preference order.
+
+    Returns:
+        str: The chosen coding, or ``""`` for identity.
+    """
+    accepted: dict[str, float] = {}
+    for item in accept_encoding.split(","):
+        coding, _, params = item.strip().partition(";")
+        q = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                q = float(params[2:])
+            except ValueError:
+                q = 0.0
+        accepted[coding.strip().lower()] = q
+    wildcard = accepted.get("*", 0.0)
+    for coding in available:
+        if accepted.get(coding, wildcard) > 0:
+            return coding
+    return ""
+
+
+class Compressor:
+    """Incremental compressor for one response body."""
+
+    def __init__(self, coding: str, levels: dict[str, int]) -> None:
+        self.coding = coding
+        level = levels[coding]
+        if coding == "gzip":
+            self._obj = zlib.compressobj(level, zlib.DEFLATED, 31)
+        elif coding == "br":
+            self._obj = brotli.Compressor(quality=level)
+        else:
+            self._obj = zstandard.ZstdCompressor(level=level).compressobj()
+
+    def compress(self, data: bytes) -> bytes:
+        """Compress a chunk and flush it so it can be sent immediately."""
+        if self.coding == "gzip":
+            return self._obj.compress(data) + self._obj.flush(zlib.Z_SYNC_FLUSH)
+        if self.coding == "br":
+            return self._obj.process(data) + self._obj.flush()
+        return self._obj.compress(data) + self._obj.flush(
+            zstandard.COMPRESSOBJ_FLUSH_BLOCK
+        )
+
+    def finish(self, data: bytes = b"") -> bytes:
+        """Compress the final chunk and end the stream."""
+        if self.coding == "br":
+            return self._obj.process(data) + self._obj.finish()
+        return self._obj.compress(data) + self._obj.flush()
+
+
+class CompressionMiddleware:
+    """
+    ASGI middleware compressing responses the client can decode.
+
+    Args:
+        app: The wrapped ASGI application.
+        minimum_size: Smallest complete body (bytes) worth compressing.
+        gzip_level: zlib level, 1-9.
+        brotli_quality: Brotli quality, 0-11.
+        zstd_level: Zstandard level, 1-22.
+        exclude_media_types: Content types never compressed.
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        minimum_size: int = 1024,
+        gzip_level: int = 6,
+        brotli_quality: int = 4,
+        zstd_level: int = 3,
+        exclude_media_types: tuple[str, ...] = ("text/event-stream",),
+    ) -> None:
+        self.app = app
+        self.minimum_size = minimum_size
+        self.levels = {"gzip": gzip_level, "br": brotli_quality, "zstd": zstd_level}
+        self.exclude_media_types = exclude_media_types
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        accept_encoding = ""
+        for name, value in scope["headers"]:
+            if name == b"accept-encoding":
+                accept_encoding = value.decode("latin-1")
+                break
+        coding = negotiate(accept_encoding) if accept_encoding else ""
+        await self.app(scope, receive, _CompressingSend(self, coding, send))
+
+
+class _CompressingSend:
+    """``send`` wrapper that decides per response whether to compress."""
+
+    def __init__(self, middleware: CompressionMiddleware, coding: str, send: Send):
+        self.middleware = middleware
+        self.coding = coding
+        self.send = send
+        self.start: Message | None = None
+        self.compressor: Compressor | None = None
+        self.passthrough = False
+
+    async def __call__(self, message: Message) -> None:
+        if message["type"] == "http.response.start":
+            self.start = message
+            headers = MutableHeaders(raw=list(message.get("headers", [])))
+            media_type = headers.get("content-type", "").split(";")[0].strip()
+            if (
+                message["status"] == 204
+                or "content-encoding" in headers
+                or media_type in self.middleware.exclude_media_types
+            ):
+                self.passthrough = True
+                await self.send(message)
+            elif message["status"] == 304:
+                self.passthrough = True
+                await self.send(_negotiated_start(message))
+            return
+        if message["type"] != "http.response.body" or self.passthrough:
+            await self.send(message)
+            return
+
+        body = message.get("body", b"")
+        more_body = message.get("more_body", False)
+        if self.start is not None:
+            start, self.start = self.start, None
+            if not self.coding or (
+                not more_body and len(body) < self.middleware.minimum_size
+            ):
+                self.passthrough = True
+                await self.send(_negotiated_start(start))
+                await self.send(message)
+                return
+            self.compressor = Compressor(self.coding, self.middleware.levels)
+            if not more_body:
+                body = self.compressor.finish(body)
+                await self.send(self._encoded_start(start, len(body)))
+                await self.send({"type": "http.response.body", "body": body})
+                return
+            await self.send(self._encoded_start(start, None))
+
+        if more_body:
+            chunk = self.compressor.compress(body)
+            if chunk:
+                await self.send(
+                    {"type": "http.response.body", "body": chunk, "more_body": True}
+                )
+        else:
+            await self.send(
+                {"type": "http.response.body", "body": self.compressor.finish(body)}
+            )
+
+    def _encoded_start(self, start: Message, length: int | None) -> Message:
+        start = _negotiated_start(start)
+        headers = MutableHeaders(raw=start["headers"])
+        headers["content-encoding"] = self.coding
+        if length is None:
+            del headers["content-length"]
+        else:
+            headers["content-length"] = str(length)
+        return {**start, "headers": headers.raw}
+
+
+def _negotiated_start(start: Message) -> Message:
+    # Same Vary and ETag form whatever coding (or 304) this request got
+    headers = MutableHeaders(raw=list(start.get("headers", [])))
+    headers.add_vary_header("Accept-Encoding")
+    etag = headers.get("etag")
+    if etag is not None and not etag.startswith("W/"):
+        headers["etag"] = f"W/{etag}"
+    return {**start, "headers": headers.raw}
@@ -2,23 +2,72 @@
 Database session management with SQLAlchemy.
 
 Provides engine creation and session dependency for FastAPI.
+
+The engine (and with it the DB driver import) is created by ``get_engine()``
+on first use, not at import, so importing models or the app factory stays
+cheap.
 """
 
-from sqlalchemy import create_engine
+from functools import lru_cache
+
+from sqlalchemy import Engine, create_engine, text
 from sqlalchemy.orm import DeclarativeBase, sessionmaker
 
 from .settings import settings
 
 
-engine = create_engine(
-    settings.database_url,
-    # SQLite needs check_same_thread=False for FastAPI
-    connect_args={"check_same_thread": False}
-    if settings.database_url.startswith("sqlite")
-    else {},
-)
+@lru_cache
+def get_engine() -> Engine:
+    """Create the application's engine on first call and reuse it."""
+    return create_engine(
+        settings.database_url,
+        # SQLite needs check_same_thread=False for FastAPI
+        connect_args={"check_same_thread": False}
+        if settings.database_url.startswith("sqlite")
+        else {},
+    )
+
+
+@lru_cache
+def get_sessionmaker() -> sessionmaker:
+    """Session factory bound to ``get_engine()``."""
+    return sessionmaker(autocommit=False, autoflush=False, bind=get_engine())
+
+
+def dispose_engine() -> None:
+    """Close the engine's pooled connections, if the engine was ever created."""
+    if get_engine.cache_info().currsize:
+        get_engine().dispose()
+
 
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+def warm_pool(count: int | None = None) -> int:
+    """
+    Open pooled connections ahead of traffic so first requests don't pay
+    connect (and TLS/auth) latency.
+
+    All connections are checked out at once, so the pool really grows to
+    ``count``, then returned.
+
+    Args:
+        count: Connections to open. Defaults to the pool's steady-state size.
+
+    Returns:
+        int: Number of connections opened.
+    """
+    engine = get_engine()
+    if count is None:
+        size = getattr(engine.pool, "size", None)
+        count = size() if callable(size) else 1
+    connections = []
+    try:
+        for _ in range(count):
+            conn = engine.connect()
+            connections.append(conn)
+            conn.execute(text("SELECT 1"))
+    finally:
+        for conn in connections:
+            conn.close()
+    return len(connections)
 
 
 class Base(DeclarativeBase):
@@ -31,12 +80,14 @@ def get_db():
     """
     FastAPI dependency that yields a database session.
 
-    Automatically closes the session after the request completes.
+    The session checks out a pooled connection only when the handler first
+    runs a query, and is closed (returning it) once the response has been
+    produced.
 
     Yields:
         Session: SQLAlchemy database session.
     """
-    db = SessionLocal()
+    db = get_sessionmaker()()
     try:
         yield db
     finally:
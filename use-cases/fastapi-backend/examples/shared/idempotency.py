@@ -0,0 +1,265 @@
+"""
+Idempotency-Key support for unsafe requests.
+
+Clients that retry a ``POST``/``PUT``/``PATCH`` after a timeout send the
+same ``Idempotency-Key`` header; the first response for that key is stored
+and replayed for every repeat without running the endpoint (or touching the
+database) again. Concurrent duplicates wait for the in-flight request and
+share its response.
+
+Keys are scoped to the method, path and ``Authorization`` header, and bound
+to a fingerprint of the request (canonical query string and body): reusing a
+key with different query parameters or a different body is rejected with
+422. 5xx responses are not stored, so a failed request can be
+retried.
+
+The default store is an in-process LRU with a TTL. To share responses across
+workers, pass any object implementing ``IdempotencyStore`` (e.g. backed by
+Redis) as ``store``; in-flight coalescing stays per process.
+"""
+
+import asyncio
+import hashlib
+import time
+from collections import OrderedDict
+from typing import NamedTuple, Protocol
+from urllib.parse import parse_qsl, urlencode
+
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+HEADER = b"idempotency-key"
+REPLAYED_HEADER = (b"idempotent-replayed", b"true")
+MAX_KEY_LENGTH = 255
+UNSAFE_METHODS = frozenset({"POST", "PUT", "PATCH"})
+
+
+class StoredResponse(NamedTuple):
+    """A complete response captured for replay."""
+
+    fingerprint: str
+    status: int
+    headers: list[tuple[bytes, bytes]]
+    body: bytes
+
+
+class IdempotencyStore(Protocol):
+    """Backend holding stored responses by scoped idempotency key."""
+
+    async def get(self, key: str) -> StoredResponse | None: ...
+
+    async def set(self, key: str, response: StoredResponse) -> None: ...
+
+
+class MemoryIdempotencyStore:
+    """
+    Bounded in-process store; least recently used entries are evicted first.
+
+    Args:
+        ttl: Seconds a stored response is replayed.
+        max_entries: Maximum number of stored responses.
+    """
+
+    def __init__(self, ttl: float = 86_400.0, max_entries: int = 10_000) -> None:
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._entries: OrderedDict[str, tuple[float, StoredResponse]] = OrderedDict()
+
+    async def get(self, key: str) -> StoredResponse | None:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        if entry[0] <= time.monotonic():
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return entry[1]
+
+    async def set(self, key: str, response: StoredResponse) -> None:
+        self._entries[key] = (time.monotonic() + self.ttl, response)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+
+class IdempotencyMiddleware:
+    """
+    ASGI middleware that replays stored responses for repeated keys.
+
+    Args:
+        app: The wrapped ASGI application.
+        store: Response store. Defaults to a ``MemoryIdempotencyStore``.
+        max_body_size: Responses larger than this (bytes) are not stored.
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        store: IdempotencyStore | None = None,
+        max_body_size: int = 1_000_000,
+    ) -> None:
+        self.app = app
+        self.store = store if store is not None else MemoryIdempotencyStore()
+        self.max_body_size = max_body_size
+        self._inflight: dict[str, asyncio.Future] = {}
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or scope["method"] not in UNSAFE_METHODS:
+            await self.app(scope, receive, send)
+            return
+        headers = dict(scope["headers"])
+        raw_key = headers.get(HEADER)
+        if raw_key is None:
+            await self.app(scope, receive, send)
+            return
+        if not raw_key or len(raw_key) > MAX_KEY_LENGTH:
+            await _send_error(send, 400, "Invalid Idempotency-Key header")
+            return
+
+        body, more_body = await _read_body(receive)
+        key = _scoped_key(scope, headers, raw_key)
+        fingerprint = _fingerprint(scope, body)
+
+        while True:
+            stored = await self.store.get(key)
+            if stored is not None:
+                await _replay(stored, fingerprint, send)
+                return
+            pending = self._inflight.get(key)
+            if pending is None:
+                break
+            # Same key already running here: wait for its response
+            stored = await asyncio.shield(pending)
+            if stored is not None:
+                await _replay(stored, fingerprint, send)
+                return
+            # Not stored (5xx / too large): loop and run it ourselves
+
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[key] = future
+        stored = None
+        try:
+            stored = await self._call_and_capture(
+                scope, _replay_receive(body, more_body, receive), send, fingerprint
+            )
+            if stored is not None:
+                await self.store.set(key, stored)
+        finally:
+            del self._inflight[key]
+            future.set_result(stored)
+
+    async def _call_and_capture(
+        self, scope: Scope, receive: Receive, send: Send, fingerprint: str
+    ) -> StoredResponse | None:
+        start: Message | None = None
+        chunks: list[bytes] = []
+        size = 0
+        storable = True
+
+        async def capture(message: Message) -> None:
+            nonlocal start, size, storable
+            if message["type"] == "http.response.start":
+                start = message
+                storable = message["status"] < 500
+            elif message["type"] == "http.response.body" and storable:
+                chunk = message.get("body", b"")
+                size += len(chunk)
+                if size > self.max_body_size:
+                    storable = False
+                    chunks.clear()
+                else:
+                    chunks.append(chunk)
+            await send(message)
+
+        await self.app(scope, receive, capture)
+        if start is None or not storable:
+            return None
+        return StoredResponse(
+            fingerprint=fingerprint,
+            status=start["status"],
+            headers=list(start.get("headers", [])),
+            body=b"".join(chunks),
+        )
+
+
+def _scoped_key(scope: Scope, headers: dict[bytes, bytes], raw_key: bytes) -> str:
+    """Key a response by method, path, caller credentials and client key."""
+    digest = hashlib.blake2b(digest_size=16)
+    for part in (
+        scope["method"].encode(),
+        scope["path"].encode(),
+        headers.get(b"authorization", b""),
+        raw_key,
+    ):
+        digest.update(len(part).to_bytes(4, "big"))
+        digest.update(part)
+    return digest.hexdigest()
+
+
+def _fingerprint(scope: Scope, body: bytes) -> str:
+    """Identify the request a key was used for: canonical query and body."""
+    query = scope.get("query_string", b"").decode("latin-1")
+    canonical = urlencode(sorted(parse_qsl(query, keep_blank_values=True)))
+    digest = hashlib.blake2b(digest_size=16)
+    for part in (canonical.encode(), body):
+        digest.update(len(part).to_bytes(8, "big"))
+        digest.update(part)
+    return digest.hexdigest()
+
+
+async def _read_body(receive: Receive) -> tuple[bytes, bool]:
+    """Read the full request body; report whether the client disconnected."""
+    chunks = []
+    while True:
+        message = await receive()
+        if message["type"] == "http.disconnect":
+            return b"".join(chunks), False
+        chunks.append(message.get("body", b""))
+        if not message.get("more_body", False):
+            return b"".join(chunks), True
+
+
+def _replay_receive(body: bytes, complete: bool, receive: Receive) -> Receive:
+    """Hand the already-read body to the app, then defer to the real channel."""
+    sent = False
+
+    async def replay() -> Message:
+        nonlocal sent
+        if not sent:
+            sent = True
+            if complete:
+                return {"type": "http.request", "body": body, "more_body": False}
+            return {"type": "http.disconnect"}
+        return await receive()
+
+    return replay
+
+
+async def _replay(stored: StoredResponse, fingerprint: str, send: Send) -> None:
+    if stored.fingerprint != fingerprint:
+        await _send_error(
+            send, 422, "Idempotency-Key was already used with a different request"
+        )
+        return
+    await send(
+        {
+            "type": "http.response.start",
+            "status": stored.status,
+            "headers": [*stored.headers, REPLAYED_HEADER],
+        }
+    )
+    await send({"type": "http.response.body", "body": stored.body})
+
+
+async def _send_error(send: Send, status_code: int, detail: str) -> None:
+    body = b'{"detail":"' + detail.encode() + b'"}'
+    await send(
+        {
+            "type": "http.response.start",
+            "status": status_code,
+            "headers": [
+                (b"content-type", b"application/json"),
+                (b"content-length", str(len(body)).encode()),
+            ],
+        }
+    )
+    await send({"type": "http.response.body", "body": body})
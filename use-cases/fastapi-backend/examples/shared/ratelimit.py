@@ -0,0 +1,185 @@
+"""
+Token-bucket rate limiting middleware.
+
+Each client (by IP, or any key a ``key_func`` derives from the request) gets
+a bucket per rule. Buckets use GCRA, the token bucket stored as a single
+"theoretical arrival time" per key, so a check is one dict read and write
+with no locks. Over-limit requests get ``429`` with ``Retry-After``.
+
+Rules come from settings as ``{"[METHOD ]/path-prefix": "<n>/<unit>"}``;
+the longest matching prefix wins, and ``rate_limit_default`` covers the
+rest. Unit is ``second``, ``minute``, ``hour`` or ``day``; the bucket holds
+``n`` tokens, so bursts of up to ``n`` requests are allowed.
+
+Limiting is opt-in (``RATE_LIMIT_ENABLED``). State lives in
+``MemoryRateLimitBackend`` by default, which limits per process and keeps
+at most ``max_keys`` buckets, evicting the least recently used. To limit
+across workers, pass a shared ``RateLimitBackend`` (e.g. backed by Redis);
+if it fails, the middleware falls back to the in-memory backend rather
+than rejecting or letting every request through.
+"""
+
+import logging
+import math
+import time
+from collections import OrderedDict
+from typing import Callable, NamedTuple, Protocol
+
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+logger = logging.getLogger(__name__)
+
+UNITS = {"second": 1.0, "minute": 60.0, "hour": 3600.0, "day": 86400.0}
+
+
+class Rate(NamedTuple):
+    """``limit`` requests per ``period`` seconds, bursting up to ``limit``."""
+
+    limit: int
+    period: float
+
+    @classmethod
+    def parse(cls, value: str) -> "Rate":
+        """
+        Parse ``"<n>/<unit>"`` (e.g. ``"100/minute"``).
+
+        Raises:
+            ValueError: If the value is malformed.
+        """
+        count, _, unit = value.partition("/")
+        limit = int(count)
+        if limit <= 0 or unit.strip() not in UNITS:
+            raise ValueError(f"Invalid rate {value!r}; expected '<n>/<unit>'")
+        return cls(limit, UNITS[unit.strip()])
+
+
+class RateLimitBackend(Protocol):
+    """Stores buckets; returns seconds to wait, or 0 if the request is allowed."""
+
+    async def hit(self, key: str, rate: Rate) -> float: ...
+
+
+class MemoryRateLimitBackend:
+    """
+    In-process GCRA buckets in a bounded LRU.
+
+    Every allowed request moves its key to the end, so the front holds the
+    keys idle longest. Those buckets have usually refilled already; evicting
+    one that hasn't only resets that client to a full bucket.
+
+    Args:
+        max_keys: Maximum buckets kept; the least recently used go first.
+    """
+
+    def __init__(self, max_keys: int = 100_000) -> None:
+        self.max_keys = max_keys
+        self._tat: OrderedDict[str, float] = OrderedDict()
+
+    def check(self, key: str, rate: Rate, now: float | None = None) -> float:
+        """Synchronous ``hit``; usable directly where no await is wanted."""
+        if now is None:
+            now = time.monotonic()
+        interval = rate.period / rate.limit
+        tat = max(self._tat.get(key, now), now)
+        # Room for one more while tat is at most period - interval ahead;
+        # written without adding and re-subtracting the period, whose float
+        # rounding could reject the first request of a fresh bucket
+        wait = tat - (rate.period - interval) - now
+        if wait > 0:
+            return wait
+        self._tat[key] = tat + interval
+        self._tat.move_to_end(key)
+        if len(self._tat) > self.max_keys:
+            self._tat.popitem(last=False)
+        return 0.0
+
+    async def hit(self, key: str, rate: Rate) -> float:
+        return self.check(key, rate)
+
+
+def client_ip(scope: Scope) -> str:
+    """Rate-limit key from the client address (set by the server/proxy)."""
+    client = scope.get("client")
+    return f"ip:{client[0]}" if client else "ip:unknown"
+
+
+class RateLimitMiddleware:
+    """
+    ASGI middleware applying per-route token buckets.
+
+    Args:
+        app: The wrapped ASGI application.
+        rules: ``{"[METHOD ]/path-prefix": "<n>/<unit>"}``.
+        default: Rate for requests no rule matches; empty disables it.
+        key_func: Derives the client key from the ASGI scope.
+        backend: Bucket store. Defaults to a ``MemoryRateLimitBackend``.
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        rules: dict[str, str] | None = None,
+        default: str = "",
+        key_func: Callable[[Scope], str] = client_ip,
+        backend: RateLimitBackend | None = None,
+    ) -> None:
+        self.app = app
+        self.key_func = key_func
+        self.local = MemoryRateLimitBackend()
+        self.backend = backend
+        self.default = Rate.parse(default) if default else None
+        parsed = []
+        for pattern, value in (rules or {}).items():
+            method, _, prefix = pattern.rpartition(" ")
+            parsed.append((method.upper() or None, prefix, pattern, Rate.parse(value)))
+        # Longest prefix first; method-specific rules before method-agnostic
+        parsed.sort(key=lambda rule: (-len(rule[1]), rule[0] is None))
+        self.rules = parsed
+
+    def match(self, method: str, path: str) -> tuple[str, Rate] | None:
+        """Return the ``(rule name, rate)`` governing a request, if any."""
+        for rule_method, prefix, name, rate in self.rules:
+            if path.startswith(prefix) and rule_method in (None, method):
+                return name, rate
+        if self.default is not None:
+            return "*", self.default
+        return None
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        matched = self.match(scope["method"], scope["path"])
+        if matched is None:
+            await self.app(scope, receive, send)
+            return
+        name, rate = matched
+        key = f"{name}|{self.key_func(scope)}"
+        if self.backend is None:
+            wait = self.local.check(key, rate)
+        else:
+            try:
+                wait = await self.backend.hit(key, rate)
+            except Exception:
+                logger.warning("Rate limit backend failed; using local buckets")
+                wait = self.local.check(key, rate)
+        if wait > 0:
+            await _too_many_requests(send, wait)
+            return
+        await self.app(scope, receive, send)
+
+
+async def _too_many_requests(send: Send, wait: float) -> None:
+    body = b'{"detail":"Too Many Requests"}'
+    await send(
+        {
+            "type": "http.response.start",
+            "status": 429,
+            "headers": [
+                (b"content-type", b"application/json"),
+                (b"content-length", str(len(body)).encode()),
+                (b"retry-after", str(math.ceil(wait)).encode()),
+            ],
+        }
+    )
+    await send({"type": "http.response.body", "body": body})
@@ -4,6 +4,8 @@ Application settings using pydantic-settings.
 Loads from .env file and environment variables.
 """
 
+from typing import Literal
+
 from pydantic_settings import BaseSettings
 
 
@@ -17,6 +19,63 @@ class Settings(BaseSettings):
     secret_key: str = "change-me-to-a-random-secret"
     jwt_algorithm: str = "HS256"
     access_token_expire_minutes: int = 30
+    refresh_token_expire_days: int = 7
+    # RS*/ES* only: PEM private key for signing, JWK set (JSON) for verifying
+    jwt_private_key: str = ""
+    jwt_public_keys: str = ""
+    jwt_key_id: str = ""
+    token_cache_size: int = 10_000
+
+    # Password hashing (scrypt cost and worker threads)
+    password_hash_n: int = 2**14
+    password_hash_r: int = 8
+    password_hash_p: int = 1
+    password_hash_workers: int = 2
+
+    # Token revocation (jti Bloom filter + revoked_tokens table)
+    revocation_capacity: int = 100_000
+    revocation_error_rate: float = 0.001
+    revocation_refresh_seconds: float = 30.0
+    revocation_lookback_seconds: float = 60.0
+
+    # Pagination counts (X-Total-Count)
+    count_exact_threshold: int = 10_000
+    count_cache_ttl_seconds: float = 30.0
+
+    # Item writes: "direct" commits per request, "batched" group-commits
+    item_write_mode: Literal["direct", "batched"] = "direct"
+    write_batch_max_size: int = 256
+    write_batch_max_delay_ms: float = 5.0
+
+    # Idempotency-Key response store
+    idempotency_ttl_seconds: float = 86_400.0
+    idempotency_max_entries: int = 10_000
+
+    # Response compression (zstd/br need the optional zstandard/brotli packages)
+    compression_minimum_size: int = 1024
+    compression_gzip_level: int = 6
+    compression_brotli_quality: int = 4
+    compression_zstd_level: int = 3
+
+    # Rate limiting, off by default
+    # Rules: {"[METHOD ]/path-prefix": "<n>/<unit>"}, longest prefix wins
+    rate_limit_enabled: bool = False
+    rate_limit_default: str = "600/minute"
+    rate_limits: dict[str, str] = {
+        "POST /items": "120/minute",
+        "/auth/token": "10/minute",
+        "/auth/users": "10/minute",
+    }
+
+    # Server (examples/basic_crud/server.py); workers=0 sizes from CPUs
+    server_host: str = "127.0.0.1"
+    server_port: int = 8000
+    server_workers: int = 0
+    server_backlog: int = 2048
+    server_keepalive_seconds: int = 5
+    server_limit_concurrency: int | None = None
+    server_graceful_timeout_seconds: int = 30
+    db_pool_warmup: bool = True
 
     # CORS
     cors_origins: str = "http://localhost:3000,http://localhost:5173"
@@ -0,0 +1,42 @@
+"""
+Shared fixtures for the example API tests.
+
+Every test gets a fresh SQLite database file and a TestClient running the
+app's lifespan. Settings are read from the environment at import, so the
+overrides below must be set before any ``examples`` module is imported.
+"""
+
+import os
+import tempfile
+
+DB_DIR = tempfile.mkdtemp(prefix="fastapi-backend-tests-")
+os.environ["DATABASE_URL"] = f"sqlite:///{DB_DIR}/test.db"
+os.environ.setdefault("DB_POOL_WARMUP", "false")
+os.environ.setdefault("RATE_LIMIT_ENABLED", "false")
+os.environ.setdefault("PASSWORD_HASH_N", str(2**10))  # fast hashes for tests
+
+import pytest  # noqa: E402
+from fastapi.testclient import TestClient  # noqa: E402
+
+from examples.auth_middleware import models as auth_models  # noqa: E402, F401
+from examples.basic_crud import models  # noqa: E402, F401
+from examples.shared.database import Base, get_engine, get_sessionmaker  # noqa: E402
+
+
+@pytest.fixture
+def db_session():
+    """A session on a freshly created schema."""
+    engine = get_engine()
+    Base.metadata.drop_all(engine)
+    Base.metadata.create_all(engine)
+    with get_sessionmaker()() as session:
+        yield session
+
+
+@pytest.fixture
+def client(db_session):
+    """TestClient for the basic CRUD app on a fresh database."""
+    from examples.basic_crud.main import create_app
+
+    with TestClient(create_app()) as test_client:
+        yield test_client
@@ -0,0 +1,71 @@
+"""Tests for registration, login and refresh-token rotation."""
+
+import pytest
+from fastapi.testclient import TestClient
+
+from examples.auth_middleware.auth import verify_token
+from examples.auth_middleware.revocation import revoke_token
+
+USER = {"username": "alice", "password": "correct horse"}
+
+
+@pytest.fixture
+def auth_client(db_session):
+    """TestClient for the auth app on a fresh database."""
+    from examples.auth_middleware.main import create_app
+
+    with TestClient(create_app()) as test_client:
+        yield test_client
+
+
+@pytest.fixture
+def tokens(auth_client):
+    assert auth_client.post("/auth/users", json=USER).status_code == 201
+    response = auth_client.post("/auth/token", json=USER)
+    assert response.status_code == 200
+    return response.json()
+
+
+def test_register_rejects_duplicate_username(auth_client):
+    response = auth_client.post("/auth/users", json=USER)
+    assert response.status_code == 201
+    assert response.json()["username"] == "alice"
+    assert "password" not in response.text
+    assert auth_client.post("/auth/users", json=USER).status_code == 409
+
+
+def test_login_rejects_wrong_password_and_unknown_user(auth_client, tokens):
+    wrong = {**USER, "password": "wrong password"}
+    assert auth_client.post("/auth/token", json=wrong).status_code == 401
+    unknown = {**USER, "username": "bob"}
+    assert auth_client.post("/auth/token", json=unknown).status_code == 401
+
+
+def test_access_token_reads_current_user(auth_client, tokens):
+    headers = {"Authorization": f"Bearer {tokens['access_token']}"}
+    response = auth_client.get("/auth/me", headers=headers)
+    assert response.status_code == 200
+    assert response.json()["username"] == "alice"
+
+
+def test_refresh_token_is_single_use(auth_client, tokens):
+    body = {"refresh_token": tokens["refresh_token"]}
+    rotated = auth_client.post("/auth/refresh", json=body)
+    assert rotated.status_code == 200
+    assert rotated.json()["refresh_token"] != tokens["refresh_token"]
+
+    assert auth_client.post("/auth/refresh", json=body).status_code == 401
+    again = {"refresh_token": rotated.json()["refresh_token"]}
+    assert auth_client.post("/auth/refresh", json=again).status_code == 200
+
+
+def test_access_token_cannot_refresh(auth_client, tokens):
+    body = {"refresh_token": tokens["access_token"]}
+    assert auth_client.post("/auth/refresh", json=body).status_code == 401
+
+
+def test_only_one_revocation_of_a_token_wins(tokens):
+    # Two refreshes that both passed the revocation check race here
+    payload = verify_token(tokens["refresh_token"])
+    assert revoke_token(payload) is True
+    assert revoke_token(payload) is False
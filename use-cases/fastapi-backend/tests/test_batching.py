@@ -0,0 +1,59 @@
+"""Tests for the group-commit item writer."""
+
+import asyncio
+
+import pytest
+from fastapi.testclient import TestClient
+
+from examples.basic_crud.batching import GroupCommitWriter
+from examples.basic_crud.main import create_app
+from examples.shared.database import get_sessionmaker
+from examples.shared.settings import settings
+
+
+async def test_concurrent_creates_share_commits(db_session):
+    writer = GroupCommitWriter(get_sessionmaker(), max_batch_size=8)
+    await writer.start()
+    try:
+        rows = await asyncio.gather(
+            *(writer.create({"name": f"item-{i}"}) for i in range(20))
+        )
+    finally:
+        await writer.stop()
+    assert [row.name for row in rows] == [f"item-{i}" for i in range(20)]
+    assert len({row.id for row in rows}) == 20
+
+
+async def test_stop_flushes_queued_creates(db_session):
+    writer = GroupCommitWriter(get_sessionmaker(), max_delay=1.0)
+    await writer.start()
+    pending = asyncio.ensure_future(writer.create({"name": "queued"}))
+    await asyncio.sleep(0)
+    await writer.stop()
+    assert (await pending).name == "queued"
+
+
+async def test_create_after_stop_is_rejected(db_session):
+    writer = GroupCommitWriter(get_sessionmaker())
+    await writer.start()
+    stopping = asyncio.ensure_future(writer.stop())
+    await asyncio.sleep(0)
+    with pytest.raises(RuntimeError):
+        await asyncio.wait_for(writer.create({"name": "late"}), timeout=1)
+    await stopping
+    with pytest.raises(RuntimeError):
+        await writer.create({"name": "later"})
+
+
+def test_batched_mode_endpoint(db_session, monkeypatch):
+    monkeypatch.setattr(settings, "item_write_mode", "batched")
+    with TestClient(create_app()) as batched:
+        response = batched.post("/items/", json={"name": "batched"})
+    assert response.status_code == 201
+    assert set(response.json()) == {
+        "id",
+        "name",
+        "description",
+        "created_at",
+        "updated_at",
+    }
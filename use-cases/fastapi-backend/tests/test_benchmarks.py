@@ -0,0 +1,31 @@
+"""Smoke test: the route benchmark runs every route cleanly on a tiny table."""
+
+import json
+
+from benchmarks import bench_routes
+
+
+async def test_every_route_runs_without_errors():
+    bench_routes.seed(40)
+    results = await bench_routes.bench_asgi(40, requests=5, concurrency=2)
+
+    assert set(results) == {name for name, _, _ in bench_routes.routes(40, "")}
+    for route, stats in results.items():
+        assert stats["errors"] == 0, route
+        assert stats["requests"] == 5
+        assert stats["p50_ms"] <= stats["p99_ms"]
+
+
+def test_compare_reports_change_per_route(tmp_path, capsys):
+    row = {"size": 10, "transport": "asgi", "route": "get", "p50_ms": 1.0}
+    baseline = tmp_path / "baseline.json"
+    baseline.write_text(
+        json.dumps(
+            {"meta": {"commit": "abc"}, "results": [{**row, "rps": 100, "p99_ms": 2}]}
+        )
+    )
+    bench_routes.compare([{**row, "rps": 150, "p99_ms": 1}], str(baseline))
+    out = capsys.readouterr().out
+    assert "(abc)" in out
+    assert "rps  +50.0%" in out
+    assert "p99  -50.0%" in out
@@ -0,0 +1,74 @@
+"""Tests for the item change feed."""
+
+import pytest
+
+from examples.basic_crud.schemas import MAX_CHANGES_LIMIT
+
+
+def changes(client, since=None, **params):
+    if since is not None:
+        params["since"] = since
+    response = client.get("/items/changes", params=params)
+    assert response.status_code == 200
+    return response.json()
+
+
+def test_feed_reports_creates_updates_and_deletes(client):
+    first = client.post("/items/", json={"name": "first"}).json()
+    second = client.post("/items/", json={"name": "second"}).json()
+    client.put(f"/items/{first['id']}", json={"name": "first, renamed"})
+    client.delete(f"/items/{second['id']}")
+
+    page = changes(client)
+    # Each item appears once, at its latest change
+    assert [(c["op"], c["id"]) for c in page["changes"]] == [
+        ("upsert", first["id"]),
+        ("delete", second["id"]),
+    ]
+    assert page["changes"][0]["item"]["name"] == "first, renamed"
+    assert changes(client, page["cursor"])["changes"] == []
+
+
+def test_update_of_lower_id_in_same_second_is_not_missed(client):
+    """Changes within one timestamp tick must still sort after the cursor."""
+    low = client.post("/items/", json={"name": "low"}).json()
+    client.post("/items/", json={"name": "high"})
+    cursor = changes(client)["cursor"]
+
+    client.put(f"/items/{low['id']}", json={"name": "low, updated"})
+
+    page = changes(client, cursor)
+    assert [(c["op"], c["id"]) for c in page["changes"]] == [("upsert", low["id"])]
+    assert page["changes"][0]["item"]["name"] == "low, updated"
+
+
+def test_unchanged_update_is_not_a_change(client):
+    item = client.post("/items/", json={"name": "same"}).json()
+    cursor = changes(client)["cursor"]
+    client.put(f"/items/{item['id']}", json={"name": "same"})
+    assert changes(client, cursor)["changes"] == []
+
+
+def test_feed_pages_with_has_more(client):
+    for i in range(5):
+        client.post("/items/", json={"name": f"item-{i}"})
+
+    seen, cursor = [], None
+    while True:
+        page = changes(client, cursor, limit=2)
+        seen += [c["item"]["name"] for c in page["changes"]]
+        cursor = page["cursor"]
+        if not page["has_more"]:
+            break
+    assert seen == [f"item-{i}" for i in range(5)]
+
+
+def test_invalid_cursor_is_rejected(client):
+    response = client.get("/items/changes", params={"since": "not-a-cursor"})
+    assert response.status_code == 400
+
+
+@pytest.mark.parametrize("limit", [0, -5, MAX_CHANGES_LIMIT + 1])
+def test_out_of_range_limit_is_rejected(client, limit):
+    response = client.get("/items/changes", params={"limit": limit})
+    assert response.status_code == 422
@@ -0,0 +1,110 @@
+"""Tests for negotiated response compression."""
+
+import gzip
+
+import pytest
+from fastapi import FastAPI, Request, Response
+from fastapi.responses import PlainTextResponse, StreamingResponse
+from fastapi.testclient import TestClient
+
+from examples.shared.compression import AVAILABLE, CompressionMiddleware, negotiate
+
+BIG = "x" * 4096
+ETAG = '"abc"'
+
+
+@pytest.fixture
+def client() -> TestClient:
+    app = FastAPI()
+
+    @app.get("/big")
+    async def big(request: Request):
+        if request.headers.get("if-none-match", "").removeprefix("W/") == ETAG:
+            return Response(status_code=304, headers={"ETag": ETAG})
+        return PlainTextResponse(BIG, headers={"ETag": ETAG})
+
+    @app.get("/small")
+    async def small():
+        return PlainTextResponse("tiny", headers={"ETag": ETAG})
+
+    @app.get("/stream")
+    async def stream():
+        async def chunks():
+            for _ in range(4):
+                yield BIG
+
+        return StreamingResponse(chunks(), media_type="text/plain")
+
+    @app.get("/events")
+    async def events():
+        return PlainTextResponse(BIG, media_type="text/event-stream")
+
+    app.add_middleware(CompressionMiddleware, minimum_size=1024)
+    return TestClient(app)
+
+
+def decode(coding: str, data: bytes) -> bytes:
+    if coding == "br":
+        return pytest.importorskip("brotli").decompress(data)
+    if coding == "zstd":
+        zstandard = pytest.importorskip("zstandard")
+        return zstandard.ZstdDecompressor().decompressobj().decompress(data)
+    return gzip.decompress(data)
+
+
+def get(client: TestClient, path: str, coding: str, **headers: str):
+    return client.get(path, headers={"Accept-Encoding": coding, **headers})
+
+
+def test_negotiate_prefers_server_order_and_honours_q():
+    available = ("zstd", "br", "gzip")
+    assert negotiate("gzip, br, zstd", available) == "zstd"
+    assert negotiate("gzip, br, zstd;q=0", available) == "br"
+    assert negotiate("gzip;q=0.5", available) == "gzip"
+    assert negotiate("identity", available) == ""
+    assert negotiate("*;q=0", available) == ""
+    assert negotiate("*", ("gzip",)) == "gzip"
+
+
+@pytest.mark.parametrize("coding", ["gzip", "br", "zstd"])
+def test_large_body_is_compressed(client, coding):
+    if coding not in AVAILABLE:
+        pytest.skip(f"{coding} support is not installed")
+    headers = {"Accept-Encoding": coding}
+    with client.stream("GET", "/big", headers=headers) as response:
+        raw = b"".join(response.iter_raw())
+    assert response.headers["content-encoding"] == coding
+    assert int(response.headers["content-length"]) == len(raw) < len(BIG)
+    assert decode(coding, raw) == BIG.encode()
+
+
+def test_streaming_body_is_compressed_in_chunks(client):
+    response = get(client, "/stream", "gzip")
+    assert response.headers["content-encoding"] == "gzip"
+    assert "content-length" not in response.headers
+    assert response.text == BIG * 4
+
+
+def test_small_and_identity_responses_still_vary(client):
+    for path, coding in (("/small", "gzip"), ("/big", "identity")):
+        response = get(client, path, coding)
+        assert "content-encoding" not in response.headers
+        assert "Accept-Encoding" in response.headers["vary"]
+
+
+def test_etag_form_is_the_same_on_200_and_304(client):
+    for coding in ("gzip", "identity"):
+        full = get(client, "/big", coding)
+        assert full.headers["etag"] == f"W/{ETAG}"
+        revalidated = get(
+            client, "/big", coding, **{"If-None-Match": full.headers["etag"]}
+        )
+        assert revalidated.status_code == 304
+        assert revalidated.headers["etag"] == full.headers["etag"]
+        assert "Accept-Encoding" in revalidated.headers["vary"]
+
+
+def test_event_streams_pass_through(client):
+    response = get(client, "/events", "gzip")
+    assert "content-encoding" not in response.headers
+    assert response.text == BIG
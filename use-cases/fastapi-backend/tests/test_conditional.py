@@ -0,0 +1,70 @@
+"""Tests for ETag / Last-Modified conditional GETs on items."""
+
+
+def test_get_item_revalidates_with_304(client):
+    item = client.post("/items/", json={"name": "widget"}).json()
+
+    response = client.get(f"/items/{item['id']}")
+    etag = response.headers["etag"]
+    assert response.headers["last-modified"]
+
+    revalidated = client.get(f"/items/{item['id']}", headers={"If-None-Match": etag})
+    assert revalidated.status_code == 304
+    assert revalidated.headers["etag"] == etag
+
+
+def test_update_in_same_second_changes_etag(client):
+    """updated_at only has whole seconds; the ETag must change anyway."""
+    item = client.post("/items/", json={"name": "widget"}).json()
+    etag = client.get(f"/items/{item['id']}").headers["etag"]
+
+    client.put(f"/items/{item['id']}", json={"name": "first"})
+    response = client.get(f"/items/{item['id']}", headers={"If-None-Match": etag})
+    assert response.status_code == 200
+    assert response.json()["name"] == "first"
+
+    etag = response.headers["etag"]
+    client.put(f"/items/{item['id']}", json={"name": "second"})
+    response = client.get(f"/items/{item['id']}", headers={"If-None-Match": etag})
+    assert response.status_code == 200
+    assert response.json()["name"] == "second"
+
+
+def test_list_etag_changes_when_an_item_changes(client):
+    item = client.post("/items/", json={"name": "widget"}).json()
+    etag = client.get("/items/").headers["etag"]
+    assert client.get("/items/", headers={"If-None-Match": etag}).status_code == 304
+
+    client.put(f"/items/{item['id']}", json={"description": "updated"})
+    response = client.get("/items/", headers={"If-None-Match": etag})
+    assert response.status_code == 200
+    assert response.headers["etag"] != etag
+
+
+def test_etag_depends_on_fieldset(client):
+    item = client.post("/items/", json={"name": "widget"}).json()
+    full = client.get(f"/items/{item['id']}").headers["etag"]
+    narrow = client.get(f"/items/{item['id']}?fields=id,name")
+    assert narrow.headers["etag"] != full
+    assert set(narrow.json()) == {"id", "name"}
+
+
+def test_list_ignores_if_modified_since_after_delete(client):
+    """A delete shifts an older row onto the page; that must not be a 304."""
+    ids = [
+        client.post("/items/", json={"name": f"n{i}"}).json()["id"] for i in range(4)
+    ]
+    first = client.get("/items/", params={"limit": 3})
+    assert "last-modified" not in first.headers
+    since = "Fri, 31 Dec 9999 23:59:59 GMT"
+
+    client.delete(f"/items/{ids[1]}")
+    response = client.get(
+        "/items/", params={"limit": 3}, headers={"If-Modified-Since": since}
+    )
+    assert response.status_code == 200
+    assert [item["id"] for item in response.json()] == [ids[0], ids[2], ids[3]]
+    stale = client.get(
+        "/items/", params={"limit": 3}, headers={"If-None-Match": first.headers["etag"]}
+    )
+    assert stale.status_code == 200
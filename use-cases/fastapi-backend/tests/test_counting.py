@@ -0,0 +1,65 @@
+"""Tests for bounded, cached total counts on item listings."""
+
+import pytest
+
+from examples.basic_crud.counting import ItemCounter
+from examples.basic_crud.filters import ItemFilters
+from examples.basic_crud.models import Item
+
+
+@pytest.fixture
+def items(db_session):
+    db_session.add_all(Item(name=f"item-{i}") for i in range(10))
+    db_session.add(Item(name="other"))
+    db_session.commit()
+    return db_session
+
+
+def test_small_counts_are_exact(items):
+    counter = ItemCounter(exact_threshold=100, cache_ttl=60)
+    assert counter.count(items, ItemFilters()) == (11, "exact")
+    assert counter.count(items, ItemFilters(name_prefix="item-")) == (10, "exact")
+    assert not counter._cache
+
+
+def test_large_counts_are_cached_per_filter_set(items):
+    counter = ItemCounter(exact_threshold=5, cache_ttl=60)
+    filters = ItemFilters(name_prefix="item-")
+    assert counter.count(items, filters) == (10, "exact")
+
+    items.add(Item(name="item-new"))
+    items.commit()
+    # Sort order doesn't change the total, so it shares the entry
+    assert counter.count(items, ItemFilters(name_prefix="item-", sort="-name")) == (
+        10,
+        "cached",
+    )
+    assert counter.count(items, ItemFilters()) == (12, "exact")
+
+
+def test_expired_counts_are_recomputed(items):
+    counter = ItemCounter(exact_threshold=5, cache_ttl=0)
+    assert counter.count(items, ItemFilters()) == (11, "exact")
+    items.add(Item(name="late"))
+    items.commit()
+    assert counter.count(items, ItemFilters()) == (12, "exact")
+
+
+def test_cache_is_bounded(items):
+    counter = ItemCounter(exact_threshold=0, cache_ttl=60, max_entries=2)
+    for prefix in ("item-1", "item-2", "other"):
+        counter.count(items, ItemFilters(name_prefix=prefix))
+    assert list(counter._cache) == [
+        ItemFilters(name_prefix="item-2"),
+        ItemFilters(name_prefix="other"),
+    ]
+
+
+def test_with_total_adds_count_headers(client):
+    for i in range(3):
+        client.post("/items/", json={"name": f"n{i}"})
+    response = client.get("/items/", params={"with_total": True, "limit": 1})
+    assert len(response.json()) == 1
+    assert response.headers["x-total-count"] == "3"
+    assert response.headers["x-total-count-accuracy"] == "exact"
+    assert "x-total-count" not in client.get("/items/").headers
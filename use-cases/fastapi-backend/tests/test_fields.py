@@ -0,0 +1,34 @@
+"""Tests for ``?fields=`` sparse fieldsets."""
+
+import pytest
+
+
+@pytest.fixture
+def item(client):
+    return client.post("/items/", json={"name": "widget", "description": "d"}).json()
+
+
+def test_only_requested_fields_plus_id(client, item):
+    single = client.get(f"/items/{item['id']}", params={"fields": "name"})
+    listed = client.get("/items/", params={"fields": "name,description"})
+    batch = client.get(
+        "/items/batch", params={"ids": item["id"], "fields": "updated_at"}
+    )
+
+    assert single.json() == {"id": item["id"], "name": "widget"}
+    assert listed.json() == [{"id": item["id"], "name": "widget", "description": "d"}]
+    assert batch.json()["items"] == [
+        {"id": item["id"], "updated_at": item["updated_at"]}
+    ]
+
+
+def test_requested_order_is_kept(client, item):
+    response = client.get(f"/items/{item['id']}", params={"fields": "name, id,name"})
+    assert list(response.json()) == ["name", "id"]
+
+
+@pytest.mark.parametrize("fields", ["", " , ", "name,secret", "password"])
+def test_empty_or_unknown_fields_are_rejected(client, item, fields):
+    for path in (f"/items/{item['id']}", "/items/"):
+        response = client.get(path, params={"fields": fields})
+        assert response.status_code == 400
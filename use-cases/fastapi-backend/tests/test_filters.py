@@ -0,0 +1,72 @@
+"""Tests for list filters, sort order and name-prefix bounds."""
+
+import sys
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from examples.basic_crud.filters import prefix_upper_bound, to_utc_naive
+
+
+@pytest.mark.parametrize(
+    ("prefix", "upper"),
+    [
+        ("abc", "abd"),
+        ("a", "b"),
+        ("a" + chr(sys.maxunicode), "b"),
+        (chr(sys.maxunicode) * 2, None),
+    ],
+)
+def test_prefix_upper_bound(prefix, upper):
+    assert prefix_upper_bound(prefix) == upper
+
+
+def test_to_utc_naive():
+    aware = datetime(2024, 1, 1, 12, tzinfo=timezone(timedelta(hours=2)))
+    assert to_utc_naive(aware) == datetime(2024, 1, 1, 10)
+    assert to_utc_naive(datetime(2024, 1, 1)) == datetime(2024, 1, 1)
+    assert to_utc_naive(None) is None
+
+
+def listed(client, key: str, **params) -> list:
+    response = client.get("/items/", params=params)
+    assert response.status_code == 200
+    return [item[key] for item in response.json()]
+
+
+def names(client, **params) -> list[str]:
+    return listed(client, "name", **params)
+
+
+def test_name_prefix_is_exact_and_escaped(client):
+    for name in ("app", "apple", "apricot", "b", "a_x", "abx", "a%y", "A"):
+        client.post("/items/", json={"name": name})
+
+    assert names(client, name_prefix="app", sort="name") == ["app", "apple"]
+    assert "A" not in names(client, name_prefix="a")  # case-sensitive
+    assert names(client, name_prefix="a_") == ["a_x"]
+    assert names(client, name_prefix="a%") == ["a%y"]
+    assert names(client, name_prefix="z") == []
+
+
+def test_sort_orders_break_ties_on_id(client):
+    ids = [client.post("/items/", json={"name": n}).json()["id"] for n in "bab"]
+
+    assert listed(client, "id", sort="name") == [ids[1], ids[0], ids[2]]
+    assert listed(client, "id", sort="-name") == [ids[2], ids[0], ids[1]]
+    assert client.get("/items/", params={"sort": "price"}).status_code == 422
+
+
+def test_time_ranges_are_half_open_and_accept_offsets(client):
+    item = client.post("/items/", json={"name": "x"}).json()
+    created = datetime.fromisoformat(item["created_at"])
+    if created.tzinfo is None:
+        created = created.replace(tzinfo=timezone.utc)
+    local = created.astimezone(timezone(timedelta(hours=-5)))
+
+    assert names(client, created_after=created.isoformat()) == ["x"]
+    assert names(client, created_before=created.isoformat()) == []
+    assert names(client, created_after=local.isoformat()) == ["x"]
+    later = (created + timedelta(seconds=1)).isoformat()
+    assert names(client, updated_before=later) == ["x"]
+    assert names(client, updated_after=later) == []
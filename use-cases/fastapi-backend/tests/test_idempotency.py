@@ -0,0 +1,43 @@
+"""Tests for Idempotency-Key handling."""
+
+
+def test_retry_replays_the_first_response(client):
+    headers = {"Idempotency-Key": "create-1"}
+    first = client.post("/items/", json={"name": "once"}, headers=headers)
+    retry = client.post("/items/", json={"name": "once"}, headers=headers)
+
+    assert retry.status_code == first.status_code == 201
+    assert retry.json() == first.json()
+    assert retry.headers["idempotent-replayed"] == "true"
+    assert len(client.get("/items/").json()) == 1
+
+
+def test_key_reused_with_different_body_is_rejected(client):
+    headers = {"Idempotency-Key": "create-2"}
+    client.post("/items/", json={"name": "a"}, headers=headers)
+    response = client.post("/items/", json={"name": "b"}, headers=headers)
+    assert response.status_code == 422
+
+
+def test_key_reused_with_different_query_is_rejected(client):
+    headers = {"Idempotency-Key": "create-3"}
+    first = client.post("/items/?fields=id", json={"name": "a"}, headers=headers)
+    assert first.status_code == 201
+    response = client.post("/items/?fields=name", json={"name": "a"}, headers=headers)
+    assert response.status_code == 422
+
+
+def test_query_parameter_order_does_not_matter(client):
+    headers = {"Idempotency-Key": "create-4"}
+    client.post("/items/?a=1&b=2", json={"name": "a"}, headers=headers)
+    retry = client.post("/items/?b=2&a=1", json={"name": "a"}, headers=headers)
+    assert retry.headers.get("idempotent-replayed") == "true"
+
+
+def test_keys_are_scoped_to_the_path(client):
+    item = client.post("/items/", json={"name": "a"}).json()
+    headers = {"Idempotency-Key": "shared"}
+    client.post("/items/", json={"name": "b"}, headers=headers)
+    response = client.put(f"/items/{item['id']}", json={"name": "b"}, headers=headers)
+    assert response.status_code == 200
+    assert "idempotent-replayed" not in response.headers
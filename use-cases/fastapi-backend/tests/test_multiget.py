@@ -0,0 +1,40 @@
+"""Tests for fetching many items by ID in one request."""
+
+from examples.basic_crud.schemas import MAX_BATCH_IDS
+
+
+def test_get_batch_keeps_request_order_and_reports_missing(client):
+    ids = [
+        client.post("/items/", json={"name": f"n{i}"}).json()["id"] for i in range(3)
+    ]
+    query = ",".join(map(str, [ids[2], 999, ids[0], ids[2]]))
+
+    response = client.get("/items/batch", params={"ids": query})
+    assert response.status_code == 200
+    body = response.json()
+    assert [item["id"] for item in body["items"]] == [ids[2], ids[0]]
+    assert body["missing"] == [999]
+
+
+def test_post_batch_narrows_fields(client):
+    item = client.post("/items/", json={"name": "a", "description": "d"}).json()
+    response = client.post(
+        "/items/batch", params={"fields": "name"}, json={"ids": [item["id"]]}
+    )
+    assert response.status_code == 200
+    assert response.json() == {
+        "items": [{"id": item["id"], "name": "a"}],
+        "missing": [],
+    }
+
+
+def test_batch_rejects_bad_id_lists(client):
+    too_many = ",".join(str(i) for i in range(MAX_BATCH_IDS + 1))
+    out_of_range = [str(2**63), str(-(2**63) - 1), "9" * 30]
+    for ids in ("1,x", "", ",", too_many, *out_of_range):
+        assert client.get("/items/batch", params={"ids": ids}).status_code == 400
+    assert client.post("/items/batch", json={"ids": []}).status_code == 422
+    assert client.post("/items/batch", json={"ids": [2**63]}).status_code == 422
+    # The int64 bounds themselves are valid, just missing
+    edge = client.get("/items/batch", params={"ids": f"{2**63 - 1},{-(2**63)}"})
+    assert edge.json()["missing"] == [2**63 - 1, -(2**63)]
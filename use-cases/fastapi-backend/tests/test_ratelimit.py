@@ -0,0 +1,79 @@
+"""Tests for the GCRA rate limiting middleware."""
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from examples.shared.ratelimit import MemoryRateLimitBackend, Rate, RateLimitMiddleware
+
+
+def make_client(**options) -> TestClient:
+    app = FastAPI()
+
+    @app.get("/items")
+    @app.post("/items")
+    @app.get("/health")
+    async def ok():
+        return {"ok": True}
+
+    app.add_middleware(RateLimitMiddleware, **options)
+    return TestClient(app)
+
+
+def test_rate_parse():
+    assert Rate.parse("100/minute") == Rate(100, 60.0)
+    for value in ("0/second", "10/fortnight", "ten/minute"):
+        with pytest.raises(ValueError):
+            Rate.parse(value)
+
+
+def test_burst_then_429_with_retry_after():
+    client = make_client(rules={"POST /items": "3/minute"})
+    assert [client.post("/items").status_code for _ in range(3)] == [200] * 3
+    response = client.post("/items")
+    assert response.status_code == 429
+    assert int(response.headers["retry-after"]) >= 1
+    # Other methods and paths are not covered by the rule
+    assert client.get("/items").status_code == 200
+
+
+def test_longest_prefix_wins_over_default():
+    client = make_client(rules={"/health": "100/second"}, default="1/minute")
+    assert client.get("/items").status_code == 200
+    assert client.get("/items").status_code == 429
+    assert all(client.get("/health").status_code == 200 for _ in range(5))
+
+
+def test_bucket_refills_over_time():
+    backend = MemoryRateLimitBackend()
+    rate = Rate(2, 1.0)
+    assert backend.check("k", rate, now=0.0) == 0
+    assert backend.check("k", rate, now=0.0) == 0
+    assert backend.check("k", rate, now=0.0) == pytest.approx(0.5)
+    assert backend.check("k", rate, now=0.5) == 0
+
+
+def test_fresh_bucket_allows_first_request_at_any_clock_value():
+    backend = MemoryRateLimitBackend()
+    for i in range(1000):
+        assert backend.check(f"k{i}", Rate(1, 60.0), now=123456.789 + i * 1.37) == 0
+
+
+def test_memory_backend_is_bounded_lru():
+    backend = MemoryRateLimitBackend(max_keys=100)
+    rate = Rate(1, 3600.0)
+    for i in range(1000):
+        backend.check(f"client-{i}", rate, now=0.0)
+    assert len(backend._tat) == 100
+    assert "client-999" in backend._tat
+    assert "client-0" not in backend._tat
+
+
+def test_failing_backend_falls_back_to_local_buckets():
+    class Broken:
+        async def hit(self, key, rate):
+            raise ConnectionError("redis down")
+
+    client = make_client(rules={"/items": "1/minute"}, backend=Broken())
+    assert client.get("/items").status_code == 200
+    assert client.get("/items").status_code == 429
@@ -0,0 +1,88 @@
+"""Tests for jti revocation behind the Bloom filter."""
+
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from examples.auth_middleware import revocation
+from examples.auth_middleware.models import RevokedToken
+from examples.auth_middleware.revocation import BloomFilter, RevocationList
+from examples.shared.database import get_sessionmaker
+
+
+def expiry(**delta) -> datetime:
+    return datetime.now(timezone.utc) + timedelta(**delta)
+
+
+@pytest.fixture
+def revocations(db_session):
+    return RevocationList(session_factory=get_sessionmaker(), rebuild_every=1)
+
+
+def test_bloom_filter_has_no_false_negatives():
+    bloom = BloomFilter(capacity=1000, error_rate=0.01)
+    for i in range(1000):
+        bloom.add(f"jti-{i}")
+    assert all(f"jti-{i}" in bloom for i in range(1000))
+
+
+async def test_revoked_token_is_reported(revocations):
+    revocations.revoke("abc", expiry(hours=1))
+    assert await revocations.is_revoked("abc")
+    assert not await revocations.is_revoked("other")
+
+
+async def test_rebuild_drops_expired_and_keeps_live(revocations):
+    revocations.revoke("live", expiry(hours=1))
+    revocations.revoke("expired", expiry(seconds=-1))
+    revocations.refresh()
+    assert await revocations.is_revoked("live")
+    assert "expired" not in revocations._filter
+
+
+def test_revocation_during_rebuild_survives_the_swap(revocations, monkeypatch):
+    """A revoke landing while the new filter is built must not be dropped."""
+
+    class RevokeMidRebuild(BloomFilter):
+        def __init__(self, *args):
+            super().__init__(*args)
+            # Runs after the rebuild has started, before its query
+            revocations._add("mid-rebuild")
+
+    monkeypatch.setattr(revocation, "BloomFilter", RevokeMidRebuild)
+    revocations.refresh()
+    assert "mid-rebuild" in revocations._filter
+
+
+def test_incremental_refresh_picks_up_other_processes(revocations, db_session):
+    other = RevocationList(session_factory=get_sessionmaker(), rebuild_every=100)
+    revocations.revoke("elsewhere", expiry(hours=1))
+    assert "elsewhere" not in other._filter
+    other.refresh()
+    assert "elsewhere" in other._filter
+
+
+def test_incremental_refresh_sees_rows_committed_out_of_order(revocations):
+    """A row with a smaller id and earlier revoked_at that commits late."""
+    other = RevocationList(session_factory=get_sessionmaker(), rebuild_every=100)
+    now = datetime.now(timezone.utc).replace(tzinfo=None)
+    with get_sessionmaker()() as db:
+        db.add(RevokedToken(id=10, jti="first", expires_at=now + timedelta(hours=1)))
+        db.commit()
+    other.refresh()
+    assert "first" in other._filter
+
+    with get_sessionmaker()() as db:
+        db.add(
+            RevokedToken(
+                id=5,
+                jti="late",
+                expires_at=now + timedelta(hours=1),
+                revoked_at=other._since - timedelta(seconds=5),
+            )
+        )
+        db.commit()
+    other.refresh()
+    assert "late" in other._filter
+    # Rows re-read from the window aren't counted twice
+    assert other._filter.count == 2
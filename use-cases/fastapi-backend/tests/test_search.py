@@ -0,0 +1,56 @@
+"""Tests for full-text search over items."""
+
+from examples.basic_crud import router
+from examples.basic_crud.search import SearchNotSupportedError
+
+
+def test_search_ranks_name_matches_first(client):
+    client.post("/items/", json={"name": "lamp", "description": "a steel lamp"})
+    client.post("/items/", json={"name": "steel chair", "description": "seat"})
+    client.post("/items/", json={"name": "table", "description": "oak"})
+
+    response = client.get("/items/search", params={"q": "steel"})
+    assert response.status_code == 200
+    hits = response.json()
+    assert [hit["name"] for hit in hits] == ["steel chair", "lamp"]
+    assert "<b>" in hits[0]["snippet"]
+
+
+def test_search_index_follows_updates_and_deletes(client):
+    item = client.post("/items/", json={"name": "oak table"}).json()
+    client.put(f"/items/{item['id']}", json={"name": "pine table"})
+    assert client.get("/items/search", params={"q": "oak"}).json() == []
+    assert len(client.get("/items/search", params={"q": "pine"}).json()) == 1
+
+    client.delete(f"/items/{item['id']}")
+    assert client.get("/items/search", params={"q": "pine"}).json() == []
+
+
+def test_search_quotes_operators_in_user_input(client):
+    client.post("/items/", json={"name": "a AND b"})
+    response = client.get("/items/search", params={"q": 'AND "( *'})
+    assert response.status_code == 200
+
+
+def test_blank_query_is_rejected(client):
+    assert client.get("/items/search", params={"q": "  "}).status_code == 400
+
+
+def test_unsupported_database_returns_501(client, monkeypatch):
+    def unsupported(db, query, skip, limit):
+        raise SearchNotSupportedError("mysql")
+
+    monkeypatch.setattr(router, "search_items", unsupported)
+    response = client.get("/items/search", params={"q": "lamp"})
+    assert response.status_code == 501
+    assert "mysql" in response.json()["detail"]
+
+
+def test_snippet_escapes_stored_markup(client):
+    client.post(
+        "/items/",
+        json={"name": "x", "description": "hello <img src=x onerror=alert(1)> world"},
+    )
+    (hit,) = client.get("/items/search", params={"q": "hello"}).json()
+    assert "<img" not in hit["snippet"]
+    assert hit["snippet"].startswith("<b>hello</b> &lt;img")
@@ -0,0 +1,59 @@
+"""Tests that FastJSONResponse matches FastAPI's default JSON output."""
+
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from examples.basic_crud.schemas import ItemResponse
+from examples.basic_crud.serialization import FastJSONResponse
+
+TEXT = 'Café ☕ 日本語 "quoted" \\ </script> \n\t  😀'
+
+
+def default_and_fast(payload: dict) -> tuple[bytes, bytes]:
+    """Serialize ``payload`` via a response_model route and FastJSONResponse."""
+    app = FastAPI()
+
+    @app.get("/default", response_model=ItemResponse)
+    def default():
+        return payload
+
+    @app.get("/fast", response_model=ItemResponse)
+    def fast():
+        return FastJSONResponse(payload)
+
+    client = TestClient(app)
+    return client.get("/default").content, client.get("/fast").content
+
+
+@pytest.mark.parametrize(
+    "timestamp",
+    [
+        datetime(2024, 5, 1, 12, 30, 45),
+        datetime(2024, 5, 1, 12, 30, 45, 123456),
+        datetime(2024, 5, 1, 12, 30, 45, 120000, tzinfo=timezone.utc),
+        datetime(2024, 5, 1, 12, 30, 45, tzinfo=timezone(timedelta(hours=2))),
+    ],
+    ids=["naive", "microseconds", "utc", "offset"],
+)
+def test_datetimes_and_text_match_default_json(timestamp):
+    payload = {
+        "id": 1,
+        "name": TEXT,
+        "description": None,
+        "created_at": timestamp,
+        "updated_at": timestamp,
+    }
+    default, fast = default_and_fast(payload)
+    assert fast == default
+
+
+def test_item_routes_match_default_json(client):
+    """The create route (default JSON) and read routes return the same bytes."""
+    created = client.post("/items/", json={"name": TEXT, "description": TEXT})
+    item_id = created.json()["id"]
+
+    assert client.get(f"/items/{item_id}").content == created.content
+    assert client.get("/items/").content == b"[" + created.content + b"]"
@@ -0,0 +1,54 @@
+"""Tests for the production server entry point and pool lifecycle."""
+
+from fastapi.testclient import TestClient
+
+from examples.basic_crud import server
+from examples.shared import database
+from examples.shared.settings import settings
+
+
+def test_worker_count_defaults_to_available_cpus(monkeypatch):
+    monkeypatch.setattr(settings, "server_workers", 0)
+    monkeypatch.setattr(server, "available_cpus", lambda: 6)
+    assert server.worker_count() == 6
+    monkeypatch.setattr(settings, "server_workers", 2)
+    assert server.worker_count() == 2
+
+
+def test_available_cpus_is_positive():
+    assert server.available_cpus() >= 1
+
+
+def test_main_runs_the_factory_with_server_settings(monkeypatch):
+    calls = []
+    monkeypatch.setattr(server.uvicorn, "run", lambda *a, **kw: calls.append((a, kw)))
+    monkeypatch.setattr(settings, "server_workers", 3)
+    monkeypatch.setattr(settings, "server_graceful_timeout_seconds", 7)
+    server.main()
+
+    ((args, options),) = calls
+    assert args == ("examples.basic_crud.main:create_app",)
+    assert options["factory"] is True
+    assert options["workers"] == 3
+    assert options["timeout_graceful_shutdown"] == 7
+    assert options["backlog"] == settings.server_backlog
+
+
+def test_warm_pool_opens_connections(db_session):
+    assert database.warm_pool(3) == 3
+    assert database.get_engine().pool.checkedout() == 0
+    assert database.warm_pool() == database.get_engine().pool.size()
+
+
+def test_lifespan_warms_pool_and_disposes_engine(db_session, monkeypatch):
+    from examples.basic_crud.main import create_app
+
+    events = []
+    monkeypatch.setattr(settings, "db_pool_warmup", True)
+    monkeypatch.setattr(database, "warm_pool", lambda: events.append("warm"))
+    monkeypatch.setattr(database, "dispose_engine", lambda: events.append("dispose"))
+
+    with TestClient(create_app()) as client:
+        assert events == ["warm"]
+        assert client.get("/health").status_code == 200
+    assert events == ["warm", "dispose"]
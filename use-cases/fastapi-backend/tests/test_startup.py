@@ -0,0 +1,40 @@
+"""Tests for the cheap-to-import app factory."""
+
+import json
+import os
+import subprocess
+import sys
+
+import pytest
+
+from examples.basic_crud import main
+
+DEFERRED = (
+    "sqlalchemy",
+    "examples.basic_crud.router",
+    "examples.basic_crud.models",
+    "examples.shared.database",
+)
+
+
+def test_importing_main_defers_database_and_router():
+    # Fresh interpreter: this one already imported everything via conftest
+    code = (
+        "import json, sys; import examples.basic_crud.main; "
+        f"print(json.dumps([m for m in {DEFERRED!r} if m in sys.modules]))"
+    )
+    output = subprocess.check_output(
+        [sys.executable, "-c", code],
+        cwd=os.path.dirname(os.path.dirname(__file__)),
+        text=True,
+    )
+    assert json.loads(output) == []
+
+
+def test_module_level_app_is_built_once_on_access(monkeypatch):
+    monkeypatch.delitem(vars(main), "app", raising=False)
+    app = main.app
+    assert main.app is app
+    assert "/items/" in app.openapi()["paths"]
+    with pytest.raises(AttributeError):
+        main.not_an_attribute  # noqa: B018
@@ -0,0 +1,135 @@
+"""
+Benchmark: import and first-use cost of the example agents.
+
+Each example module is imported in a fresh interpreter and timed, then its
+agent factory is called to time the first build (model, provider and
+settings set-up, now deferred until an agent is used). Also reports which
+heavy packages the bare import pulled in, so an eager import creeping back
+shows up here.
+
+Usage (from use-cases/pydantic-ai):
+    python -m benchmarks.bench_import_time --runs 5
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+from datetime import datetime, timezone
+
+AGENTS = {
+    "basic_chat_agent": ("examples.basic_chat_agent.agent", "get_chat_agent"),
+    "structured_output_agent": (
+        "examples.structured_output_agent.agent",
+        "get_structured_agent",
+    ),
+    "tool_enabled_agent": ("examples.tool_enabled_agent.agent", "get_tool_agent"),
+    "research_agent": (
+        "examples.main_agent_reference.research_agent",
+        "get_research_agent",
+    ),
+}
+
+HEAVY = ("openai", "httpx", "aiohttp", "pydantic_settings", "dotenv")
+
+PROBE = """
+import importlib, json, sys, time
+start = time.perf_counter()
+module = importlib.import_module({module!r})
+imported = time.perf_counter()
+loaded = [name for name in {heavy!r} if name in sys.modules]
+try:
+    getattr(module, {factory!r})()
+    build_ms = (time.perf_counter() - imported) * 1000
+except Exception as e:
+    build_ms = None
+    loaded.append("build failed: " + repr(e)[:120])
+print(json.dumps({{
+    "import_ms": (imported - start) * 1000,
+    "build_ms": build_ms,
+    "loaded_on_import": loaded,
+}}))
+"""
+
+
+def probe(module: str, factory: str) -> dict:
+    """Import ``module`` and call ``factory`` in a fresh interpreter."""
+    result = subprocess.run(
+        [
+            sys.executable,
+            "-c",
+            PROBE.format(module=module, factory=factory, heavy=HEAVY),
+        ],
+        capture_output=True,
+        text=True,
+        env={**os.environ, "LLM_API_KEY": os.environ.get("LLM_API_KEY", "bench")},
+    )
+    if result.returncode != 0:
+        return {"error": result.stderr.strip().splitlines()[-1]}
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def git_commit() -> str:
+    try:
+        return subprocess.check_output(
+            ["git", "rev-parse", "--short", "HEAD"],
+            text=True,
+            stderr=subprocess.DEVNULL,
+        ).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--runs", type=int, default=5, help="fresh processes each")
+    parser.add_argument(
+        "--output", help="JSON path (default results/bench-import-<commit>.json)"
+    )
+    args = parser.parse_args()
+
+    results = {}
+    for name, (module, factory) in AGENTS.items():
+        samples = [probe(module, factory) for _ in range(args.runs)]
+        errors = [s["error"] for s in samples if "error" in s]
+        if errors:
+            print(f"{name:<24} import failed: {errors[0]}")
+            results[name] = {"error": errors[0]}
+            continue
+        builds = [s["build_ms"] for s in samples if s["build_ms"] is not None]
+        results[name] = {
+            "import_ms": statistics.median(s["import_ms"] for s in samples),
+            "build_ms": statistics.median(builds) if builds else None,
+            "loaded_on_import": samples[0]["loaded_on_import"],
+        }
+        r = results[name]
+        build = f"{r['build_ms']:8.0f} ms" if r["build_ms"] is not None else "     n/a"
+        print(
+            f"{name:<24} import {r['import_ms']:6.0f} ms  first build {build}"
+            + (
+                f"  ({', '.join(r['loaded_on_import'])})"
+                if r["loaded_on_import"]
+                else ""
+            )
+        )
+
+    commit = git_commit()
+    output = args.output or os.path.join(
+        os.path.dirname(__file__), "results", f"bench-import-{commit}.json"
+    )
+    os.makedirs(os.path.dirname(output) or ".", exist_ok=True)
+    meta = {
+        "commit": commit,
+        "timestamp": datetime.now(timezone.utc).isoformat(),
+        "python": sys.version.split()[0],
+        "runs": args.runs,
+    }
+    with open(output, "w") as f:
+        json.dump({"meta": meta, "results": results}, f, indent=2)
+    print(f"\nwrote {output}")
+
+
+if __name__ == "__main__":
+    main()
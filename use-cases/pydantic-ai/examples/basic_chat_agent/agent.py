@@ -9,12 +9,13 @@ A simple conversational agent that demonstrates core PydanticAI patterns:
 """
 
 import logging
-from dataclasses import dataclass
-from typing import Optional
+from dataclasses import dataclass, replace
+from functools import lru_cache
+from typing import TYPE_CHECKING, Any, Optional
 from pydantic_ai import Agent
 
-# Import shared configuration
-from ..shared import get_llm_model
+if TYPE_CHECKING:
+    from ..shared.batch import BatchInputs, BatchStats
 
 logger = logging.getLogger(__name__)
 
@@ -47,13 +48,6 @@ Guidelines:
 """
 
 
-# Create the basic chat agent - note: no result_type, defaults to string
-chat_agent = Agent(
-    get_llm_model(), deps_type=ConversationContext, system_prompt=SYSTEM_PROMPT
-)
-
-
-@chat_agent.system_prompt
 def dynamic_context_prompt(ctx) -> str:
     """Dynamic system prompt that includes conversation context."""
     prompt_parts = []
@@ -74,6 +68,25 @@ def dynamic_context_prompt(ctx) -> str:
     return " ".join(prompt_parts) if prompt_parts else ""
 
 
+@lru_cache(maxsize=1)
+def get_chat_agent() -> Agent[ConversationContext, str]:
+    """
+    Get the chat agent, building it on first use.
+
+    Returns:
+        The shared chat agent
+    """
+    # Import shared configuration
+    from ..shared import get_llm_model
+
+    # Create the basic chat agent - note: no result_type, defaults to string
+    agent = Agent(
+        get_llm_model(), deps_type=ConversationContext, system_prompt=SYSTEM_PROMPT
+    )
+    agent.system_prompt(dynamic_context_prompt)
+    return agent
+
+
 async def chat_with_agent(
     message: str, context: Optional[ConversationContext] = None
 ) -> str:
@@ -94,7 +107,7 @@ async def chat_with_agent(
     context.conversation_count += 1
 
     # Run the agent with the message and context
-    result = await chat_agent.run(message, deps=context)
+    result = await get_chat_agent().run(message, deps=context)
 
     return result.output
 
@@ -119,11 +132,56 @@ def chat_with_agent_sync(
     context.conversation_count += 1
 
     # Run the agent synchronously
-    result = chat_agent.run_sync(message, deps=context)
+    result = get_chat_agent().run_sync(message, deps=context)
 
     return result.output
 
 
+async def chat_with_agent_batch(
+    messages: "BatchInputs",
+    output_path: str,
+    context: Optional[ConversationContext] = None,
+    **options: Any,
+) -> "BatchStats":
+    """
+    Answer many independent messages concurrently, writing replies as JSONL.
+
+    Each message is a separate one-turn conversation starting from a copy
+    of ``context``. Rerunning with the same output file resumes an
+    interrupted batch.
+
+    Args:
+        messages: User messages, as an iterable or async iterable
+        output_path: JSONL file the replies are appended to
+        context: Optional conversation context each message starts from
+        **options: Passed to run_batch (concurrency, retries, timeout, ...)
+
+    Returns:
+        Batch totals including throughput and token usage
+    """
+    from ..shared.batch import run_batch
+
+    if context is None:
+        context = ConversationContext()
+
+    return await run_batch(
+        get_chat_agent(),
+        messages,
+        output_path,
+        deps_factory=lambda: replace(
+            context, conversation_count=context.conversation_count + 1
+        ),
+        **options,
+    )
+
+
+def __getattr__(name: str):
+    # ``chat_agent`` is still importable; it is built on first access
+    if name == "chat_agent":
+        return get_chat_agent()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
 # Example usage and demonstration
 if __name__ == "__main__":
     import asyncio
@@ -3,13 +3,12 @@ Research Agent that uses Brave Search and can invoke Email Agent.
 """
 
 import logging
+from functools import lru_cache
 from typing import Dict, Any, List, Optional
 from dataclasses import dataclass
 
 from pydantic_ai import Agent, RunContext
 
-from .providers import get_llm_model
-from .email_agent import email_agent, EmailAgentDependencies
 from .tools import search_web_tool
 
 logger = logging.getLogger(__name__)
@@ -49,13 +48,6 @@ class ResearchAgentDependencies:
     session_id: Optional[str] = None
 
 
-# Initialize the research agent
-research_agent = Agent(
-    get_llm_model(), deps_type=ResearchAgentDependencies, system_prompt=SYSTEM_PROMPT
-)
-
-
-@research_agent.tool
 async def search_web(
     ctx: RunContext[ResearchAgentDependencies], query: str, max_results: int = 10
 ) -> List[Dict[str, Any]]:
@@ -85,7 +77,6 @@ async def search_web(
         return [{"error": f"Search failed: {str(e)}"}]
 
 
-@research_agent.tool
 async def create_email_draft(
     ctx: RunContext[ResearchAgentDependencies],
     recipient_email: str,
@@ -105,6 +96,9 @@ async def create_email_draft(
     Returns:
         Dictionary with draft creation results
     """
+    # The email agent is only loaded once a draft is actually requested
+    from .email_agent import email_agent, EmailAgentDependencies
+
     try:
         # Prepare the email content prompt
         if research_summary:
@@ -168,7 +162,6 @@ Please create a well-structured email that addresses the context provided.
         }
 
 
-@research_agent.tool
 async def summarize_research(
     ctx: RunContext[ResearchAgentDependencies],
     search_results: List[Dict[str, Any]],
@@ -236,6 +229,34 @@ Sources:
         }
 
 
+@lru_cache(maxsize=1)
+def get_research_agent() -> Agent[ResearchAgentDependencies, str]:
+    """
+    Get the research agent, building it on first use.
+
+    Returns:
+        The shared research agent
+    """
+    from .providers import get_llm_model
+
+    # Initialize the research agent
+    agent = Agent(
+        get_llm_model(),
+        deps_type=ResearchAgentDependencies,
+        system_prompt=SYSTEM_PROMPT,
+    )
+    for tool in (search_web, create_email_draft, summarize_research):
+        agent.tool(tool)
+    return agent
+
+
+def __getattr__(name: str):
+    # ``research_agent`` is still importable; it is built on first access
+    if name == "research_agent":
+        return get_research_agent()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
 # Convenience function to create research agent with dependencies
 def create_research_agent(
     brave_api_key: str,
@@ -255,4 +276,4 @@ def create_research_agent(
     Returns:
         Configured research agent
     """
-    return research_agent
+    return get_research_agent()
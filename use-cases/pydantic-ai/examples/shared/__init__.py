@@ -2,9 +2,47 @@
 Shared utilities for PydanticAI examples.
 
 Provides common configuration and model setup used across all examples.
+
+Names are imported from their submodules on first access, so importing
+this package (or an example that uses it) doesn't load the model SDKs,
+read ``.env`` or validate Settings until something actually needs them.
+
+``examples.shared.settings`` is the settings submodule; use
+``get_settings()`` (or ``examples.shared.settings.settings``) for the
+Settings instance.
 """
 
-from .settings import Settings, settings
-from .providers import get_llm_model
+import importlib
+
+_EXPORTS = {
+    "Settings": "settings",
+    "get_settings": "settings",
+    "get_llm_model": "providers",
+    "get_http_client": "providers",
+    "aclose_http_client": "providers",
+    "CachedModel": "response_cache",
+    "ResponseCache": "response_cache",
+    "get_response_cache": "response_cache",
+    "RoutedModel": "routing",
+    "LimitedModel": "limiter",
+    "Priority": "limiter",
+    "get_limiter": "limiter",
+    "clear_limiters": "limiter",
+    "request_priority": "limiter",
+    "BatchResult": "batch",
+    "BatchStats": "batch",
+    "iter_batch": "batch",
+    "run_batch": "batch",
+}
+
+__all__ = list(_EXPORTS)
+
 
-__all__ = ["Settings", "settings", "get_llm_model"]
+def __getattr__(name: str):
+    # Lazy re-exports (PEP 562)
+    module = _EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(f".{module}", __name__), name)
+    globals()[name] = value
+    return value
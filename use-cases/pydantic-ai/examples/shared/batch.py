@@ -0,0 +1,345 @@
+"""
+Concurrent batch runs of an agent over large prompt sets.
+
+run_batch() feeds prompts from a list, generator or async stream through an
+agent with a fixed number of runs in flight. It pulls inputs only as slots
+free up, so large or unbounded sources are never loaded into memory.
+
+- Each item gets a per-attempt timeout and is retried with exponential
+  backoff on timeouts, rate limits, server errors and invalid model output.
+  Items that still fail are recorded with their error; the batch goes on.
+- Results are appended to a JSONL file in completion order, one line per
+  item with its input index, output, attempts, latency and token usage.
+- The output file is also the checkpoint. Rerunning with the same file
+  skips every index that already succeeded, so an interrupted batch resumes
+  where it stopped and failed items get another try.
+- Runs are sent at Priority.BATCH, so with provider limits configured (see
+  limiter.py) interactive requests still overtake the batch.
+
+Example::
+
+    stats = await run_batch(
+        get_structured_agent(),
+        prompts,
+        "results.jsonl",
+        deps_factory=AnalysisDependencies,
+        concurrency=16,
+    )
+    print(stats.summary())
+"""
+
+import asyncio
+import json
+import logging
+import os
+import random
+import sys
+import time
+from collections.abc import AsyncIterable, AsyncIterator, Iterable
+from dataclasses import asdict, dataclass, field
+from typing import Any, Callable, Optional, Union
+
+from pydantic_core import to_jsonable_python
+from pydantic_ai import Agent
+from pydantic_ai.exceptions import UnexpectedModelBehavior
+from .limiter import Priority, request_priority
+from .routing import should_failover
+
+if sys.version_info < (3, 11):
+    from exceptiongroup import BaseExceptionGroup
+
+logger = logging.getLogger(__name__)
+
+BatchInputs = Union[Iterable[str], AsyncIterable[str]]
+
+
+@dataclass
+class BatchResult:
+    """Outcome of one batch item, written as one JSONL line."""
+
+    index: int
+    output: Any = None
+    error: Optional[str] = None
+    attempts: int = 0
+    latency_ms: float = 0.0
+    usage: dict = field(default_factory=dict)
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+
+@dataclass
+class BatchStats:
+    """Running totals for a batch."""
+
+    succeeded: int = 0
+    failed: int = 0
+    skipped: int = 0  # already done in an earlier run
+    retries: int = 0
+    requests: int = 0
+    input_tokens: int = 0
+    output_tokens: int = 0
+    started: float = field(default_factory=time.monotonic)
+    elapsed: float = 0.0
+
+    @property
+    def completed(self) -> int:
+        return self.succeeded + self.failed
+
+    @property
+    def items_per_second(self) -> float:
+        return self.completed / self.elapsed if self.elapsed else 0.0
+
+    @property
+    def tokens_per_second(self) -> float:
+        tokens = self.input_tokens + self.output_tokens
+        return tokens / self.elapsed if self.elapsed else 0.0
+
+    def add(self, result: BatchResult) -> None:
+        if result.ok:
+            self.succeeded += 1
+        else:
+            self.failed += 1
+        self.retries += max(result.attempts - 1, 0)
+        self.requests += result.usage.get("requests", 0)
+        self.input_tokens += result.usage.get("input_tokens", 0)
+        self.output_tokens += result.usage.get("output_tokens", 0)
+        self.elapsed = time.monotonic() - self.started
+
+    def summary(self) -> str:
+        return (
+            f"{self.succeeded} succeeded, {self.failed} failed, "
+            f"{self.skipped} skipped in {self.elapsed:.1f}s "
+            f"({self.items_per_second:.2f} items/s, "
+            f"{self.tokens_per_second:.0f} tokens/s, "
+            f"{self.input_tokens} input + {self.output_tokens} output tokens, "
+            f"{self.retries} retries)"
+        )
+
+
+def should_retry(exc: BaseException) -> bool:
+    """
+    Decide whether a failed item is worth another attempt.
+
+    Args:
+        exc: Error raised by the agent run
+
+    Returns:
+        True for timeouts, provider failures and invalid model output
+    """
+    if isinstance(exc, BaseExceptionGroup):
+        # e.g. every endpoint of a router failed: worth retrying if any
+        # of them failed for a retryable reason
+        return any(should_retry(inner) for inner in exc.exceptions)
+    return isinstance(
+        exc, (asyncio.TimeoutError, UnexpectedModelBehavior)
+    ) or should_failover(exc)
+
+
+def load_checkpoint(path: str) -> set[int]:
+    """
+    Read the indexes that already succeeded from a results file.
+
+    Args:
+        path: JSONL results file written by an earlier run
+
+    Returns:
+        Input indexes to skip; empty if the file doesn't exist
+    """
+    done: set[int] = set()
+    if not os.path.exists(path):
+        return done
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError:
+                continue  # torn last line from an interrupted run
+            if record.get("error") is None:
+                done.add(record["index"])
+    return done
+
+
+def _end_torn_line(path: str) -> None:
+    # Appending after a torn last line would merge the first new record
+    # into it, so start on a fresh line
+    if not os.path.exists(path):
+        return
+    with open(path, "rb+") as f:
+        if f.seek(0, os.SEEK_END) == 0:
+            return
+        f.seek(-1, os.SEEK_END)
+        if f.read(1) != b"\n":
+            f.write(b"\n")
+
+
+def _usage(result: Any) -> dict:
+    usage = result.usage() if callable(result.usage) else result.usage
+    return {
+        "requests": usage.requests,
+        "input_tokens": getattr(usage, "input_tokens", None)
+        or getattr(usage, "request_tokens", None)
+        or 0,
+        "output_tokens": getattr(usage, "output_tokens", None)
+        or getattr(usage, "response_tokens", None)
+        or 0,
+    }
+
+
+async def _aiter(inputs: BatchInputs) -> AsyncIterator[str]:
+    if isinstance(inputs, AsyncIterable):
+        async for item in inputs:
+            yield item
+    else:
+        for item in inputs:
+            yield item
+
+
+async def _run_item(
+    agent: Agent,
+    index: int,
+    prompt: str,
+    deps_factory: Optional[Callable[[], Any]],
+    retries: int,
+    timeout: Optional[float],
+    backoff: float,
+) -> BatchResult:
+    result = BatchResult(index=index)
+    start = time.monotonic()
+    with request_priority(Priority.BATCH):
+        while True:
+            result.attempts += 1
+            try:
+                deps = deps_factory() if deps_factory is not None else None
+                run = await asyncio.wait_for(agent.run(prompt, deps=deps), timeout)
+            except Exception as exc:
+                if result.attempts <= retries and should_retry(exc):
+                    delay = backoff * 2 ** (result.attempts - 1)
+                    await asyncio.sleep(delay * random.uniform(0.5, 1.5))
+                    continue
+                result.error = (
+                    f"{type(exc).__name__}: {exc}" if str(exc) else type(exc).__name__
+                )
+                break
+            result.output = to_jsonable_python(run.output, fallback=str)
+            result.usage = _usage(run)
+            break
+    result.latency_ms = (time.monotonic() - start) * 1000
+    return result
+
+
+async def iter_batch(
+    agent: Agent,
+    inputs: BatchInputs,
+    *,
+    deps_factory: Optional[Callable[[], Any]] = None,
+    concurrency: int = 8,
+    retries: int = 2,
+    timeout: Optional[float] = 120.0,
+    backoff: float = 1.0,
+    skip: Optional[set[int]] = None,
+) -> AsyncIterator[BatchResult]:
+    """
+    Run an agent over many prompts, yielding results as they complete.
+
+    Args:
+        agent: Agent to run for every prompt
+        inputs: Prompts, as an iterable or async iterable
+        deps_factory: Builds fresh dependencies for each attempt
+        concurrency: Maximum agent runs in flight
+        retries: Extra attempts for retryable failures
+        timeout: Seconds allowed per attempt; None for no limit
+        backoff: Base delay before a retry, doubled on each attempt
+        skip: Input indexes to leave out (already done)
+
+    Returns:
+        Async iterator of BatchResult in completion order
+    """
+    if concurrency < 1:
+        raise ValueError("concurrency must be at least 1")
+    skip = skip or set()
+    source = _aiter(inputs)
+    index = -1
+    exhausted = False
+    pending: set[asyncio.Task] = set()
+
+    async def fill() -> None:
+        nonlocal index, exhausted
+        while not exhausted and len(pending) < concurrency:
+            try:
+                prompt = await anext(source)
+            except StopAsyncIteration:
+                exhausted = True
+                return
+            index += 1
+            if index in skip:
+                continue
+            pending.add(
+                asyncio.create_task(
+                    _run_item(
+                        agent, index, prompt, deps_factory, retries, timeout, backoff
+                    )
+                )
+            )
+
+    try:
+        await fill()
+        while pending:
+            done, _ = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            pending.difference_update(done)
+            for task in done:
+                yield task.result()
+            await fill()
+    finally:
+        # Consumer stopped early or the batch was cancelled
+        for task in pending:
+            task.cancel()
+        if pending:
+            await asyncio.gather(*pending, return_exceptions=True)
+        await source.aclose()
+
+
+async def run_batch(
+    agent: Agent,
+    inputs: BatchInputs,
+    output_path: str,
+    *,
+    resume: bool = True,
+    log_every: int = 100,
+    **options: Any,
+) -> BatchStats:
+    """
+    Run an agent over many prompts and write the results as JSONL.
+
+    Args:
+        agent: Agent to run for every prompt
+        inputs: Prompts, as an iterable or async iterable
+        output_path: JSONL file results are appended to
+        resume: Skip indexes that already succeeded in ``output_path``
+        log_every: Log progress after this many completed items
+        **options: Passed to iter_batch (deps_factory, concurrency,
+            retries, timeout, backoff)
+
+    Returns:
+        Totals for this run, including throughput and token usage
+    """
+    skip = load_checkpoint(output_path) if resume else set()
+    stats = BatchStats(skipped=len(skip))
+    if skip:
+        logger.info(f"Resuming batch, {len(skip)} items already done")
+    if resume:
+        _end_torn_line(output_path)
+
+    with open(output_path, "a" if resume else "w", encoding="utf-8") as out:
+        async for result in iter_batch(agent, inputs, skip=skip, **options):
+            out.write(json.dumps(asdict(result)) + "\n")
+            out.flush()
+            stats.add(result)
+            if not result.ok:
+                logger.warning(f"Item {result.index} failed: {result.error}")
+            if log_every and stats.completed % log_every == 0:
+                logger.info(f"Batch progress: {stats.summary()}")
+
+    logger.info(f"Batch finished: {stats.summary()}")
+    return stats
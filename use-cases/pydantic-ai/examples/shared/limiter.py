@@ -0,0 +1,382 @@
+"""
+Provider-wide concurrency, request-rate and token-rate limiting.
+
+Many agents running in parallel each retry their own 429s, so throughput
+swings between bursts and rate-limit storms. ProviderLimiter coordinates
+every request to one provider instead:
+
+- at most ``max_concurrency`` requests in flight,
+- at most ``requests_per_minute`` and ``tokens_per_minute``, enforced with
+  token buckets that refill continuously,
+- waiters are admitted in priority order, first come first served within a
+  priority, so interactive requests overtake queued batch work.
+
+Token use isn't known before a request, so the limiter reserves an estimate
+(prompt size plus ``max_tokens`` or a default) and settles the difference
+once the response reports actual usage. A 429 that slips through pauses the
+whole queue for the provider's ``Retry-After`` instead of letting every
+waiter hit it.
+
+Set the priority for everything an agent run does with::
+
+    with request_priority(Priority.BATCH):
+        await agent.run(prompt)
+"""
+
+import asyncio
+import contextvars
+import heapq
+import itertools
+import time
+from collections.abc import AsyncIterator, Iterator
+from contextlib import asynccontextmanager, contextmanager
+from enum import IntEnum
+from typing import Any, Optional
+
+from pydantic_ai.exceptions import ModelHTTPError
+from pydantic_ai.messages import ModelMessage, ModelMessagesTypeAdapter, ModelResponse
+from pydantic_ai.models import Model, ModelRequestParameters, StreamedResponse
+from pydantic_ai.models.wrapper import WrapperModel
+from pydantic_ai.settings import ModelSettings
+from .settings import get_settings
+
+DEFAULT_OUTPUT_TOKENS = 512
+CHARS_PER_TOKEN = 4
+
+
+class Priority(IntEnum):
+    """Admission priority; lower values are served first."""
+
+    INTERACTIVE = 0
+    BATCH = 1
+
+
+_priority: contextvars.ContextVar[Priority] = contextvars.ContextVar(
+    "llm_request_priority", default=Priority.INTERACTIVE
+)
+
+
+@contextmanager
+def request_priority(priority: Priority) -> Iterator[None]:
+    """
+    Set the limiter priority for model requests made inside the block.
+
+    Args:
+        priority: Priority for requests made in this context
+    """
+    token = _priority.set(priority)
+    try:
+        yield
+    finally:
+        _priority.reset(token)
+
+
+class TokenBucket:
+    """
+    Continuously refilling bucket allowing ``per_minute`` units per minute.
+
+    The level may go negative when a settled cost exceeds its reservation;
+    later requests then wait until it has refilled.
+    """
+
+    def __init__(self, per_minute: int):
+        self.capacity = float(per_minute)
+        self.rate = per_minute / 60.0
+        self.level = self.capacity
+        self.updated = time.monotonic()
+
+    def _refill(self, now: float) -> None:
+        self.level = min(self.capacity, self.level + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def wait_time(self, cost: float, now: float) -> float:
+        """Seconds until ``cost`` units are available (0 if they are now)."""
+        self._refill(now)
+        cost = min(cost, self.capacity)  # an oversized request must still run
+        return max(0.0, (cost - self.level) / self.rate)
+
+    def take(self, cost: float) -> None:
+        self.level -= min(cost, self.capacity)
+
+    def adjust(self, delta: float) -> None:
+        """Return (negative) or charge (positive) units after the fact."""
+        self.level = min(self.capacity, self.level - delta)
+
+
+class ProviderLimiter:
+    """
+    Admission queue enforcing one provider's concurrency and rate limits.
+
+    Args:
+        max_concurrency: Requests allowed in flight; None for no limit
+        requests_per_minute: Request rate limit; None for no limit
+        tokens_per_minute: Token rate limit; None for no limit
+        default_backoff: Pause after a 429 without a Retry-After header
+    """
+
+    def __init__(
+        self,
+        max_concurrency: Optional[int] = None,
+        requests_per_minute: Optional[int] = None,
+        tokens_per_minute: Optional[int] = None,
+        default_backoff: float = 1.0,
+    ):
+        self.max_concurrency = max_concurrency
+        self.limits = (max_concurrency, requests_per_minute, tokens_per_minute)
+        self.requests = (
+            TokenBucket(requests_per_minute) if requests_per_minute else None
+        )
+        self.tokens = TokenBucket(tokens_per_minute) if tokens_per_minute else None
+        self.default_backoff = default_backoff
+        self.in_flight = 0
+        self.paused_until = 0.0
+        self._waiters: list[tuple[int, int, float, asyncio.Future]] = []
+        self._seq = itertools.count()
+        self._wakeup: Optional[asyncio.TimerHandle] = None
+        self.admitted = 0
+        self.rate_limited = 0
+
+    @property
+    def queued(self) -> int:
+        """Requests waiting for admission."""
+        return sum(not future.done() for *_, future in self._waiters)
+
+    async def acquire(self, tokens: float, priority: Optional[Priority] = None):
+        """
+        Wait for admission of a request expected to use ``tokens`` tokens.
+
+        Args:
+            tokens: Token estimate reserved against the token rate
+            priority: Admission priority; defaults to the context's priority
+        """
+        if priority is None:
+            priority = _priority.get()
+        future = asyncio.get_running_loop().create_future()
+        heapq.heappush(self._waiters, (priority, next(self._seq), tokens, future))
+        self._dispatch()
+        try:
+            await future
+        except asyncio.CancelledError:
+            if future.done() and not future.cancelled():
+                # Admitted just as the waiter was cancelled
+                self.release(tokens, 0)
+            raise
+
+    def release(self, reserved: float, used: Optional[float] = None) -> None:
+        """
+        Free a request's slot and settle its token reservation.
+
+        Args:
+            reserved: Tokens reserved at admission
+            used: Tokens actually used, if known
+        """
+        self.in_flight -= 1
+        if self.tokens is not None and used is not None:
+            self.tokens.adjust(used - reserved)
+        self._dispatch()
+
+    def backoff(self, seconds: Optional[float] = None) -> None:
+        """
+        Stop admitting requests for a while after the provider returned 429.
+
+        Args:
+            seconds: Pause length; defaults to ``default_backoff``
+        """
+        self.rate_limited += 1
+        pause = seconds if seconds is not None else self.default_backoff
+        self.paused_until = max(self.paused_until, time.monotonic() + pause)
+        self._schedule(pause)
+
+    def _dispatch(self) -> None:
+        while self._waiters:
+            priority, seq, tokens, future = self._waiters[0]
+            if future.done():  # cancelled while waiting
+                heapq.heappop(self._waiters)
+                continue
+            if (
+                self.max_concurrency is not None
+                and self.in_flight >= self.max_concurrency
+            ):
+                return  # woken again by release()
+            now = time.monotonic()
+            wait = max(
+                self.paused_until - now,
+                self.requests.wait_time(1, now) if self.requests else 0.0,
+                self.tokens.wait_time(tokens, now) if self.tokens else 0.0,
+            )
+            if wait > 0:
+                # The head waits; nobody overtakes it, which keeps the
+                # order fair and stops small requests starving big ones
+                self._schedule(wait)
+                return
+            heapq.heappop(self._waiters)
+            if self.requests:
+                self.requests.take(1)
+            if self.tokens:
+                self.tokens.take(tokens)
+            self.in_flight += 1
+            self.admitted += 1
+            future.set_result(None)
+
+    def _schedule(self, delay: float) -> None:
+        if self._wakeup is not None:
+            self._wakeup.cancel()
+        self._wakeup = asyncio.get_running_loop().call_later(delay, self._dispatch)
+
+    def info(self) -> dict:
+        """
+        Get current queue state and counters.
+
+        Returns:
+            Dictionary with in-flight, queued and admitted counts
+        """
+        return {
+            "in_flight": self.in_flight,
+            "queued": self.queued,
+            "admitted": self.admitted,
+            "rate_limited": self.rate_limited,
+            "tokens_available": self.tokens.level if self.tokens else None,
+        }
+
+
+def estimate_tokens(
+    messages: list[ModelMessage], model_settings: Optional[ModelSettings]
+) -> int:
+    """
+    Estimate the tokens a request will use, prompt plus completion.
+
+    Args:
+        messages: Message history sent to the model
+        model_settings: Settings, whose ``max_tokens`` caps the completion
+
+    Returns:
+        Rough token estimate
+    """
+    prompt = len(ModelMessagesTypeAdapter.dump_json(messages)) // CHARS_PER_TOKEN
+    completion = (model_settings or {}).get("max_tokens") or DEFAULT_OUTPUT_TOKENS
+    return prompt + completion
+
+
+def _retry_after(exc: ModelHTTPError) -> Optional[float]:
+    # Newer pydantic-ai parses Retry-After itself (seconds or HTTP date)
+    retry_after = getattr(exc, "retry_after", None)
+    if retry_after is not None:
+        return float(retry_after)
+    headers = getattr(exc, "headers", None) or {}
+    value = next((v for k, v in headers.items() if k.lower() == "retry-after"), None)
+    try:
+        return max(float(value), 0.0) if value is not None else None
+    except ValueError:
+        return None
+
+
+class LimitedModel(WrapperModel):
+    """
+    Model wrapper that admits requests through a ProviderLimiter.
+
+    Args:
+        wrapped: Model whose requests are limited
+        limiter: Limiter shared by every model using the same provider
+    """
+
+    def __init__(self, wrapped: Model, limiter: ProviderLimiter):
+        super().__init__(wrapped)
+        self.limiter = limiter
+
+    async def request(
+        self,
+        messages: list[ModelMessage],
+        model_settings: Optional[ModelSettings],
+        model_request_parameters: ModelRequestParameters,
+    ) -> ModelResponse:
+        reserved = estimate_tokens(messages, model_settings)
+        await self.limiter.acquire(reserved)
+        used = None
+        try:
+            response = await self.wrapped.request(
+                messages, model_settings, model_request_parameters
+            )
+            used = response.usage.total_tokens or None
+            return response
+        except ModelHTTPError as exc:
+            if exc.status_code == 429:
+                self.limiter.backoff(_retry_after(exc))
+            raise
+        finally:
+            self.limiter.release(reserved, used)
+
+    @asynccontextmanager
+    async def request_stream(
+        self,
+        messages: list[ModelMessage],
+        model_settings: Optional[ModelSettings],
+        model_request_parameters: ModelRequestParameters,
+        run_context: Any = None,
+    ) -> AsyncIterator[StreamedResponse]:
+        reserved = estimate_tokens(messages, model_settings)
+        await self.limiter.acquire(reserved)
+        used = None
+        try:
+            async with self.wrapped.request_stream(
+                messages, model_settings, model_request_parameters, run_context
+            ) as stream:
+                yield stream
+                used = stream.get().usage.total_tokens or None
+        except ModelHTTPError as exc:
+            if exc.status_code == 429:
+                self.limiter.backoff(_retry_after(exc))
+            raise
+        finally:
+            self.limiter.release(reserved, used)
+
+
+_limiters: dict[Optional[str], ProviderLimiter] = {}
+
+
+def get_limiter(
+    base_url: Optional[str],
+    max_concurrency: Optional[int] = None,
+    requests_per_minute: Optional[int] = None,
+    tokens_per_minute: Optional[int] = None,
+) -> ProviderLimiter:
+    """
+    Get the process-wide limiter for a provider.
+
+    There is one limiter per ``base_url``, since the provider enforces its
+    limits per endpoint and key however many models call it.
+
+    Args:
+        base_url: Provider endpoint the limits apply to
+        max_concurrency: Overrides settings.llm_max_concurrent_requests
+        requests_per_minute: Overrides settings.llm_requests_per_minute
+        tokens_per_minute: Overrides settings.llm_tokens_per_minute
+
+    Returns:
+        Limiter shared by all models calling ``base_url``
+
+    Raises:
+        ValueError: If ``base_url`` already has a limiter with other limits
+    """
+    settings = get_settings()
+    limits = (
+        max_concurrency or settings.llm_max_concurrent_requests,
+        requests_per_minute or settings.llm_requests_per_minute,
+        tokens_per_minute or settings.llm_tokens_per_minute,
+    )
+    limiter = _limiters.get(base_url)
+    if limiter is None:
+        limiter = _limiters[base_url] = ProviderLimiter(
+            *limits, default_backoff=settings.llm_rate_limit_backoff_seconds
+        )
+    elif limiter.limits != limits:
+        raise ValueError(
+            f"Conflicting limits for {base_url}: {limiter.limits} already in use,"
+            f" got {limits} (max_concurrency, requests_per_minute,"
+            " tokens_per_minute)"
+        )
+    return limiter
+
+
+def clear_limiters() -> None:
+    """Forget all limiters; the next get_limiter() call creates new ones."""
+    _limiters.clear()
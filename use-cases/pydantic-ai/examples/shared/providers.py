@@ -2,32 +2,168 @@
 Flexible provider configuration for LLM models.
 
 Provides get_llm_model() for consistent model setup across examples.
+
+Models and providers are cached per ``(model, base_url, api_key)`` and all
+providers share one pooled, keep-alive HTTP client (HTTP/2 when the ``h2``
+package is installed), so agents reuse connections and TLS sessions instead
+of opening new ones for every call. With ``LLM_ENDPOINTS`` set, requests are
+routed across several endpoints (see routing.py), and with
+``LLM_CACHE_ENABLED`` the model is wrapped in a persistent response cache
+(see response_cache.py). Requests to each provider share one admission
+queue enforcing the ``LLM_MAX_CONCURRENT_REQUESTS``,
+``LLM_REQUESTS_PER_MINUTE`` and ``LLM_TOKENS_PER_MINUTE`` limits (see
+limiter.py).
 """
 
+import importlib.util
+from functools import lru_cache
 from typing import Optional
+
+import httpx
 from pydantic_ai.providers.openai import OpenAIProvider
 from pydantic_ai.models.openai import OpenAIModel
-from .settings import settings
+from pydantic_ai.models import Model
+from .limiter import LimitedModel, clear_limiters, get_limiter
+from .response_cache import CachedModel, get_response_cache
+from .routing import RoutedModel
+from .settings import LLMEndpoint, get_settings
+
+HTTP2_AVAILABLE = importlib.util.find_spec("h2") is not None
+
+
+@lru_cache(maxsize=1)
+def get_http_client() -> httpx.AsyncClient:
+    """
+    Get the process-wide HTTP client shared by all providers.
+
+    Pooled connections belong to the event loop that opened them, so use
+    one loop per process (or call ``aclose_http_client()`` before switching
+    to a new one).
+
+    Returns:
+        Shared async HTTP client configured from settings
+    """
+    settings = get_settings()
+    return httpx.AsyncClient(
+        http2=settings.llm_http2 and HTTP2_AVAILABLE,
+        limits=httpx.Limits(
+            max_connections=settings.llm_max_connections,
+            max_keepalive_connections=settings.llm_max_keepalive_connections,
+            keepalive_expiry=settings.llm_keepalive_expiry_seconds,
+        ),
+        timeout=httpx.Timeout(
+            settings.llm_timeout_seconds,
+            connect=settings.llm_connect_timeout_seconds,
+        ),
+    )
+
+
+@lru_cache(maxsize=32)
+def get_provider(base_url: Optional[str], api_key: str) -> OpenAIProvider:
+    """
+    Get the cached provider for an endpoint and key.
 
+    Args:
+        base_url: OpenAI-compatible API base URL
+        api_key: API key for the endpoint
 
-def get_llm_model(model_choice: Optional[str] = None) -> OpenAIModel:
+    Returns:
+        Provider using the shared HTTP client
+    """
+    return OpenAIProvider(
+        base_url=base_url, api_key=api_key, http_client=get_http_client()
+    )
+
+
+def _endpoint_model(
+    model_name: str,
+    base_url: Optional[str],
+    api_key: str,
+    endpoint: Optional[LLMEndpoint] = None,
+) -> Model:
+    model = OpenAIModel(model_name, provider=get_provider(base_url, api_key))
+    # Endpoints sharing a base_url share its limiter, so their limits must agree
+    limits = {}
+    if endpoint is not None:
+        limits = {
+            "max_concurrency": endpoint.max_concurrent_requests,
+            "requests_per_minute": endpoint.requests_per_minute,
+            "tokens_per_minute": endpoint.tokens_per_minute,
+        }
+    limiter = get_limiter(base_url, **limits)
+    if limiter.max_concurrency or limiter.requests or limiter.tokens:
+        return LimitedModel(model, limiter)
+    return model
+
+
+@lru_cache(maxsize=64)
+def _cached_model(
+    model_name: str, base_url: Optional[str], api_key: str, response_cache: bool
+) -> Model:
+    if response_cache:
+        # Wrap the same instance uncached callers get
+        return CachedModel(
+            _cached_model(model_name, base_url, api_key, False), get_response_cache()
+        )
+    settings = get_settings()
+    if settings.llm_endpoints:
+        return RoutedModel(
+            [
+                _endpoint_model(
+                    endpoint.model or model_name,
+                    endpoint.base_url,
+                    endpoint.api_key or api_key,
+                    endpoint,
+                )
+                for endpoint in settings.llm_endpoints
+            ],
+            hedge_delay=settings.llm_hedge_delay_seconds,
+            alpha=settings.llm_router_ewma_alpha,
+            cooldown=settings.llm_router_cooldown_seconds,
+        )
+    return _endpoint_model(model_name, base_url, api_key)
+
+
+def get_llm_model(
+    model_choice: Optional[str] = None, response_cache: Optional[bool] = None
+) -> Model:
     """
     Get LLM model configuration based on environment variables.
 
+    Repeated calls with the same configuration return the same instance.
+
     Args:
         model_choice: Optional override for model choice
+        response_cache: Serve repeated requests from the response cache;
+            defaults to settings.llm_cache_enabled
 
     Returns:
-        Configured OpenAI-compatible model
+        Configured OpenAI-compatible model (a RoutedModel when several
+        endpoints are configured), wrapped in CachedModel if enabled
     """
+    settings = get_settings()
     llm_choice = model_choice or settings.llm_model
-    base_url = settings.llm_base_url
-    api_key = settings.llm_api_key
+    if response_cache is None:
+        response_cache = settings.llm_cache_enabled
+    return _cached_model(
+        llm_choice, settings.llm_base_url, settings.llm_api_key, response_cache
+    )
 
-    # Create provider based on configuration
-    provider = OpenAIProvider(base_url=base_url, api_key=api_key)
 
-    return OpenAIModel(llm_choice, provider=provider)
+async def aclose_http_client() -> None:
+    """
+    Close the shared HTTP client and drop cached providers, models and
+    limiters.
+
+    Call on application shutdown; the next get_llm_model() starts afresh.
+    """
+    if get_http_client.cache_info().currsize:
+        client = get_http_client()
+        _cached_model.cache_clear()
+        get_provider.cache_clear()
+        get_http_client.cache_clear()
+        clear_limiters()
+        await client.aclose()
 
 
 def get_model_info() -> dict:
@@ -37,8 +173,12 @@ def get_model_info() -> dict:
     Returns:
         Dictionary with model configuration info
     """
+    settings = get_settings()
     return {
         "llm_provider": settings.llm_provider,
         "llm_model": settings.llm_model,
         "llm_base_url": settings.llm_base_url,
+        "llm_endpoints": [endpoint.base_url for endpoint in settings.llm_endpoints],
+        "http2": settings.llm_http2 and HTTP2_AVAILABLE,
+        "response_cache": settings.llm_cache_enabled,
     }
@@ -0,0 +1,429 @@
+"""
+Persistent response cache for LLM requests.
+
+CachedModel wraps any model and stores its responses in a local SQLite file,
+keyed on a hash of everything that determines the answer: the model name,
+the message history, tool definitions and model settings. Identical requests
+are then served from disk without provider latency or cost.
+
+- Entries expire after a TTL and the store is kept under a size budget by
+  evicting the least recently used entries.
+- Streamed requests are cached too once read to the end; a hit replays the
+  stored response as a stream, so run_stream() and event handlers work
+  unchanged. A stream the consumer stops early is neither cached nor drained.
+- Cache hits report zero token usage, since nothing was spent.
+
+Only enable this where repeating an earlier answer is acceptable (tests,
+evaluations, deterministic prompts); sampling settings are part of the key
+but a cached answer is never re-sampled.
+"""
+
+import asyncio
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+from dataclasses import dataclass, replace
+from datetime import datetime
+from functools import lru_cache
+from typing import Any, Optional
+
+from pydantic_core import to_jsonable_python
+from pydantic_ai.messages import (
+    ModelMessage,
+    ModelMessagesTypeAdapter,
+    ModelResponse,
+    ModelResponseStreamEvent,
+)
+from pydantic_ai.models import Model, ModelRequestParameters, StreamedResponse
+from pydantic_ai.models.wrapper import WrapperModel
+from pydantic_ai.settings import ModelSettings
+from .settings import get_settings
+
+# Fields that vary between otherwise identical requests and don't affect
+# what the model answers. They are only dropped at these two levels of the
+# message history, never inside tool args, schemas or model settings, where
+# the same names are ordinary data.
+MESSAGE_VOLATILE_KEYS = frozenset(
+    {
+        "timestamp",
+        "run_id",
+        "conversation_id",
+        "provider_response_id",
+        "provider_details",
+        "usage",
+        "metadata",
+    }
+)
+PART_VOLATILE_KEYS = frozenset({"timestamp", "provider_details", "metadata"})
+
+
+def _strip_volatile(messages: list[dict]) -> list[dict]:
+    stripped = []
+    for message in messages:
+        message = {k: v for k, v in message.items() if k not in MESSAGE_VOLATILE_KEYS}
+        if isinstance(message.get("parts"), list):
+            message["parts"] = [
+                {k: v for k, v in part.items() if k not in PART_VOLATILE_KEYS}
+                if isinstance(part, dict)
+                else part
+                for part in message["parts"]
+            ]
+        stripped.append(message)
+    return stripped
+
+
+def request_fingerprint(
+    model_name: str,
+    messages: list[ModelMessage],
+    model_settings: Optional[ModelSettings],
+    model_request_parameters: ModelRequestParameters,
+) -> str:
+    """
+    Hash everything that determines a model's response.
+
+    Args:
+        model_name: Name of the model being called
+        messages: Message history sent to the model
+        model_settings: Sampling and request settings
+        model_request_parameters: Tool and output definitions
+
+    Returns:
+        Hex SHA-256 of the canonical JSON form of the request
+    """
+    payload = to_jsonable_python(
+        {
+            "model": model_name,
+            "messages": messages,
+            "settings": model_settings or {},
+            "parameters": model_request_parameters,
+        },
+        fallback=repr,
+    )
+    payload["messages"] = _strip_volatile(payload["messages"])
+    canonical = json.dumps(payload, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(canonical.encode()).hexdigest()
+
+
+@dataclass
+class CacheStats:
+    """Counters for a ResponseCache since it was opened."""
+
+    hits: int = 0
+    misses: int = 0
+    stores: int = 0
+    evictions: int = 0
+    expirations: int = 0
+
+    @property
+    def hit_rate(self) -> float:
+        """Fraction of lookups served from the cache."""
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+
+class ResponseCache:
+    """
+    SQLite-backed store of model responses with TTL and size-bounded LRU
+    eviction.
+
+    Blocking SQLite calls run in a worker thread, so lookups don't stall the
+    event loop.
+
+    Args:
+        path: SQLite database file (``":memory:"`` for a process-local cache)
+        ttl_seconds: Lifetime of an entry; ``None`` keeps entries until evicted
+        max_bytes: Size budget for stored responses
+    """
+
+    def __init__(
+        self,
+        path: str,
+        ttl_seconds: Optional[float] = 86400.0,
+        max_bytes: int = 256 * 1024 * 1024,
+    ):
+        self.path = path
+        self.ttl_seconds = ttl_seconds
+        self.max_bytes = max_bytes
+        self.stats = CacheStats()
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS responses (
+                key TEXT PRIMARY KEY,
+                model TEXT NOT NULL,
+                response BLOB NOT NULL,
+                size INTEGER NOT NULL,
+                created_at REAL NOT NULL,
+                accessed_at REAL NOT NULL
+            )
+            """
+        )
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS responses_accessed_at"
+            " ON responses (accessed_at)"
+        )
+        self._conn.commit()
+        (self._total_bytes,) = self._conn.execute(
+            "SELECT COALESCE(SUM(size), 0) FROM responses"
+        ).fetchone()
+
+    async def get(self, key: str) -> Optional[ModelResponse]:
+        """
+        Look up a response, counting a hit or miss.
+
+        Args:
+            key: Request fingerprint
+
+        Returns:
+            The stored response, or None if absent or expired
+        """
+        data = await asyncio.to_thread(self._get, key)
+        if data is None:
+            self.stats.misses += 1
+            return None
+        self.stats.hits += 1
+        return ModelMessagesTypeAdapter.validate_json(data)[0]
+
+    async def set(self, key: str, model_name: str, response: ModelResponse) -> None:
+        """
+        Store a response, evicting old entries if over the size budget.
+
+        Args:
+            key: Request fingerprint
+            model_name: Model that produced the response
+            response: Response to store
+        """
+        data = ModelMessagesTypeAdapter.dump_json([response])
+        await asyncio.to_thread(self._set, key, model_name, data)
+        self.stats.stores += 1
+
+    def _get(self, key: str) -> Optional[bytes]:
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT response, size, created_at FROM responses WHERE key = ?",
+                (key,),
+            ).fetchone()
+            if row is None:
+                return None
+            data, size, created_at = row
+            if self.ttl_seconds is not None and now - created_at > self.ttl_seconds:
+                self._conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+                self._conn.commit()
+                self._total_bytes -= size
+                self.stats.expirations += 1
+                return None
+            self._conn.execute(
+                "UPDATE responses SET accessed_at = ? WHERE key = ?", (now, key)
+            )
+            self._conn.commit()
+            return data
+
+    def _set(self, key: str, model_name: str, data: bytes) -> None:
+        now = time.time()
+        with self._lock:
+            old = self._conn.execute(
+                "SELECT size FROM responses WHERE key = ?", (key,)
+            ).fetchone()
+            self._conn.execute(
+                "INSERT OR REPLACE INTO responses"
+                " (key, model, response, size, created_at, accessed_at)"
+                " VALUES (?, ?, ?, ?, ?, ?)",
+                (key, model_name, data, len(data), now, now),
+            )
+            self._total_bytes += len(data) - (old[0] if old else 0)
+            if self._total_bytes > self.max_bytes:
+                self._evict(now)
+            self._conn.commit()
+
+    def _evict(self, now: float) -> None:
+        # Drop expired entries first, then least recently used ones down to
+        # 90% of the budget so the next few stores don't evict again
+        if self.ttl_seconds is not None:
+            cursor = self._conn.execute(
+                "DELETE FROM responses WHERE created_at < ? RETURNING size",
+                (now - self.ttl_seconds,),
+            )
+            sizes = [size for (size,) in cursor]
+            self._total_bytes -= sum(sizes)
+            self.stats.expirations += len(sizes)
+        target = int(self.max_bytes * 0.9)
+        rows = self._conn.execute(
+            "SELECT key, size FROM responses ORDER BY accessed_at"
+        )
+        victims = []
+        for key, size in rows:
+            if self._total_bytes <= target:
+                break
+            victims.append((key,))
+            self._total_bytes -= size
+        rows.close()
+        self._conn.executemany("DELETE FROM responses WHERE key = ?", victims)
+        self.stats.evictions += len(victims)
+
+    def info(self) -> dict:
+        """
+        Get hit/miss statistics and current store size.
+
+        Returns:
+            Dictionary with counters, hit rate, entry count and bytes stored
+        """
+        with self._lock:
+            (entries,) = self._conn.execute("SELECT COUNT(*) FROM responses").fetchone()
+        return {
+            "hits": self.stats.hits,
+            "misses": self.stats.misses,
+            "hit_rate": self.stats.hit_rate,
+            "stores": self.stats.stores,
+            "evictions": self.stats.evictions,
+            "expirations": self.stats.expirations,
+            "entries": entries,
+            "bytes": self._total_bytes,
+        }
+
+    def clear(self) -> None:
+        """Delete every stored response."""
+        with self._lock:
+            self._conn.execute("DELETE FROM responses")
+            self._conn.commit()
+            self._total_bytes = 0
+
+    def close(self) -> None:
+        """Close the underlying database connection."""
+        with self._lock:
+            self._conn.close()
+
+
+@dataclass
+class CachedStreamedResponse(StreamedResponse):
+    """Replays a cached ModelResponse as a stream, one event per part."""
+
+    response: Optional[ModelResponse] = None
+
+    async def _get_event_iterator(self) -> AsyncIterator[ModelResponseStreamEvent]:
+        for index, part in enumerate(self.response.parts):
+            yield self._parts_manager.handle_part(vendor_part_id=index, part=part)
+
+    @property
+    def model_name(self) -> str:
+        return self.response.model_name or ""
+
+    @property
+    def provider_name(self) -> Optional[str]:
+        return self.response.provider_name
+
+    @property
+    def provider_url(self) -> Optional[str]:
+        return self.response.provider_url
+
+    @property
+    def timestamp(self) -> datetime:
+        return self.response.timestamp
+
+
+class _StreamProgress:
+    """Records whether a stream's events have been read to the end."""
+
+    def __init__(self, stream: StreamedResponse):
+        self.complete = False
+        events = stream._get_event_iterator
+
+        async def tracked() -> AsyncIterator[ModelResponseStreamEvent]:
+            async for event in events():
+                yield event
+            self.complete = True
+
+        stream._get_event_iterator = tracked
+
+
+def _as_cache_hit(response: ModelResponse) -> ModelResponse:
+    # Nothing was spent serving a hit
+    return replace(response, usage=type(response.usage)())
+
+
+class CachedModel(WrapperModel):
+    """
+    Model wrapper that serves repeated requests from a ResponseCache.
+
+    Args:
+        wrapped: Model that answers cache misses
+        cache: Store for responses
+    """
+
+    def __init__(self, wrapped: Model, cache: ResponseCache):
+        super().__init__(wrapped)
+        self.cache = cache
+
+    def _key(
+        self,
+        messages: list[ModelMessage],
+        model_settings: Optional[ModelSettings],
+        model_request_parameters: ModelRequestParameters,
+    ) -> str:
+        return request_fingerprint(
+            self.wrapped.model_name, messages, model_settings, model_request_parameters
+        )
+
+    async def request(
+        self,
+        messages: list[ModelMessage],
+        model_settings: Optional[ModelSettings],
+        model_request_parameters: ModelRequestParameters,
+    ) -> ModelResponse:
+        key = self._key(messages, model_settings, model_request_parameters)
+        cached = await self.cache.get(key)
+        if cached is not None:
+            return _as_cache_hit(cached)
+        response = await self.wrapped.request(
+            messages, model_settings, model_request_parameters
+        )
+        await self.cache.set(key, self.wrapped.model_name, response)
+        return response
+
+    @asynccontextmanager
+    async def request_stream(
+        self,
+        messages: list[ModelMessage],
+        model_settings: Optional[ModelSettings],
+        model_request_parameters: ModelRequestParameters,
+        run_context: Any = None,
+    ) -> AsyncIterator[StreamedResponse]:
+        key = self._key(messages, model_settings, model_request_parameters)
+        cached = await self.cache.get(key)
+        if cached is not None:
+            yield CachedStreamedResponse(
+                model_request_parameters=model_request_parameters,
+                response=_as_cache_hit(cached),
+            )
+            return
+        async with self.wrapped.request_stream(
+            messages, model_settings, model_request_parameters, run_context
+        ) as stream:
+            progress = _StreamProgress(stream)
+            yield stream
+            # Reading the rest of an abandoned stream would keep paying for
+            # tokens nobody wants, so only complete responses are stored
+            if progress.complete:
+                await self.cache.set(key, self.wrapped.model_name, stream.get())
+
+
+@lru_cache(maxsize=1)
+def get_response_cache() -> ResponseCache:
+    """
+    Get the process-wide response cache configured from settings.
+
+    Returns:
+        Shared ResponseCache instance
+    """
+    settings = get_settings()
+    return ResponseCache(
+        settings.llm_cache_path,
+        ttl_seconds=settings.llm_cache_ttl_seconds,
+        max_bytes=settings.llm_cache_max_bytes,
+    )
@@ -0,0 +1,291 @@
+"""
+Latency-aware routing across several OpenAI-compatible endpoints.
+
+RoutedModel sends each request to the endpoint with the best recent
+latency and error rate, both tracked as exponentially weighted moving
+averages (EWMA). It fails over to the next endpoint on rate limits (429),
+server errors (5xx) and connection failures, and can optionally hedge: if
+the first endpoint hasn't answered within a delay, the request is also sent
+to the next best endpoint and whichever answers first wins.
+
+Endpoints that just returned 429/5xx are ranked last for a cooldown period.
+Endpoints with no samples yet are tried first, so new or recovered
+endpoints get measured.
+
+Streamed requests fail over only while the stream is being opened; once
+events have been delivered they can't be replayed elsewhere, so streams
+are never hedged.
+"""
+
+import asyncio
+import time
+from collections.abc import AsyncIterator
+from contextlib import AsyncExitStack, asynccontextmanager
+from dataclasses import dataclass
+from typing import Any, Optional
+
+import httpx
+from pydantic_ai.exceptions import (
+    FallbackExceptionGroup,
+    ModelAPIError,
+    ModelHTTPError,
+)
+from pydantic_ai.messages import ModelMessage, ModelResponse
+from pydantic_ai.models import Model, ModelRequestParameters, StreamedResponse
+from pydantic_ai.settings import ModelSettings
+
+
+def should_failover(exc: BaseException) -> bool:
+    """
+    Decide whether an error should be retried on another endpoint.
+
+    Args:
+        exc: Error raised by an endpoint
+
+    Returns:
+        True for rate limits, server errors, timeouts and connection failures
+    """
+    if isinstance(exc, ModelHTTPError):
+        return exc.status_code in (408, 429) or exc.status_code >= 500
+    return isinstance(exc, (ModelAPIError, httpx.TransportError))
+
+
+@dataclass
+class EndpointStats:
+    """Recent latency and error rate of one endpoint."""
+
+    latency: Optional[float] = None  # EWMA seconds, None until measured
+    error_rate: float = 0.0  # EWMA of failures, 0..1
+    in_flight: int = 0
+    cooldown_until: float = 0.0
+    requests: int = 0
+    failures: int = 0
+
+    def score(self, now: float) -> float:
+        """Expected cost of sending a request here; lower is better."""
+        if self.latency is None:
+            # Unmeasured endpoints go first, unless they have only failed
+            score = 1e3 if self.failures else 0.0
+        else:
+            score = self.latency / max(1.0 - self.error_rate, 0.01)
+        if now < self.cooldown_until:
+            score += 1e6
+        return score
+
+
+def _release(stats: EndpointStats) -> None:
+    stats.in_flight -= 1
+
+
+class RoutedModel(Model):
+    """
+    Model that routes each request to the best of several endpoint models.
+
+    Args:
+        models: One model per endpoint, in configured order
+        hedge_delay: Seconds to wait before also sending a request to the
+            next best endpoint; None disables hedging
+        max_hedges: Extra concurrent requests allowed per call when hedging
+        alpha: EWMA weight given to each new sample
+        cooldown: Seconds an endpoint is ranked last after a 429/5xx
+    """
+
+    def __init__(
+        self,
+        models: list[Model],
+        hedge_delay: Optional[float] = None,
+        max_hedges: int = 1,
+        alpha: float = 0.3,
+        cooldown: float = 30.0,
+    ):
+        if not models:
+            raise ValueError("RoutedModel needs at least one model")
+        super().__init__()
+        self.models = models
+        self.hedge_delay = hedge_delay
+        self.max_hedges = max_hedges
+        self.alpha = alpha
+        self.cooldown = cooldown
+        self.stats = [EndpointStats() for _ in models]
+
+    @property
+    def model_name(self) -> str:
+        return f"routed:{','.join(model.model_name for model in self.models)}"
+
+    @property
+    def system(self) -> str:
+        return self.models[0].system
+
+    @property
+    def profile(self):
+        return self.models[0].profile
+
+    def ranked(self) -> list[int]:
+        """Endpoint indexes from best to worst current score."""
+        now = time.monotonic()
+        return sorted(
+            range(len(self.models)),
+            key=lambda i: (self.stats[i].score(now), self.stats[i].in_flight),
+        )
+
+    def _record(self, index: int, elapsed: float, exc: Optional[BaseException]):
+        stats = self.stats[index]
+        stats.requests += 1
+        if exc is not None and not should_failover(exc):
+            # Rejected request (e.g. 400/422): the caller's fault, and says
+            # nothing about the endpoint's health or speed
+            return
+        failed = exc is not None
+        if failed:
+            stats.failures += 1
+            if isinstance(exc, ModelHTTPError):
+                stats.cooldown_until = time.monotonic() + self.cooldown
+        else:
+            stats.latency = (
+                elapsed
+                if stats.latency is None
+                else self.alpha * elapsed + (1 - self.alpha) * stats.latency
+            )
+        stats.error_rate = self.alpha * failed + (1 - self.alpha) * stats.error_rate
+
+    async def _attempt(
+        self,
+        index: int,
+        messages: list[ModelMessage],
+        model_settings: Optional[ModelSettings],
+        model_request_parameters: ModelRequestParameters,
+    ) -> ModelResponse:
+        stats = self.stats[index]
+        stats.in_flight += 1
+        start = time.monotonic()
+        try:
+            response = await self.models[index].request(
+                messages, model_settings, model_request_parameters
+            )
+        except asyncio.CancelledError:
+            # Lost a hedge race: it took at least this long, so let that
+            # count against it if it's worse than the current estimate
+            elapsed = time.monotonic() - start
+            if stats.latency is not None and elapsed > stats.latency:
+                stats.latency = self.alpha * elapsed + (1 - self.alpha) * stats.latency
+            raise
+        except Exception as exc:
+            self._record(index, time.monotonic() - start, exc)
+            raise
+        finally:
+            stats.in_flight -= 1
+        self._record(index, time.monotonic() - start, None)
+        return response
+
+    async def request(
+        self,
+        messages: list[ModelMessage],
+        model_settings: Optional[ModelSettings],
+        model_request_parameters: ModelRequestParameters,
+    ) -> ModelResponse:
+        candidates = iter(self.ranked())
+        pending: dict[asyncio.Task, int] = {}
+        errors: list[Exception] = []
+        hedges = 0
+
+        def launch() -> bool:
+            index = next(candidates, None)
+            if index is None:
+                return False
+            task = asyncio.create_task(
+                self._attempt(index, messages, model_settings, model_request_parameters)
+            )
+            pending[task] = index
+            return True
+
+        launch()
+        try:
+            while pending:
+                can_hedge = self.hedge_delay is not None and hedges < self.max_hedges
+                done, _ = await asyncio.wait(
+                    pending,
+                    timeout=self.hedge_delay if can_hedge else None,
+                    return_when=asyncio.FIRST_COMPLETED,
+                )
+                if not done:
+                    if launch():
+                        hedges += 1
+                    else:
+                        hedges = self.max_hedges  # nothing left to hedge to
+                    continue
+                for task in done:
+                    del pending[task]
+                    exc = task.exception()
+                    if exc is None:
+                        return task.result()
+                    if not should_failover(exc):
+                        raise exc
+                    errors.append(exc)
+                if not pending:
+                    launch()
+        finally:
+            for task in pending:
+                task.cancel()
+            if pending:
+                await asyncio.gather(*pending, return_exceptions=True)
+        raise FallbackExceptionGroup("All model endpoints failed", errors)
+
+    @asynccontextmanager
+    async def request_stream(
+        self,
+        messages: list[ModelMessage],
+        model_settings: Optional[ModelSettings],
+        model_request_parameters: ModelRequestParameters,
+        run_context: Any = None,
+    ) -> AsyncIterator[StreamedResponse]:
+        errors: list[Exception] = []
+        for index in self.ranked():
+            async with AsyncExitStack() as stack:
+                stats = self.stats[index]
+                stats.in_flight += 1
+                stack.callback(_release, stats)
+                start = time.monotonic()
+                try:
+                    stream = await stack.enter_async_context(
+                        self.models[index].request_stream(
+                            messages,
+                            model_settings,
+                            model_request_parameters,
+                            run_context,
+                        )
+                    )
+                except Exception as exc:
+                    self._record(index, time.monotonic() - start, exc)
+                    if not should_failover(exc):
+                        raise
+                    errors.append(exc)
+                    continue
+                # Time to an open stream (first response bytes)
+                self._record(index, time.monotonic() - start, None)
+                yield stream
+                return
+        raise FallbackExceptionGroup("All model endpoints failed", errors)
+
+    def info(self) -> list[dict]:
+        """
+        Get per-endpoint routing statistics.
+
+        Returns:
+            One dictionary per endpoint with its latency, error rate and counts
+        """
+        now = time.monotonic()
+        return [
+            {
+                "model": model.model_name,
+                "base_url": getattr(model, "base_url", None),
+                "latency_ms": stats.latency * 1000
+                if stats.latency is not None
+                else None,
+                "error_rate": stats.error_rate,
+                "cooling_down": now < stats.cooldown_until,
+                "in_flight": stats.in_flight,
+                "requests": stats.requests,
+                "failures": stats.failures,
+            }
+            for model, stats in zip(self.models, self.stats)
+        ]
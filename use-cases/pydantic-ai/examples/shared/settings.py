@@ -2,16 +2,31 @@
 Configuration management using pydantic-settings.
 
 Provides a shared Settings class for LLM configuration used across examples.
+
+The settings are created (and ``.env`` loaded) by the first
+``get_settings()`` call, not at import; ``settings`` is still available
+as a module attribute and resolves to the same instance.
 """
 
 import os
+from functools import lru_cache
 from typing import Optional
-from pydantic_settings import BaseSettings, SettingsConfigDict
-from pydantic import Field
+
 from dotenv import load_dotenv
+from pydantic_settings import BaseSettings, SettingsConfigDict
+from pydantic import BaseModel, Field
 
-# Load environment variables from .env file
-load_dotenv()
+
+class LLMEndpoint(BaseModel):
+    """One OpenAI-compatible endpoint for the model router."""
+
+    base_url: str
+    api_key: Optional[str] = None  # defaults to llm_api_key
+    model: Optional[str] = None  # defaults to llm_model
+    # Provider limits; default to the llm_* limits below
+    max_concurrent_requests: Optional[int] = None
+    requests_per_minute: Optional[int] = None
+    tokens_per_minute: Optional[int] = None
 
 
 class Settings(BaseSettings):
@@ -27,11 +42,56 @@ class Settings(BaseSettings):
     llm_model: str = Field(default="gpt-4")
     llm_base_url: Optional[str] = Field(default="https://api.openai.com/v1")
 
+    # HTTP client shared by all providers
+    llm_http2: bool = Field(default=True)  # used when the h2 package is installed
+    llm_max_connections: int = Field(default=100)
+    llm_max_keepalive_connections: int = Field(default=20)
+    llm_keepalive_expiry_seconds: float = Field(default=30.0)
+    llm_timeout_seconds: float = Field(default=600.0)
+    llm_connect_timeout_seconds: float = Field(default=5.0)
+
+    # Multi-endpoint routing (see shared/routing.py). When set, requests go
+    # to the fastest healthy endpoint instead of llm_base_url, e.g.
+    # LLM_ENDPOINTS='[{"base_url": "https://a/v1"}, {"base_url": "https://b/v1"}]'
+    llm_endpoints: list[LLMEndpoint] = Field(default_factory=list)
+    llm_hedge_delay_seconds: Optional[float] = Field(default=None)
+    llm_router_ewma_alpha: float = Field(default=0.3)
+    llm_router_cooldown_seconds: float = Field(default=30.0)
+
+    # Per-provider limits shared by all agents (see shared/limiter.py);
+    # unset means unlimited
+    llm_max_concurrent_requests: Optional[int] = Field(default=None)
+    llm_requests_per_minute: Optional[int] = Field(default=None)
+    llm_tokens_per_minute: Optional[int] = Field(default=None)
+    llm_rate_limit_backoff_seconds: float = Field(default=1.0)
+
+    # Response cache (opt-in, see shared/response_cache.py)
+    llm_cache_enabled: bool = Field(default=False)
+    llm_cache_path: str = Field(default=".llm_cache.sqlite3")
+    llm_cache_ttl_seconds: Optional[float] = Field(default=86400.0)
+    llm_cache_max_bytes: int = Field(default=256 * 1024 * 1024)
+
+
+@lru_cache(maxsize=1)
+def get_settings() -> Settings:
+    """
+    Get the global settings instance, creating it on first call.
+
+    Returns:
+        Settings loaded from the environment and .env file
+    """
+    # Load environment variables from .env file
+    load_dotenv()
+    try:
+        return Settings()  # type: ignore[call-arg]
+    except Exception:
+        # For testing without env vars, create settings with dummy values
+        os.environ.setdefault("LLM_API_KEY", "test-key")
+        return Settings()  # type: ignore[call-arg]
+
 
-# Global settings instance with fallback for testing
-try:
-    settings = Settings()  # type: ignore[call-arg]
-except Exception:
-    # For testing without env vars, create settings with dummy values
-    os.environ.setdefault("LLM_API_KEY", "test-key")
-    settings = Settings()  # type: ignore[call-arg]
+def __getattr__(name: str):
+    # Global settings instance, built on first access (PEP 562)
+    if name == "settings":
+        return get_settings()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
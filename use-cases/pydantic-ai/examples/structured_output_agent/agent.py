@@ -9,13 +9,14 @@ Demonstrates when to use structured outputs with PydanticAI:
 """
 
 import logging
-from dataclasses import dataclass
-from typing import Optional, List
+from dataclasses import dataclass, replace
+from functools import lru_cache
+from typing import TYPE_CHECKING, Any, Optional, List
 from pydantic import BaseModel, Field
 from pydantic_ai import Agent, RunContext
 
-# Import shared configuration
-from ..shared import get_llm_model
+if TYPE_CHECKING:
+    from ..shared.batch import BatchInputs, BatchStats
 
 logger = logging.getLogger(__name__)
 
@@ -88,16 +89,6 @@ Guidelines:
 """
 
 
-# Create structured output agent - NOTE: output_type specified for data validation
-structured_agent = Agent(
-    get_llm_model(),
-    deps_type=AnalysisDependencies,
-    output_type=DataAnalysisReport,  # This is when we DO want structured output
-    system_prompt=SYSTEM_PROMPT,
-)
-
-
-@structured_agent.tool
 def analyze_numerical_data(
     ctx: RunContext[AnalysisDependencies], data_description: str, numbers: List[float]
 ) -> str:
@@ -150,6 +141,28 @@ Statistical Analysis of {data_description}:
         return f"Error analyzing numerical data: {str(e)}"
 
 
+@lru_cache(maxsize=1)
+def get_structured_agent() -> Agent[AnalysisDependencies, DataAnalysisReport]:
+    """
+    Get the structured output agent, building it on first use.
+
+    Returns:
+        The shared data analysis agent
+    """
+    # Import shared configuration
+    from ..shared import get_llm_model
+
+    # Create structured output agent - NOTE: output_type specified for data validation
+    agent = Agent(
+        get_llm_model(),
+        deps_type=AnalysisDependencies,
+        output_type=DataAnalysisReport,  # This is when we DO want structured output
+        system_prompt=SYSTEM_PROMPT,
+    )
+    agent.tool(analyze_numerical_data)
+    return agent
+
+
 async def analyze_data(
     data_input: str, dependencies: Optional[AnalysisDependencies] = None
 ) -> DataAnalysisReport:
@@ -166,7 +179,7 @@ async def analyze_data(
     if dependencies is None:
         dependencies = AnalysisDependencies()
 
-    result = await structured_agent.run(data_input, deps=dependencies)
+    result = await get_structured_agent().run(data_input, deps=dependencies)
     return result.output
 
 
@@ -188,6 +201,47 @@ def analyze_data_sync(
     return asyncio.run(analyze_data(data_input, dependencies))
 
 
+async def analyze_data_batch(
+    data_inputs: "BatchInputs",
+    output_path: str,
+    dependencies: Optional[AnalysisDependencies] = None,
+    **options: Any,
+) -> "BatchStats":
+    """
+    Analyze many data inputs concurrently, writing reports as JSONL.
+
+    Rerunning with the same output file resumes an interrupted batch.
+
+    Args:
+        data_inputs: Raw data or descriptions, as an iterable or async iterable
+        output_path: JSONL file the reports are appended to
+        dependencies: Optional analysis configuration shared by every item
+        **options: Passed to run_batch (concurrency, retries, timeout, ...)
+
+    Returns:
+        Batch totals including throughput and token usage
+    """
+    from ..shared.batch import run_batch
+
+    if dependencies is None:
+        dependencies = AnalysisDependencies()
+
+    return await run_batch(
+        get_structured_agent(),
+        data_inputs,
+        output_path,
+        deps_factory=lambda: replace(dependencies),
+        **options,
+    )
+
+
+def __getattr__(name: str):
+    # ``structured_agent`` is still importable; it is built on first access
+    if name == "structured_agent":
+        return get_structured_agent()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
 # Example usage and demonstration
 if __name__ == "__main__":
     import asyncio
@@ -8,6 +8,7 @@ Demonstrates testing patterns and best practices for PydanticAI agents:
 - Tool validation and error handling tests
 """
 
+import json
 import pytest
 from unittest.mock import Mock, AsyncMock
 from dataclasses import dataclass
@@ -234,5 +235,31 @@ class TestAgentErrorRecovery:
             assert isinstance(result.output.confidence, float)
 
 
+class TestBatchRuns:
+    """Test running an agent over many prompts with the batch runner."""
+
+    @pytest.mark.asyncio
+    async def test_batch_writes_jsonl_and_resumes(self, tmp_path):
+        """Test results are written per index and finished items are skipped."""
+        from examples.shared.batch import run_batch
+
+        batch_agent = Agent(model=TestModel(custom_output_text="done"))
+        output_path = str(tmp_path / "results.jsonl")
+        prompts = [f"Prompt {i}" for i in range(5)]
+
+        stats = await run_batch(batch_agent, prompts[:3], output_path, concurrency=2)
+        assert stats.succeeded == 3
+        assert stats.input_tokens > 0
+
+        # Rerun over the full set: only the two new prompts are run
+        stats = await run_batch(batch_agent, prompts, output_path, concurrency=2)
+        assert (stats.succeeded, stats.skipped) == (2, 3)
+
+        with open(output_path) as f:
+            records = [json.loads(line) for line in f]
+        assert sorted(record["index"] for record in records) == list(range(5))
+        assert all(record["output"] == "done" for record in records)
+
+
 if __name__ == "__main__":
     pytest.main([__file__, "-v"])
@@ -0,0 +1,173 @@
+"""
+Tests for concurrent batch runs.
+
+The agent runs on a FunctionModel, so failures and slow items are scripted
+and the tests need no network or API keys.
+"""
+
+import asyncio
+import json
+
+import pytest
+from pydantic_ai import Agent
+from pydantic_ai.exceptions import FallbackExceptionGroup, ModelHTTPError
+from pydantic_ai.messages import ModelResponse, TextPart
+from pydantic_ai.models.function import AgentInfo, FunctionModel
+
+from examples.shared import batch
+from examples.shared.batch import iter_batch, run_batch, should_retry
+
+
+def prompt_of(messages) -> str:
+    return messages[-1].parts[-1].content
+
+
+def scripted_agent(behaviour) -> Agent:
+    """Agent whose model calls ``behaviour(prompt)`` and answers with it."""
+
+    async def answer(messages, info: AgentInfo) -> ModelResponse:
+        return ModelResponse(parts=[TextPart(await behaviour(prompt_of(messages)))])
+
+    return Agent(FunctionModel(answer))
+
+
+async def collect(agent: Agent, prompts, **options) -> dict:
+    return {
+        result.index: result async for result in iter_batch(agent, prompts, **options)
+    }
+
+
+@pytest.fixture
+def sleeps(monkeypatch):
+    """Record backoff delays instead of waiting them out."""
+    delays = []
+    real_sleep = asyncio.sleep
+
+    async def fake_sleep(delay, *args, **kwargs):
+        delays.append(delay)
+        await real_sleep(0)
+
+    monkeypatch.setattr(batch.random, "uniform", lambda low, high: 1.0)
+    monkeypatch.setattr(batch.asyncio, "sleep", fake_sleep)
+    return delays
+
+
+def test_should_retry_unwraps_exception_groups():
+    retryable = FallbackExceptionGroup(
+        "all failed", [ModelHTTPError(503, "a"), ModelHTTPError(400, "b")]
+    )
+    rejected = FallbackExceptionGroup(
+        "all failed", [ModelHTTPError(400, "a"), ModelHTTPError(422, "b")]
+    )
+    assert should_retry(retryable)
+    assert not should_retry(rejected)
+
+
+class TestRetries:
+    """Retryable failures are retried with exponential backoff."""
+
+    @pytest.mark.asyncio
+    async def test_transient_errors_are_retried_with_backoff(self, sleeps):
+        failures = [ModelHTTPError(503, "m"), ModelHTTPError(429, "m")]
+
+        async def behaviour(prompt):
+            if failures:
+                raise failures.pop(0)
+            return prompt.upper()
+
+        results = await collect(
+            scripted_agent(behaviour), ["hi"], retries=2, backoff=0.5
+        )
+        assert results[0].output == "HI"
+        assert results[0].attempts == 3
+        assert sleeps == [0.5, 1.0]
+
+    @pytest.mark.asyncio
+    async def test_retries_are_bounded(self, sleeps):
+        async def behaviour(prompt):
+            raise ModelHTTPError(503, "m")
+
+        results = await collect(scripted_agent(behaviour), ["hi"], retries=2)
+        assert results[0].attempts == 3
+        assert results[0].error.startswith("ModelHTTPError")
+
+    @pytest.mark.asyncio
+    async def test_client_errors_are_not_retried(self, sleeps):
+        async def behaviour(prompt):
+            raise ModelHTTPError(400, "m")
+
+        results = await collect(scripted_agent(behaviour), ["hi"], retries=2)
+        assert results[0].attempts == 1
+        assert sleeps == []
+
+    @pytest.mark.asyncio
+    async def test_failing_deps_factory_fails_only_its_item(self):
+        async def behaviour(prompt):
+            return prompt
+
+        def broken_deps():
+            raise RuntimeError("no deps")
+
+        results = await collect(
+            scripted_agent(behaviour), ["a", "b"], deps_factory=broken_deps
+        )
+        assert [results[i].error for i in (0, 1)] == ["RuntimeError: no deps"] * 2
+
+
+class TestTimeout:
+    """Each attempt is bounded by the per-item timeout."""
+
+    @pytest.mark.asyncio
+    async def test_slow_item_times_out_without_blocking_others(self):
+        async def behaviour(prompt):
+            if prompt == "slow":
+                await asyncio.sleep(10)
+            return prompt
+
+        results = await collect(
+            scripted_agent(behaviour), ["slow", "fast"], retries=0, timeout=0.05
+        )
+        assert results[0].error == "TimeoutError"
+        assert results[1].output == "fast"
+
+
+class TestResume:
+    """The JSONL output doubles as the checkpoint for a rerun."""
+
+    @pytest.mark.asyncio
+    async def test_rerun_only_retries_items_not_yet_succeeded(self, tmp_path):
+        output = tmp_path / "results.jsonl"
+        prompts = ["a", "b", "c"]
+        calls = []
+
+        async def flaky(prompt):
+            calls.append(prompt)
+            if prompt == "b":
+                raise ModelHTTPError(400, "m")
+            return prompt
+
+        stats = await run_batch(scripted_agent(flaky), prompts, str(output))
+        assert (stats.succeeded, stats.failed) == (2, 1)
+
+        # An interrupted write leaves a torn last line; it's ignored
+        with open(output, "a", encoding="utf-8") as f:
+            f.write('{"index": 2, "out')
+
+        calls.clear()
+
+        async def fixed(prompt):
+            calls.append(prompt)
+            return prompt
+
+        stats = await run_batch(scripted_agent(fixed), prompts, str(output))
+        assert calls == ["b"]
+        assert (stats.succeeded, stats.skipped) == (1, 2)
+
+        records = []
+        for line in output.read_text(encoding="utf-8").splitlines():
+            try:
+                records.append(json.loads(line))
+            except json.JSONDecodeError:
+                continue
+        succeeded = {r["index"]: r["output"] for r in records if r["error"] is None}
+        assert succeeded == {0: "a", 1: "b", 2: "c"}
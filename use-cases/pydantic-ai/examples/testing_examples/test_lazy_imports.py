@@ -0,0 +1,56 @@
+"""
+Tests that importing the examples stays cheap.
+
+Each check runs in a fresh interpreter so modules imported by other tests
+don't hide work done at import time.
+"""
+
+import subprocess
+import sys
+import textwrap
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
+
+
+def run_python(code: str) -> None:
+    result = subprocess.run(
+        [sys.executable, "-c", textwrap.dedent(code)],
+        cwd=PROJECT_ROOT,
+        capture_output=True,
+        text=True,
+    )
+    assert result.returncode == 0, result.stderr
+
+
+class TestLazyImports:
+    """Agents and Settings are built on first use, not at import."""
+
+    def test_importing_agents_builds_no_agent_or_settings(self):
+        run_python(
+            """
+            from examples.basic_chat_agent import agent as chat
+            from examples.structured_output_agent import agent as structured
+            from examples.tool_enabled_agent import agent as tools
+            from examples.shared.settings import get_settings
+
+            assert get_settings.cache_info().currsize == 0
+            assert chat.get_chat_agent.cache_info().currsize == 0
+            assert structured.get_structured_agent.cache_info().currsize == 0
+            assert tools.get_tool_agent.cache_info().currsize == 0
+            """
+        )
+
+    def test_settings_module_exposes_class_and_lazy_instance(self):
+        run_python(
+            """
+            import examples.shared
+            from examples.shared.settings import Settings, get_settings
+            import examples.shared.settings as settings_module
+
+            assert get_settings.cache_info().currsize == 0
+            assert examples.shared.settings is settings_module
+            assert isinstance(settings_module.settings, Settings)
+            assert settings_module.settings is examples.shared.get_settings()
+            """
+        )
@@ -0,0 +1,150 @@
+"""
+Tests for provider-wide concurrency and rate limiting.
+"""
+
+import asyncio
+import time
+
+import pytest
+from pydantic_ai.exceptions import ModelHTTPError
+from pydantic_ai.messages import ModelRequest, ModelResponse, TextPart
+from pydantic_ai.models import ModelRequestParameters
+from pydantic_ai.models.function import AgentInfo, FunctionModel
+
+from examples.shared.settings import get_settings
+from examples.shared.limiter import (
+    LimitedModel,
+    Priority,
+    ProviderLimiter,
+    TokenBucket,
+    _retry_after,
+    clear_limiters,
+    get_limiter,
+)
+
+
+@pytest.fixture(autouse=True)
+def fresh_limiters(monkeypatch):
+    settings = get_settings()
+    monkeypatch.setattr(settings, "llm_max_concurrent_requests", None)
+    monkeypatch.setattr(settings, "llm_requests_per_minute", 60)
+    monkeypatch.setattr(settings, "llm_tokens_per_minute", None)
+    clear_limiters()
+    yield
+    clear_limiters()
+
+
+class TestRetryAfter:
+    """Pause length after a 429."""
+
+    def test_uses_the_exception_attribute_first(self):
+        class RateLimited(Exception):
+            retry_after = 7.0
+            headers = {"retry-after": "1"}
+
+        assert _retry_after(RateLimited()) == 7.0
+
+    def test_falls_back_to_the_header(self):
+        class RateLimited(Exception):
+            headers = {"Retry-After": "3"}
+
+        assert _retry_after(RateLimited()) == 3.0
+
+    def test_model_http_error(self):
+        exc = ModelHTTPError(429, "m", headers={"Retry-After": "2"})
+        assert _retry_after(exc) == 2.0
+        assert _retry_after(ModelHTTPError(429, "m")) is None
+
+    def test_unparseable_header_is_ignored(self):
+        class RateLimited(Exception):
+            headers = {"retry-after": "soon"}
+
+        assert _retry_after(RateLimited()) is None
+
+
+class TestGetLimiter:
+    """One limiter per provider base URL."""
+
+    def test_shared_per_base_url(self):
+        assert get_limiter("https://a/v1") is get_limiter("https://a/v1")
+        assert get_limiter("https://a/v1") is not get_limiter("https://b/v1")
+
+    def test_overrides_matching_the_existing_limits_share_it(self):
+        limiter = get_limiter("https://a/v1", max_concurrency=4)
+        assert get_limiter("https://a/v1", max_concurrency=4) is limiter
+        # Explicitly passing the settings default resolves to the same limits
+        assert get_limiter("https://a/v1", 4, requests_per_minute=60) is limiter
+
+    def test_conflicting_overrides_are_rejected(self):
+        get_limiter("https://a/v1", max_concurrency=4)
+        with pytest.raises(ValueError, match="Conflicting limits"):
+            get_limiter("https://a/v1", max_concurrency=8)
+        with pytest.raises(ValueError):
+            get_limiter("https://a/v1")
+
+
+class TestProviderLimiter:
+    """Admission order, concurrency and rate limits."""
+
+    def test_token_bucket_refills_continuously(self):
+        bucket = TokenBucket(60)
+        now = bucket.updated
+        assert bucket.wait_time(60, now) == 0
+        bucket.take(60)
+        assert bucket.wait_time(1, now) == pytest.approx(1.0)
+        assert bucket.wait_time(1, now + 1.0) == 0
+
+    @pytest.mark.asyncio
+    async def test_concurrency_limit_admits_in_priority_order(self):
+        limiter = ProviderLimiter(max_concurrency=1)
+        await limiter.acquire(0)
+        order = []
+
+        async def wait(name: str, priority: Priority):
+            await limiter.acquire(0, priority)
+            order.append(name)
+            limiter.release(0)
+
+        batch = asyncio.create_task(wait("batch", Priority.BATCH))
+        await asyncio.sleep(0)
+        interactive = asyncio.create_task(wait("interactive", Priority.INTERACTIVE))
+        await asyncio.sleep(0)
+        assert limiter.queued == 2
+
+        limiter.release(0)
+        await asyncio.gather(batch, interactive)
+        assert order == ["interactive", "batch"]
+        assert limiter.in_flight == 0
+
+    @pytest.mark.asyncio
+    async def test_cancelled_waiter_frees_its_place(self):
+        limiter = ProviderLimiter(max_concurrency=1)
+        await limiter.acquire(0)
+        waiter = asyncio.create_task(limiter.acquire(0))
+        await asyncio.sleep(0)
+        waiter.cancel()
+        await asyncio.gather(waiter, return_exceptions=True)
+        limiter.release(0)
+        assert limiter.queued == 0
+        assert limiter.in_flight == 0
+
+    @pytest.mark.asyncio
+    async def test_429_pauses_admission_for_retry_after(self):
+        calls = []
+
+        async def rate_limited(messages, info: AgentInfo) -> ModelResponse:
+            calls.append(time.monotonic())
+            if len(calls) == 1:
+                raise ModelHTTPError(429, "m", headers={"Retry-After": "0.05"})
+            return ModelResponse(parts=[TextPart("ok")])
+
+        limiter = ProviderLimiter()
+        model = LimitedModel(FunctionModel(rate_limited), limiter)
+        messages = [ModelRequest.user_text_prompt("hi")]
+        with pytest.raises(ModelHTTPError):
+            await model.request(messages, None, ModelRequestParameters())
+        await model.request(messages, None, ModelRequestParameters())
+
+        assert limiter.rate_limited == 1
+        assert calls[1] - calls[0] >= 0.04
+        assert limiter.in_flight == 0
@@ -0,0 +1,60 @@
+"""
+Tests for cached providers and the shared HTTP client.
+
+Needs an OpenAI-compatible model class from pydantic-ai; skipped where the
+installed version doesn't provide the one providers.py imports.
+"""
+
+import asyncio
+
+import pytest
+
+providers = pytest.importorskip("examples.shared.providers", exc_type=ImportError)
+
+from examples.shared.settings import get_settings  # noqa: E402
+from examples.shared.response_cache import CachedModel, get_response_cache  # noqa: E402
+
+
+def reset_caches():
+    asyncio.run(providers.aclose_http_client())
+    get_response_cache.cache_clear()
+
+
+@pytest.fixture(autouse=True)
+def fresh_providers(monkeypatch):
+    settings = get_settings()
+    monkeypatch.setattr(settings, "llm_endpoints", [])
+    monkeypatch.setattr(settings, "llm_cache_path", ":memory:")
+    reset_caches()
+    yield
+    reset_caches()
+
+
+class TestProviderCaching:
+    """Models, providers and the HTTP client are built once and shared."""
+
+    def test_same_configuration_returns_same_model(self):
+        assert providers.get_llm_model("m1") is providers.get_llm_model("m1")
+
+    def test_models_share_provider_and_http_client(self):
+        first = providers.get_llm_model("m1", response_cache=False)
+        second = providers.get_llm_model("m2", response_cache=False)
+        assert first is not second
+        assert first.client is second.client
+        assert first.client._client is providers.get_http_client()
+
+    def test_response_cache_wraps_the_same_endpoint_model(self):
+        cached = providers.get_llm_model("m1", response_cache=True)
+        plain = providers.get_llm_model("m1", response_cache=False)
+        assert isinstance(cached, CachedModel)
+        assert cached.wrapped is plain
+
+    @pytest.mark.asyncio
+    async def test_aclose_starts_afresh(self):
+        model = providers.get_llm_model("m1")
+        client = providers.get_http_client()
+        await providers.aclose_http_client()
+
+        assert client.is_closed
+        assert providers.get_http_client() is not client
+        assert providers.get_llm_model("m1") is not model
@@ -0,0 +1,209 @@
+"""
+Tests for the persistent response cache.
+
+Covers the request fingerprint (what is and isn't part of the key), the
+SQLite store's TTL and size-bounded eviction, and CachedModel serving
+repeated runs without calling the wrapped model.
+"""
+
+import pytest
+from pydantic_ai import Agent
+from pydantic_ai.messages import (
+    ModelRequest,
+    ModelResponse,
+    TextPart,
+    ToolCallPart,
+    UserPromptPart,
+)
+from pydantic_ai.models import ModelRequestParameters
+from pydantic_ai.models.function import AgentInfo, FunctionModel
+from pydantic_ai.tools import ToolDefinition
+from pydantic_ai.usage import RequestUsage
+
+from examples.shared.response_cache import (
+    CachedModel,
+    ResponseCache,
+    request_fingerprint,
+)
+
+
+def fingerprint(messages, settings=None, tools=()) -> str:
+    parameters = ModelRequestParameters(function_tools=list(tools))
+    return request_fingerprint("test-model", messages, settings, parameters)
+
+
+def tool(schema: dict) -> ToolDefinition:
+    return ToolDefinition(name="lookup", parameters_json_schema=schema)
+
+
+@pytest.fixture
+def cache():
+    cache = ResponseCache(":memory:")
+    yield cache
+    cache.close()
+
+
+class TestRequestFingerprint:
+    """What the cache key depends on."""
+
+    def test_ignores_timestamps_run_ids_and_usage(self):
+        first = [
+            ModelRequest(parts=[UserPromptPart("hi")], run_id="a"),
+            ModelResponse(
+                parts=[TextPart("hello")],
+                usage=RequestUsage(input_tokens=5, output_tokens=1),
+            ),
+        ]
+        second = [
+            ModelRequest(parts=[UserPromptPart("hi")], run_id="b"),
+            ModelResponse(
+                parts=[TextPart("hello")],
+                usage=RequestUsage(input_tokens=9, output_tokens=9),
+            ),
+        ]
+        assert fingerprint(first) == fingerprint(second)
+
+    def test_depends_on_content(self):
+        assert fingerprint([ModelRequest.user_text_prompt("a")]) != fingerprint(
+            [ModelRequest.user_text_prompt("b")]
+        )
+
+    def test_keeps_volatile_names_inside_tool_args(self):
+        def history(timestamp: str) -> list:
+            call = ToolCallPart("lookup", {"timestamp": timestamp}, "call-1")
+            return [ModelRequest.user_text_prompt("q"), ModelResponse(parts=[call])]
+
+        assert fingerprint(history("2024-01-01")) != fingerprint(history("2025-01-01"))
+
+    def test_keeps_volatile_names_inside_tool_schemas(self):
+        messages = [ModelRequest.user_text_prompt("q")]
+
+        def schema(kind: str) -> ToolDefinition:
+            return tool({"type": "object", "properties": {"usage": {"type": kind}}})
+
+        assert fingerprint(messages, tools=[schema("string")]) != fingerprint(
+            messages, tools=[schema("integer")]
+        )
+
+    def test_keeps_metadata_inside_model_settings(self):
+        messages = [ModelRequest.user_text_prompt("q")]
+
+        def settings(user: str) -> dict:
+            return {"extra_body": {"metadata": {"user": user}}}
+
+        assert fingerprint(messages, settings("a")) != fingerprint(
+            messages, settings("b")
+        )
+
+
+class TestResponseCache:
+    """SQLite store behaviour."""
+
+    @pytest.mark.asyncio
+    async def test_round_trip_and_stats(self, cache):
+        assert await cache.get("k") is None
+        await cache.set("k", "test-model", ModelResponse(parts=[TextPart("x")]))
+        stored = await cache.get("k")
+        assert stored.parts[0].content == "x"
+        info = cache.info()
+        assert (info["hits"], info["misses"], info["entries"]) == (1, 1, 1)
+
+    @pytest.mark.asyncio
+    async def test_expired_entries_are_dropped(self):
+        cache = ResponseCache(":memory:", ttl_seconds=0)
+        await cache.set("k", "test-model", ModelResponse(parts=[TextPart("x")]))
+        assert await cache.get("k") is None
+        assert cache.info()["expirations"] == 1
+        assert cache.info()["bytes"] == 0
+
+    @pytest.mark.asyncio
+    async def test_least_recently_used_entries_are_evicted(self):
+        response = ModelResponse(parts=[TextPart("x" * 1000)])
+        cache = ResponseCache(":memory:", max_bytes=10_000)
+        await cache.set("a", "test-model", response)
+        size = cache.info()["bytes"]
+        cache.max_bytes = int(size * 3.5)
+        for key in ("b", "c"):
+            await cache.set(key, "test-model", response)
+        await cache.get("a")  # now more recent than b and c
+        await cache.set("d", "test-model", response)
+
+        assert await cache.get("b") is None
+        assert await cache.get("a") is not None
+        assert await cache.get("d") is not None
+        assert cache.info()["bytes"] <= cache.max_bytes
+
+    @pytest.mark.asyncio
+    async def test_clear(self, cache):
+        await cache.set("k", "test-model", ModelResponse(parts=[TextPart("x")]))
+        cache.clear()
+        assert cache.info()["entries"] == 0
+        assert await cache.get("k") is None
+
+
+class TestCachedModel:
+    """Repeated runs are answered from the cache."""
+
+    @pytest.mark.asyncio
+    async def test_repeated_run_skips_the_model(self, cache):
+        calls = []
+
+        def answer(messages, info: AgentInfo) -> ModelResponse:
+            calls.append(messages)
+            return ModelResponse(parts=[TextPart(f"answer {len(calls)}")])
+
+        agent = Agent(CachedModel(FunctionModel(answer), cache))
+        first = await agent.run("question")
+        second = await agent.run("question")
+        other = await agent.run("another question")
+
+        assert first.output == second.output == "answer 1"
+        assert other.output == "answer 2"
+        assert len(calls) == 2
+        assert second.all_messages()[-1].usage.output_tokens == 0
+
+    @pytest.mark.asyncio
+    async def test_streamed_response_is_replayed(self, cache):
+        calls = []
+
+        async def stream(messages, info: AgentInfo):
+            calls.append(messages)
+            for chunk in ("stre", "amed"):
+                yield chunk
+
+        agent = Agent(CachedModel(FunctionModel(stream_function=stream), cache))
+        outputs = []
+        for _ in range(2):
+            async with agent.run_stream("question") as run:
+                outputs.append(await run.get_output())
+
+        assert outputs == ["streamed", "streamed"]
+        assert len(calls) == 1
+
+    @pytest.mark.asyncio
+    async def test_stream_stopped_early_is_not_cached_or_drained(self, cache):
+        calls = []
+        produced = []
+
+        async def stream(messages, info: AgentInfo):
+            calls.append(messages)
+            for chunk in ("one ", "two ", "three"):
+                produced.append(chunk)
+                yield chunk
+
+        model = CachedModel(FunctionModel(stream_function=stream), cache)
+        messages = [ModelRequest(parts=[UserPromptPart("question")])]
+        parameters = ModelRequestParameters()
+        async with model.request_stream(messages, None, parameters) as response:
+            async for _ in response:
+                break
+        assert len(produced) < 3
+
+        async with model.request_stream(messages, None, parameters) as response:
+            async for _ in response:
+                pass
+        async with model.request_stream(messages, None, parameters) as response:
+            async for _ in response:
+                pass
+        assert len(calls) == 2
+        assert response.get().parts == [TextPart("one two three")]
@@ -0,0 +1,191 @@
+"""
+Tests for latency-aware routing across endpoints.
+
+Endpoints are FunctionModels, so failures, latencies and hedge races are
+scripted and the tests need no network or API keys.
+"""
+
+import asyncio
+
+import httpx
+import pytest
+from pydantic_ai.exceptions import FallbackExceptionGroup, ModelHTTPError
+from pydantic_ai.messages import ModelRequest, ModelResponse, TextPart
+from pydantic_ai.models import ModelRequestParameters
+from pydantic_ai.models.function import AgentInfo, FunctionModel
+
+from examples.shared.routing import RoutedModel, should_failover
+
+MESSAGES = [ModelRequest.user_text_prompt("hi")]
+
+
+def endpoint(name: str, calls: list, error: Exception = None) -> FunctionModel:
+    """Endpoint that records each call and answers with its name."""
+
+    async def answer(messages, info: AgentInfo) -> ModelResponse:
+        calls.append(name)
+        if error is not None:
+            raise error
+        return ModelResponse(parts=[TextPart(name)])
+
+    async def stream(messages, info: AgentInfo):
+        calls.append(name)
+        if error is not None:
+            raise error
+        yield name
+
+    return FunctionModel(answer, stream_function=stream, model_name=name)
+
+
+async def ask(router: RoutedModel) -> str:
+    response = await router.request(MESSAGES, None, ModelRequestParameters())
+    return response.parts[0].content
+
+
+def test_should_failover():
+    assert should_failover(ModelHTTPError(429, "m"))
+    assert should_failover(ModelHTTPError(503, "m"))
+    assert not should_failover(ModelHTTPError(400, "m"))
+    assert not should_failover(ValueError())
+
+
+class TestFailover:
+    """Retryable errors move the request to the next endpoint."""
+
+    @pytest.mark.asyncio
+    async def test_server_error_fails_over_and_cools_down(self):
+        calls = []
+        router = RoutedModel(
+            [endpoint("a", calls, ModelHTTPError(503, "a")), endpoint("b", calls)]
+        )
+        assert await ask(router) == "b"
+        # a is cooling down, so the next request goes straight to b
+        assert await ask(router) == "b"
+        assert calls == ["a", "b", "b"]
+        assert router.info()[0]["cooling_down"]
+
+    @pytest.mark.asyncio
+    async def test_client_error_is_raised_without_failover(self):
+        calls = []
+        router = RoutedModel(
+            [endpoint("a", calls, ModelHTTPError(400, "a")), endpoint("b", calls)]
+        )
+        with pytest.raises(ModelHTTPError):
+            await ask(router)
+        assert calls == ["a"]
+        # A rejected request doesn't count against the endpoint
+        stats = router.info()[0]
+        assert stats["failures"] == 0
+        assert stats["error_rate"] == 0.0
+        assert not stats["cooling_down"]
+        assert router.ranked()[0] == 0
+
+    @pytest.mark.asyncio
+    async def test_all_endpoints_failing_raises_group(self):
+        calls = []
+        router = RoutedModel(
+            [
+                endpoint("a", calls, ModelHTTPError(503, "a")),
+                endpoint("b", calls, ModelHTTPError(429, "b")),
+            ]
+        )
+        with pytest.raises(FallbackExceptionGroup) as excinfo:
+            await ask(router)
+        assert len(excinfo.value.exceptions) == 2
+
+    @pytest.mark.asyncio
+    async def test_stream_fails_over_while_opening(self):
+        calls = []
+        router = RoutedModel(
+            [endpoint("a", calls, ModelHTTPError(502, "a")), endpoint("b", calls)]
+        )
+        async with router.request_stream(
+            MESSAGES, None, ModelRequestParameters()
+        ) as stream:
+            async for _ in stream:
+                pass
+        assert stream.get().parts[0].content == "b"
+        assert [s["in_flight"] for s in router.info()] == [0, 0]
+
+
+class TestEwmaRanking:
+    """Endpoints are ranked by smoothed latency and error rate."""
+
+    def test_unmeasured_endpoints_go_first(self):
+        router = RoutedModel([endpoint("a", []), endpoint("b", [])])
+        router.stats[0].latency = 0.01
+        assert router.ranked() == [1, 0]
+
+    def test_faster_endpoint_is_preferred(self):
+        router = RoutedModel([endpoint("a", []), endpoint("b", [])], alpha=0.5)
+        for elapsed in (0.4, 0.2):
+            router._record(0, elapsed, None)
+        router._record(1, 0.1, None)
+        assert router.stats[0].latency == pytest.approx(0.3)
+        assert router.ranked() == [1, 0]
+
+        # Slow samples move b's average past a's
+        for _ in range(3):
+            router._record(1, 1.0, None)
+        assert router.ranked() == [0, 1]
+
+    def test_errors_raise_the_score(self):
+        router = RoutedModel([endpoint("a", []), endpoint("b", [])], alpha=0.5)
+        router.stats[0].latency = router.stats[1].latency = 0.1
+        router._record(0, 0.1, httpx.ConnectError("refused"))
+        assert router.stats[0].error_rate == pytest.approx(0.5)
+        assert router.ranked() == [1, 0]
+
+    @pytest.mark.asyncio
+    async def test_requests_follow_the_ranking(self):
+        calls = []
+        router = RoutedModel([endpoint("a", calls), endpoint("b", calls)])
+        router.stats[0].latency = 0.5
+        router.stats[1].latency = 0.05
+        assert await ask(router) == "b"
+        assert calls == ["b"]
+
+
+class TestHedging:
+    """A slow first endpoint is raced against the next best one."""
+
+    @pytest.mark.asyncio
+    async def test_losing_hedge_is_cancelled(self):
+        started = asyncio.Event()
+        cancelled = asyncio.Event()
+
+        async def stall(messages, info: AgentInfo) -> ModelResponse:
+            started.set()
+            try:
+                await asyncio.Event().wait()
+            finally:
+                cancelled.set()
+
+        calls = []
+        router = RoutedModel(
+            [FunctionModel(stall, model_name="slow"), endpoint("fast", calls)],
+            hedge_delay=0.01,
+        )
+        router.stats[1].latency = 0.5  # rank the stalling endpoint first
+
+        assert await ask(router) == "fast"
+        assert started.is_set() and cancelled.is_set()
+        assert [s["in_flight"] for s in router.info()] == [0, 0]
+        # The loser isn't counted as a failure
+        assert router.stats[0].failures == 0
+
+    @pytest.mark.asyncio
+    async def test_no_hedge_without_delay(self):
+        calls = []
+
+        async def slow(messages, info: AgentInfo) -> ModelResponse:
+            await asyncio.sleep(0.02)
+            calls.append("slow")
+            return ModelResponse(parts=[TextPart("slow")])
+
+        router = RoutedModel(
+            [FunctionModel(slow, model_name="slow"), endpoint("fast", calls)]
+        )
+        router.stats[1].latency = 0.5
+        assert await ask(router) == "slow"
+        assert calls == ["slow"]
@@ -3,7 +3,7 @@ Tool-Enabled Agent with Web Search and Calculator
 
 Demonstrates PydanticAI tool integration patterns:
 - Environment-based model configuration
-- Tool registration with @agent.tool decorator
+- Tool registration with agent.tool() when the agent is first built
 - RunContext for dependency injection
 - Parameter validation with type hints
 - Error handling and retry mechanisms
@@ -15,13 +15,14 @@ import math
 import json
 import asyncio
 from dataclasses import dataclass
-from typing import Optional
+from functools import lru_cache
+from typing import TYPE_CHECKING, Optional
 from datetime import datetime
-import aiohttp
 from pydantic_ai import Agent, RunContext
 
-# Import shared configuration
-from ..shared import get_llm_model
+if TYPE_CHECKING:
+    # Imported where a session is created, so importing this module stays cheap
+    import aiohttp
 
 logger = logging.getLogger(__name__)
 
@@ -30,7 +31,7 @@ logger = logging.getLogger(__name__)
 class ToolDependencies:
     """Dependencies for tool-enabled agent."""
 
-    session: Optional[aiohttp.ClientSession] = None
+    session: Optional["aiohttp.ClientSession"] = None
     api_timeout: int = 10
     max_search_results: int = 5
     calculation_precision: int = 6
@@ -55,13 +56,6 @@ Guidelines:
 """
 
 
-# Create the tool-enabled agent - note: no result_type, defaults to string
-tool_agent = Agent(
-    get_llm_model(), deps_type=ToolDependencies, system_prompt=SYSTEM_PROMPT
-)
-
-
-@tool_agent.tool
 async def web_search(
     ctx: RunContext[ToolDependencies], query: str, max_results: Optional[int] = None
 ) -> str:
@@ -78,6 +72,8 @@ async def web_search(
     if not ctx.deps.session:
         return "Web search unavailable: No HTTP session configured"
 
+    import aiohttp
+
     max_results = max_results or ctx.deps.max_search_results
 
     try:
@@ -143,7 +139,6 @@ async def web_search(
         return f"Search error: {str(e)}"
 
 
-@tool_agent.tool
 def calculate(
     ctx: RunContext[ToolDependencies],
     expression: str,
@@ -199,7 +194,6 @@ def calculate(
         return f"Calculation error: {str(e)}\nExpression: {expression}"
 
 
-@tool_agent.tool
 def format_data(
     ctx: RunContext[ToolDependencies], data: str, format_type: str = "table"
 ) -> str:
@@ -255,7 +249,6 @@ def format_data(
         return f"Formatting error: {str(e)}"
 
 
-@tool_agent.tool
 def get_current_time(ctx: RunContext[ToolDependencies]) -> str:
     """
     Get the current date and time.
@@ -267,6 +260,26 @@ def get_current_time(ctx: RunContext[ToolDependencies]) -> str:
     return now.strftime("%Y-%m-%d %H:%M:%S UTC")
 
 
+@lru_cache(maxsize=1)
+def get_tool_agent() -> Agent[ToolDependencies, str]:
+    """
+    Get the tool-enabled agent, building it on first use.
+
+    Returns:
+        The shared tool-enabled agent
+    """
+    # Import shared configuration
+    from ..shared import get_llm_model
+
+    # Create the tool-enabled agent - note: no result_type, defaults to string
+    agent = Agent(
+        get_llm_model(), deps_type=ToolDependencies, system_prompt=SYSTEM_PROMPT
+    )
+    for tool in (web_search, calculate, format_data, get_current_time):
+        agent.tool(tool)
+    return agent
+
+
 async def ask_agent(
     question: str, dependencies: Optional[ToolDependencies] = None
 ) -> str:
@@ -281,12 +294,14 @@ async def ask_agent(
         String response from the agent
     """
     if dependencies is None:
+        import aiohttp
+
         # Create HTTP session for web search
         session = aiohttp.ClientSession()
         dependencies = ToolDependencies(session=session)
 
     try:
-        result = await tool_agent.run(question, deps=dependencies)
+        result = await get_tool_agent().run(question, deps=dependencies)
         return result.output
     finally:
         # Clean up session if we created it
@@ -307,8 +322,16 @@ def ask_agent_sync(question: str) -> str:
     return asyncio.run(ask_agent(question))
 
 
+def __getattr__(name: str):
+    # ``tool_agent`` is still importable; it is built on first access
+    if name == "tool_agent":
+        return get_tool_agent()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
 # Example usage and demonstration
 if __name__ == "__main__":
+    import aiohttp
 
     async def demo_tools():
         """Demonstrate the tool-enabled agent capabilities."""